@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+
+class CBarRow:
+    """
+    Vue légère sur une bougie (symbole, index de barre) stockée dans CBarArrays.
+    Se comporte comme la Series renvoyée par iterrows() pour les usages des
+    stratégies : row["close"], row.get("rsi", None), "col" in row, row.name.
+    """
+
+    __slots__ = ("_arrays", "_t", "_s")
+
+    def __init__(self, arrays, t, s):
+        self._arrays = arrays
+        self._t = t
+        self._s = s
+
+    @property
+    def name(self):
+        return self._arrays.index[self._t]
+
+    def __getitem__(self, key):
+        arrays = self._arrays
+        k = arrays.num_fields[self._s].get(key)
+        if k is not None:
+            return arrays.values[self._t, self._s, k]
+        col = arrays.obj_fields[self._s].get(key)
+        if col is not None:
+            return col[arrays.row_pos[self._t, self._s]]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self._arrays.num_fields[self._s] or key in self._arrays.obj_fields[self._s]
+
+    def keys(self):
+        return list(self._arrays.num_fields[self._s]) + list(self._arrays.obj_fields[self._s])
+
+
+class CBarArrays:
+    def __init__(self, list_data: list):
+        """
+        Aligne tous les symboles sur une timeline commune et les stocke dans des
+        tableaux NumPy contigus (timestamps × symboles × champs).
+
+        :param list_data: liste de tuples (DataFrame, symbole), index temporel
+        """
+        self.symbols = [sym for _, sym in list_data]
+        self.dfs = [df for df, _ in list_data]
+
+        # Timeline commune (union triée des index)
+        if self.dfs:
+            index = self.dfs[0].index.append([df.index for df in self.dfs[1:]])
+            self.index = index.unique().sort_values()
+        else:
+            self.index = pd.DatetimeIndex([])
+
+        # Champs numériques (ordre de première apparition)
+        self.fields = []
+        for df in self.dfs:
+            for col in df.columns:
+                if pd.api.types.is_numeric_dtype(df[col].dtype) and \
+                        not pd.api.types.is_bool_dtype(df[col].dtype) and col not in self.fields:
+                    self.fields.append(col)
+        field_pos = {col: k for k, col in enumerate(self.fields)}
+
+        n_t, n_s, n_f = len(self.index), len(self.symbols), len(self.fields)
+        self.values = np.full((n_t, n_s, n_f), np.nan, dtype=np.float64)
+        self.present = np.zeros((n_t, n_s), dtype=bool)
+        self.row_pos = np.full((n_t, n_s), -1, dtype=np.int64)
+
+        # Colonnes propres à chaque symbole : numériques → position, autres → tableau objet
+        self.num_fields = []
+        self.obj_fields = []
+
+        for s, df in enumerate(self.dfs):
+            t_pos = self.index.get_indexer(df.index)
+            self.present[t_pos, s] = True
+            self.row_pos[t_pos, s] = np.arange(len(df))
+
+            num = {}
+            obj = {}
+            for col in df.columns:
+                if col in field_pos:
+                    k = field_pos[col]
+                    self.values[t_pos, s, k] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                    num[col] = k
+                else:
+                    obj[col] = df[col].to_numpy()
+            self.num_fields.append(num)
+            self.obj_fields.append(obj)
+
+    def __len__(self):
+        return len(self.index)
+
+    def row(self, t, s):
+        """Retourne la vue CBarRow de la barre t pour le symbole d'indice s."""
+        return CBarRow(self, t, s)
+
+    def field(self, name):
+        """Retourne la matrice (timestamps × symboles) d'un champ numérique."""
+        return self.values[:, :, self.fields.index(name)]
@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+
+
+class CCandleRing:
+    """
+    Stockage circulaire à capacité fixe des bougies d'un symbole (mode temps réel).
+
+    - Index : int64 (unité de l'index d'origine), colonnes numériques : bloc float64
+      (2*capacité, k), colonnes datetime : int64 (ns),
+      autres colonnes : tableaux object. Toutes les allocations sont faites une fois.
+    - Chaque bougie est écrite deux fois (position p et p + capacité) : la fenêtre
+      courante est donc toujours une tranche contiguë, exposée sans copie par view().
+    - append() écrit en place (plusieurs bougies d'un coup), la plus ancienne sort du buffer.
+
+    ⚠️ Les vues retournées partagent la mémoire du buffer : elles ne sont valides
+    que jusqu'au prochain append()/load().
+    """
+
+    def __init__(self, capacity, columns, float_cols, time_cols=None, tz=None, unit="ns", index_name=None):
+        self.capacity = int(capacity)
+        self.columns = list(columns)
+        self.float_cols = list(float_cols)
+        self.time_cols = list(time_cols or {})
+        self.time_tz = dict(time_cols or {})     # {colonne datetime: tz ou None}
+        self.obj_cols = [c for c in self.columns if c not in self.float_cols and c not in self.time_cols]
+        self.tz = tz
+        self.unit = unit
+        self.index_name = index_name
+
+        size = 2 * self.capacity
+        self.times = np.zeros(size, dtype=np.int64)
+        self.values = np.full((size, len(self.float_cols)), np.nan)
+        self.time_values = {c: np.full(size, np.iinfo(np.int64).min, dtype=np.int64) for c in self.time_cols}
+        self.obj_values = {c: np.full(size, None, dtype=object) for c in self.obj_cols}
+        self._col_pos = {c: j for j, c in enumerate(self.float_cols)}
+
+        self.last = -1      # position (0..capacité-1) de la dernière bougie écrite
+        self.count = 0      # nombre de bougies valides (≤ capacité)
+
+    # ======================================================
+    # CONSTRUCTION
+    # ======================================================
+    @classmethod
+    def from_df(cls, df, capacity=None):
+        """Crée un buffer à partir d'un DataFrame (index temporel) et le remplit."""
+        index = pd.DatetimeIndex(df.index)
+        float_cols, time_cols = [], {}
+        for c in df.columns:
+            dtype = df[c].dtype
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                time_cols[c] = getattr(dtype, "tz", None)
+            elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                float_cols.append(c)
+
+        ring = cls(
+            capacity=capacity or max(len(df), 1),
+            columns=df.columns, float_cols=float_cols, time_cols=time_cols,
+            tz=index.tz, unit=index.unit, index_name=index.name
+        )
+        ring.append(df)
+        return ring
+
+    # ======================================================
+    # OUTILS
+    # ======================================================
+    def __len__(self):
+        return self.count
+
+    def _to_int(self, index):
+        """Convertit l'index (tz-aware ou non) en int64 dans l'unité du buffer (UTC si tz-aware)."""
+        values = pd.DatetimeIndex(index)
+        if values.tz is not None:
+            values = values.tz_convert("UTC")
+        return values.as_unit(self.unit).asi8
+
+    def _window(self):
+        """Bornes [start, end) de la fenêtre contiguë courante."""
+        if self.count == self.capacity:
+            return self.last + 1, self.last + 1 + self.capacity
+        return self.last + 1 - self.count, self.last + 1
+
+    def _ensure_columns(self, df):
+        """Ajoute au buffer les colonnes de df encore inconnues (allocation unique par colonne)."""
+        size = 2 * self.capacity
+        for c in df.columns:
+            if c in self.columns:
+                continue
+            self.columns.append(c)
+            dtype = df[c].dtype
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                self.time_cols.append(c)
+                self.time_tz[c] = getattr(dtype, "tz", None)
+                self.time_values[c] = np.full(size, np.iinfo(np.int64).min, dtype=np.int64)
+            elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                self.float_cols.append(c)
+                self._col_pos[c] = len(self.float_cols) - 1
+                self.values = np.hstack([self.values, np.full((size, 1), np.nan)])
+            else:
+                self.obj_cols.append(c)
+                self.obj_values[c] = np.full(size, None, dtype=object)
+
+    @property
+    def last_time(self):
+        """Horodatage de la dernière bougie (pd.Timestamp) ou None si vide."""
+        if self.count == 0:
+            return None
+        ts = pd.Timestamp(int(self.times[self.last]), unit=self.unit)
+        return ts.tz_localize("UTC").tz_convert(self.tz) if self.tz is not None else ts
+
+    # ======================================================
+    # ÉCRITURE
+    # ======================================================
+    def append(self, df):
+        """
+        Ajoute les lignes de df (ordre chronologique) à la fin du buffer, en place.
+        Les colonnes absentes de df sont mises à NaN / None.
+        """
+        m = len(df)
+        if m == 0:
+            return
+        self._ensure_columns(df)
+        if m > self.capacity:
+            df = df.iloc[-self.capacity:]
+            m = self.capacity
+
+        pos = (self.last + 1 + np.arange(m)) % self.capacity
+        both = np.concatenate([pos, pos + self.capacity])
+
+        self.times[both] = np.tile(self._to_int(df.index), 2)
+
+        block = np.full((m, len(self.float_cols)), np.nan)
+        for c in self.float_cols:
+            if c in df.columns:
+                block[:, self._col_pos[c]] = df[c].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.values[both] = np.vstack([block, block])
+
+        for c in self.time_cols:
+            if c in df.columns:
+                vals = pd.to_datetime(df[c])
+                vals = vals.dt.tz_convert("UTC") if vals.dt.tz is not None else vals
+                col = vals.dt.as_unit("ns").to_numpy(dtype="datetime64[ns]").view(np.int64)
+            else:
+                col = np.full(m, np.iinfo(np.int64).min, dtype=np.int64)
+            self.time_values[c][both] = np.tile(col, 2)
+
+        for c in self.obj_cols:
+            col = df[c].to_numpy(dtype=object) if c in df.columns else np.full(m, None, dtype=object)
+            self.obj_values[c][both] = np.concatenate([col, col])
+
+        self.last = int(pos[-1])
+        self.count = min(self.count + m, self.capacity)
+
+    def gap_frame(self, new_time, freq="1min"):
+        """
+        Bougies fictives (copies de la dernière bougie) pour combler l'intervalle
+        entre la dernière bougie et new_time (exclu), construites en une fois.
+        Retourne un DataFrame vide s'il n'y a pas de trou.
+        """
+        if self.count == 0:
+            return self.tail(0)
+        step = pd.Timedelta(freq)
+        expected = self.last_time + step
+        n_missing = int((pd.Timestamp(new_time) - expected) / step)
+        last_row = self.tail(1)
+        if n_missing <= 0:
+            return last_row.iloc[:0]
+
+        gap = pd.DataFrame(
+            np.repeat(last_row.to_numpy(dtype=object), n_missing, axis=0),
+            index=pd.date_range(expected, periods=n_missing, freq=step, name=self.index_name),
+            columns=last_row.columns
+        )
+        return gap.astype(last_row.dtypes.to_dict())
+
+    def load(self, df):
+        """Remplace le contenu du buffer par df (mêmes tableaux, pas de réallocation)."""
+        self.last = -1
+        self.count = 0
+        self.append(df)
+
+    # ======================================================
+    # LECTURE (sans copie)
+    # ======================================================
+    def _index(self, start, end):
+        times = self.times[start:end]
+        if self.tz is None:
+            return pd.DatetimeIndex(times.view(f"datetime64[{self.unit}]"), copy=False, name=self.index_name)
+        index = pd.DatetimeIndex(times, dtype=pd.DatetimeTZDtype(self.unit, "UTC"), copy=False, name=self.index_name)
+        return index if str(self.tz) == "UTC" else index.tz_convert(self.tz)
+
+    def _frame(self, start, end):
+        df = pd.DataFrame(self.values[start:end], index=self._index(start, end), columns=self.float_cols, copy=False)
+        for c in self.time_cols:
+            col = pd.DatetimeIndex(self.time_values[c][start:end].view("datetime64[ns]"), copy=False)
+            tz = self.time_tz[c]
+            df[c] = col.tz_localize("UTC").tz_convert(tz) if tz is not None else col
+        for c in self.obj_cols:
+            df[c] = self.obj_values[c][start:end]
+        return df[self.columns]
+
+    def index(self):
+        """Index temporel de la fenêtre courante (sans copie si UTC ou sans tz)."""
+        return self._index(*self._window())
+
+    def array(self, col):
+        """Vue NumPy (lecture seule) d'une colonne numérique sur la fenêtre courante."""
+        start, end = self._window()
+        arr = self.values[start:end, self._col_pos[col]]
+        arr.flags.writeable = False
+        return arr
+
+    def view(self):
+        """DataFrame de la fenêtre courante ; les colonnes numériques partagent la mémoire du buffer."""
+        return self._frame(*self._window())
+
+    def tail(self, n=1):
+        """Les n dernières bougies (coût indépendant de la taille du buffer)."""
+        start, end = self._window()
+        return self._frame(max(start, end - n), end)
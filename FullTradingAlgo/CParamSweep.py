@@ -0,0 +1,167 @@
+import os
+import sys
+import time
+import random
+import itertools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+import CEvaluateROI
+import CTradingAlgo
+import CSharedFrames
+
+
+# ==========================================================
+# ÉTAT DU WORKER (initialisé une fois par processus)
+# ==========================================================
+_WORKER = {}
+
+
+def _init_worker(spec, config):
+    list_data, segments = CSharedFrames.CSharedFrames.attach(spec)
+    _WORKER["list_data"] = list_data
+    _WORKER["segments"] = segments
+    _WORKER["config"] = config
+
+
+def _run_one(params):
+    config = _WORKER["config"]
+    return run_backtest(_WORKER["list_data"], params, **config)
+
+
+def run_backtest(list_data, params, strategy_name, initial_usdc=1000.0, trading_fee_rate=0.001,
+                 risk_per_trade_pct=1, engine="array", verbose=False):
+    """
+    Exécute un backtest complet pour un jeu de paramètres du constructeur de la stratégie
+    et retourne les métriques du run (ROI, taux de gain, nombre de trades, durée).
+    """
+    start = time.perf_counter()
+
+    evaluator = CEvaluateROI.CEvaluateROI(initial_usdc, trading_fee_rate=trading_fee_rate)
+    algo = CTradingAlgo.CTradingAlgo(evaluator, risk_per_trade_pct=risk_per_trade_pct,
+                                     strategy_name=strategy_name, strategy_params=params)
+
+    if verbose:
+        algo.run(list_data, execution=False, engine=engine, save=False)
+    else:
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            algo.run(list_data, execution=False, engine=engine, save=False)
+
+    closed = evaluator.closed_trades
+    wins = sum(1 for t in closed if t["pnl"] > 0)
+
+    return {
+        **params,
+        "roi": evaluator.get_roi_closed_trades(),
+        "final_balance": evaluator.get_final_balance_closed_trades(),
+        "trades": len(closed),
+        "win_rate": (wins / len(closed) * 100) if closed else 0.0,
+        "bars_per_sec": algo.last_run_stats.get("bars_per_sec"),
+        "runtime": time.perf_counter() - start
+    }
+
+
+class CParamSweep:
+    def __init__(self, strategy_name, list_data, initial_usdc=1000.0, trading_fee_rate=0.001,
+                 risk_per_trade_pct=1, engine="array", max_workers=None):
+        """
+        Balayage de paramètres du constructeur d'une stratégie sur plusieurs cœurs.
+
+        :param strategy_name: nom de la stratégie (module strategies.<nom>)
+        :param list_data: liste de tuples (DataFrame, symbole), ex: load_symbol_data()
+        :param engine: moteur de CTradingAlgo.run ("array" ou "pandas")
+        :param max_workers: nombre de processus (None = nombre de cœurs)
+        """
+        self.strategy_name = strategy_name
+        self.list_data = list_data
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.config = {
+            "strategy_name": strategy_name,
+            "initial_usdc": initial_usdc,
+            "trading_fee_rate": trading_fee_rate,
+            "risk_per_trade_pct": risk_per_trade_pct,
+            "engine": engine
+        }
+        self.results = pd.DataFrame()
+
+    # ======================================================
+    # GÉNÉRATION DES JEUX DE PARAMÈTRES
+    # ======================================================
+    @staticmethod
+    def grid(param_grid: dict):
+        """
+        Produit cartésien : {"stop_loss_ratio": [0.97, 0.98], "max_bars_in_trade": [144, 288]}
+        → liste de dicts de paramètres.
+        """
+        keys = list(param_grid.keys())
+        return [dict(zip(keys, values)) for values in itertools.product(*param_grid.values())]
+
+    @staticmethod
+    def random_search(param_space: dict, n_iter: int, seed=None):
+        """
+        Tirage aléatoire de n_iter jeux de paramètres.
+        Valeur liste → choix parmi la liste ; tuple (min, max) → uniforme
+        (entier si les deux bornes sont entières).
+        """
+        rng = random.Random(seed)
+        param_sets = []
+        for _ in range(n_iter):
+            params = {}
+            for key, space in param_space.items():
+                if isinstance(space, tuple) and len(space) == 2:
+                    low, high = space
+                    if isinstance(low, int) and isinstance(high, int):
+                        params[key] = rng.randint(low, high)
+                    else:
+                        params[key] = rng.uniform(low, high)
+                else:
+                    params[key] = rng.choice(list(space))
+            param_sets.append(params)
+        return param_sets
+
+    # ======================================================
+    # EXÉCUTION
+    # ======================================================
+    def run(self, param_sets: list):
+        """
+        Lance un backtest par jeu de paramètres, répartis sur un ProcessPoolExecutor.
+        Les données sont publiées une seule fois en mémoire partagée et relues
+        en lecture seule par chaque worker.
+
+        :return: DataFrame des résultats (une ligne par jeu de paramètres)
+        """
+        print(f"🧪 Sweep {self.strategy_name} : {len(param_sets)} runs sur {self.max_workers} workers")
+        start = time.perf_counter()
+        rows = []
+
+        if self.max_workers == 1:
+            for params in param_sets:
+                rows.append(run_backtest(self.list_data, params, **self.config))
+        else:
+            shared = CSharedFrames.CSharedFrames()
+            try:
+                spec = shared.publish(self.list_data)
+                with ProcessPoolExecutor(max_workers=self.max_workers,
+                                         initializer=_init_worker,
+                                         initargs=(spec, self.config)) as pool:
+                    futures = {pool.submit(_run_one, params): params for params in param_sets}
+                    for future in as_completed(futures):
+                        try:
+                            rows.append(future.result())
+                        except Exception as e:
+                            print(f"⚠️ Run échoué {futures[future]} : {e}")
+            finally:
+                shared.close()
+
+        self.results = pd.DataFrame(rows)
+        print(f"✅ Sweep terminé en {time.perf_counter() - start:.1f}s")
+        return self.results
+
+    def sort(self, metric="roi", ascending=False):
+        """Retourne les résultats triés selon une métrique (roi, win_rate, trades, runtime...)."""
+        return self.results.sort_values(metric, ascending=ascending).reset_index(drop=True)
@@ -1,9 +1,10 @@
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 import pandas as pd
 import requests
 import warnings
 import CTradingAlgo
+import CCandleRing
 
 
 class CProd:
@@ -41,6 +42,12 @@ class CProd:
 
         self.symbol_dfs = {}
 
+        # Buffers circulaires de bougies par symbole (capacité fixe = taille de l'historique)
+        self.rings = {}
+
+        # Pipelines d'indicateurs à état par symbole (si la stratégie en fournit)
+        self.pipelines = {}
+
     @staticmethod
     def test_internet_connection(timeout=3):
         """Teste si on est connecté à Internet."""
@@ -50,14 +57,6 @@ class CProd:
         except requests.RequestException:
             return False
 
-    @staticmethod
-    def extend_df_with_sym(df_sym: pd.DataFrame, df_new: pd.DataFrame) -> pd.DataFrame:
-        """Ajoute dans df_new les colonnes présentes dans df_sym mais absentes dans df_new."""
-        missing_cols = [c for c in df_sym.columns if c not in df_new.columns]
-        for col in missing_cols:
-            df_new[col] = pd.NA
-        return df_new
-
     @staticmethod
     def display_last_indicators_with_state(symbol_dfs: dict, algo):
         """Affiche les derniers indicateurs et l'état de chaque symbole."""
@@ -82,8 +81,14 @@ class CProd:
 
         for sym in self.symbols:
             df_sym = df_hist[df_hist["symbol"] == sym].drop(columns=["symbol"])
-            df_sym = self.algo.strategy.apply_indicators(df_sym, is_btc_file=(sym == "BTCUSDC"))
+            if hasattr(self.algo.strategy, "get_indicator_pipeline"):
+                # Calcul complet une seule fois, puis mises à jour incrémentales
+                self.pipelines[sym] = self.algo.strategy.get_indicator_pipeline(is_btc_file=(sym == "BTCUSDC"))
+                df_sym = self.pipelines[sym].apply(df_sym)
+            else:
+                df_sym = self.algo.strategy.apply_indicators(df_sym, is_btc_file=(sym == "BTCUSDC"))
             self.symbol_dfs[sym] = df_sym
+            self.rings[sym] = CCandleRing.CCandleRing.from_df(df_sym)
 
     def run_backtest(self):
         """Exécute une simulation historique complète."""
@@ -118,33 +123,32 @@ class CProd:
                 list_data_last = []
 
                 for sym in self.symbols:
-                    df_sym = self.symbol_dfs[sym]
+                    ring = self.rings[sym]
+                    pipeline = self.pipelines.get(sym)
                     df_new = df_last[df_last["symbol"] == sym].drop(columns=["symbol"])
 
-                    df_new = self.extend_df_with_sym(df_sym, df_new)
-
-                    # Gestion des gaps temporels
-                    if not df_sym.empty:
-                        last_time = df_sym.index[-1]
-                        new_time = df_new.index[-1]
-                        expected_time = last_time + timedelta(minutes=1)
-                        if expected_time < new_time:
-                            print(f"⚠️ Gap détecté pour {sym}: {expected_time} -> {new_time}")
-                            n_missing = int((new_time - expected_time).total_seconds() / 60)
-                            for i in range(n_missing):
-                                missing_time = expected_time + timedelta(minutes=i)
-                                missing_row = df_sym.iloc[[-1]].copy()
-                                missing_row.index = [missing_time]
-                                df_sym = pd.concat([df_sym, missing_row])
-
-                    # Ajout nouvelle bougie
-                    df_sym = pd.concat([df_sym.iloc[1:], df_new])
-
-                    # Réappliquer indicateurs
-                    df_sym = self.algo.strategy.apply_indicators(df_sym, is_btc_file=(sym == "BTCUSDC"))
-                    self.symbol_dfs[sym] = df_sym
-
-                    df_last_with_ind = df_sym.tail(1)
+                    # Gestion des gaps temporels : bougies fictives (copies de la dernière) en une fois
+                    df_gap = ring.gap_frame(df_new.index[-1])
+                    if not df_gap.empty:
+                        print(f"⚠️ Gap détecté pour {sym}: {df_gap.index[0]} -> {df_new.index[-1]}")
+                        if pipeline is not None:
+                            # Les bougies fictives font aussi avancer l'état des indicateurs
+                            df_gap = pipeline.update(df_gap)
+                        ring.append(df_gap)
+
+                    if pipeline is not None:
+                        # Mise à jour incrémentale : coût proportionnel aux nouvelles bougies
+                        ring.append(pipeline.update(df_new))
+                    else:
+                        # Ajout nouvelle bougie puis réapplication des indicateurs sur la fenêtre
+                        ring.append(df_new)
+                        df_sym = self.algo.strategy.apply_indicators(ring.view(), is_btc_file=(sym == "BTCUSDC"))
+                        ring.load(df_sym)
+
+                    # Vue sans copie sur le buffer (valide jusqu'à la prochaine minute)
+                    self.symbol_dfs[sym] = ring.view()
+
+                    df_last_with_ind = ring.tail(1)
                     list_data_last.append((df_last_with_ind, sym))
 
                 # Exécution stratégie sur dernière bougie
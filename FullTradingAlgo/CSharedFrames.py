@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+
+class CSharedFrames:
+    """
+    Publie une liste de DataFrames (df, symbole) en mémoire partagée pour que
+    des processus workers puissent les relire sans re-pickling.
+
+    - Colonnes numériques : bloc float64 (ordre Fortran) dans un segment partagé,
+      relu en lecture seule sans copie.
+    - Index : int64 (ns depuis epoch) dans le même segment.
+    - Colonnes non numériques : transmises dans la spec (petites en pratique).
+    """
+
+    def __init__(self):
+        self.segments = []
+        self.spec = []
+
+    # ======================================================
+    # PUBLICATION (processus parent)
+    # ======================================================
+    def publish(self, list_data: list):
+        """
+        Copie les données en mémoire partagée et retourne la spec picklable
+        à transmettre aux workers (voir attach()).
+        """
+        for df, symbol in list_data:
+            index = pd.DatetimeIndex(df.index)
+            num_cols = [c for c in df.columns
+                        if pd.api.types.is_numeric_dtype(df[c].dtype)
+                        and not pd.api.types.is_bool_dtype(df[c].dtype)]
+            obj_cols = {c: df[c].to_numpy() for c in df.columns if c not in num_cols}
+
+            n, k = len(df), len(num_cols)
+            shm = shared_memory.SharedMemory(create=True, size=max(8 * n * (k + 1), 1))
+            self.segments.append(shm)
+
+            idx_arr = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+            idx_arr[:] = index.as_unit("ns").asi8 if index.tz is None else \
+                index.tz_convert("UTC").as_unit("ns").asi8
+
+            values = np.ndarray((n, k), dtype=np.float64, buffer=shm.buf, offset=8 * n, order="F")
+            for j, col in enumerate(num_cols):
+                values[:, j] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+            self.spec.append({
+                "symbol": symbol,
+                "shm_name": shm.name,
+                "n_rows": n,
+                "num_cols": num_cols,
+                "obj_cols": obj_cols,
+                "columns": list(df.columns),
+                "tz": str(index.tz) if index.tz is not None else None,
+                "unit": index.unit,
+                "index_name": index.name
+            })
+
+        return self.spec
+
+    def close(self):
+        """Libère les segments partagés (à appeler dans le parent après le pool)."""
+        for shm in self.segments:
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self.segments = []
+        self.spec = []
+
+    # ======================================================
+    # RATTACHEMENT (processus worker)
+    # ======================================================
+    @staticmethod
+    def attach(spec, symbols=None):
+        """
+        Reconstruit la liste [(df, symbole)] depuis la spec, en lecture seule.
+        Retourne aussi les segments ouverts (à garder vivants tant que les df sont utilisés).
+
+        :param symbols: sous-ensemble de symboles à rattacher (None = tous)
+        """
+        list_data = []
+        segments = []
+
+        for item in spec:
+            if symbols is not None and item["symbol"] not in symbols:
+                continue
+
+            shm = shared_memory.SharedMemory(name=item["shm_name"])
+            segments.append(shm)
+
+            n, k = item["n_rows"], len(item["num_cols"])
+            idx_arr = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+            values = np.ndarray((n, k), dtype=np.float64, buffer=shm.buf, offset=8 * n, order="F")
+            values.flags.writeable = False
+
+            index = pd.DatetimeIndex(idx_arr.view("datetime64[ns]").copy(), name=item["index_name"])
+            if item["tz"] is not None:
+                index = index.tz_localize("UTC").tz_convert(item["tz"])
+            index = index.as_unit(item["unit"])
+
+            df = pd.DataFrame(values, index=index, columns=item["num_cols"], copy=False)
+            for col, arr in item["obj_cols"].items():
+                df[col] = arr
+            if item["obj_cols"]:
+                df = df[item["columns"]]
+
+            list_data.append((df, item["symbol"]))
+
+        return list_data, segments
@@ -0,0 +1,223 @@
+import os
+import sys
+import time
+import heapq
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+import CTradingAlgo
+import CSharedFrames
+
+
+OPEN_SIDES = ("BUY_LONG", "SELL_SHORT")
+
+
+class COrderRecorder:
+    """
+    Interface de trading utilisée dans les workers : enregistre les ordres au lieu
+    de les exécuter. Le solde exposé est un solde nominal fixe ; si la stratégie l'a
+    lu pendant la barre d'un OPEN, le montant sera remis à l'échelle du solde réel
+    lors du rejeu.
+    """
+
+    def __init__(self, nominal_usdc):
+        self.nominal_usdc = nominal_usdc
+        self.orders = []
+        self.balance_read = False
+
+    def begin_bar(self):
+        self.balance_read = False
+
+    def get_available_usdc(self):
+        self.balance_read = True
+        return self.nominal_usdc
+
+    def place_order(self, price, side, asset, timestamp, amount_usdc=0.0, exit_type=None):
+        self.orders.append({
+            "price": price,
+            "side": side,
+            "asset": asset,
+            "timestamp": timestamp,
+            "amount_usdc": amount_usdc,
+            "exit_type": exit_type,
+            "scaled": self.balance_read and side in OPEN_SIDES
+        })
+
+
+# ==========================================================
+# WORKER
+# ==========================================================
+_WORKER = {}
+
+
+def _init_worker(spec, config):
+    _WORKER["spec"] = spec
+    _WORKER["config"] = config
+
+
+def _run_symbol(symbol):
+    config = _WORKER["config"]
+    list_data, segments = CSharedFrames.CSharedFrames.attach(_WORKER["spec"], symbols={symbol})
+    try:
+        return run_symbol(list_data, **config)
+    finally:
+        del list_data
+        for shm in segments:
+            shm.close()
+
+
+def run_symbol(list_data, strategy_name, nominal_usdc, risk_per_trade_pct, strategy_params, engine):
+    """Backtest d'un seul symbole avec enregistrement des ordres (exécuté dans un worker)."""
+    (_, symbol), = list_data
+    recorder = COrderRecorder(nominal_usdc)
+    algo = CTradingAlgo.CTradingAlgo(recorder, risk_per_trade_pct=risk_per_trade_pct,
+                                     strategy_name=strategy_name, strategy_params=strategy_params)
+
+    # Remise à zéro du marqueur de lecture du solde avant chaque barre
+    apply = algo.strategy.apply
+
+    def apply_bar(*args, **kwargs):
+        recorder.begin_bar()
+        return apply(*args, **kwargs)
+
+    algo.strategy.apply = apply_bar
+
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        algo.run(list_data, execution=False, engine=engine, save=False)
+
+    # Marqueurs entry_price_* / exit_price_* (hors colonnes vides "*")
+    df = algo.symbol_dfs[symbol]
+    markers = {}
+    for col in df.columns:
+        if (col.startswith("entry_price_") or col.startswith("exit_price_")) and "_*_" not in col:
+            values = df[col].dropna()
+            markers[col] = dict(zip(values.index, values.to_numpy()))
+
+    return {
+        "symbol": symbol,
+        "orders": recorder.orders,
+        "positions": algo.open_positions,
+        "markers": markers,
+        "state": getattr(algo.strategy, "state", {}).get(symbol),
+        "bars": algo.last_run_stats.get("bars", 0)
+    }
+
+
+class CSymbolParallel:
+    def __init__(self, algo, max_workers=None, engine="array"):
+        """
+        Backtest découpé par symbole sur plusieurs processus, pour les stratégies
+        qui déclarent `symbol_independent = True` (état uniquement dans self.state[symbol]).
+
+        :param algo: instance CTradingAlgo (son interface_trade reçoit le rejeu des ordres)
+        :param max_workers: nombre de processus (None = nombre de cœurs)
+        :param engine: moteur de CTradingAlgo.run utilisé dans chaque worker
+        """
+        self.algo = algo
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.engine = engine
+
+    def run(self, list_data: list, save: bool = True):
+        algo = self.algo
+        if not getattr(algo.strategy, "symbol_independent", False):
+            raise ValueError(f"La stratégie {algo.strategy_name} ne déclare pas symbol_independent")
+
+        symbols = [sym for _, sym in list_data]
+        nominal_usdc = algo.interface_trade.get_available_usdc()
+        config = {
+            "strategy_name": algo.strategy_name,
+            "nominal_usdc": nominal_usdc,
+            "risk_per_trade_pct": algo.risk_per_trade_pct,
+            "strategy_params": algo.strategy_params,
+            "engine": self.engine
+        }
+
+        print(f"🔀 Backtest par symbole : {len(symbols)} symboles sur {self.max_workers} workers")
+        start = time.perf_counter()
+
+        if self.max_workers == 1:
+            results = [run_symbol([item], **config) for item in list_data]
+        else:
+            shared = CSharedFrames.CSharedFrames()
+            try:
+                spec = shared.publish(list_data)
+                with ProcessPoolExecutor(max_workers=self.max_workers,
+                                         initializer=_init_worker, initargs=(spec, config)) as pool:
+                    results = list(pool.map(_run_symbol, symbols))
+            finally:
+                shared.close()
+
+        self._replay(results, nominal_usdc)
+        elapsed = time.perf_counter() - start
+
+        n_bars = sum(r["bars"] for r in results)
+        algo.last_run_stats = {
+            "engine": f"parallel/{self.engine}",
+            "bars": n_bars,
+            "seconds": elapsed,
+            "bars_per_sec": n_bars / elapsed if elapsed > 0 else float("inf")
+        }
+        print(f"⚡ [parallel/{self.engine}] {n_bars} barres en {elapsed:.2f}s "
+              f"({algo.last_run_stats['bars_per_sec']:.0f} barres/s)")
+
+        if save:
+            for df, symbol in list_data:
+                df = df.copy()
+                df["symbol"] = symbol
+                df["entry_price_*_g_P1"] = None
+                df["exit_price_*_r_P1"] = None
+                algo.symbol_dfs[symbol] = df
+            for r in results:
+                for col, marks in r["markers"].items():
+                    for timestamp, value in marks.items():
+                        algo._journal(r["symbol"], timestamp, col, value)
+            algo._flush_journal()
+            algo._save_results()
+
+    def _replay(self, results, nominal_usdc):
+        """
+        Fusion déterministe des flux d'ordres (timestamp, rang du symbole, ordre d'émission)
+        et rejeu dans l'interface de trading partagée (solde USDC commun).
+        """
+        algo = self.algo
+        streams = []
+        for rank, r in enumerate(results):
+            positions = iter(r["positions"])
+            stream = []
+            for seq, order in enumerate(r["orders"]):
+                position = next(positions) if order["side"] in OPEN_SIDES else None
+                stream.append((order["timestamp"], rank, seq, order, position))
+            streams.append(stream)
+
+            if r["state"] is not None and hasattr(algo.strategy, "state"):
+                algo.strategy.state[r["symbol"]] = r["state"]
+
+        for _, _, _, order, position in heapq.merge(*streams, key=lambda x: x[:3]):
+            amount_usdc = order["amount_usdc"]
+            if order["scaled"] and nominal_usdc:
+                amount_usdc = amount_usdc * (algo.interface_trade.get_available_usdc() / nominal_usdc)
+
+            if position is not None:
+                position["usdc"] = amount_usdc
+                algo.open_positions.append(position)
+                algo.interface_trade.place_order(
+                    price=order["price"],
+                    side=order["side"],
+                    asset=order["asset"],
+                    timestamp=order["timestamp"],
+                    amount_usdc=amount_usdc
+                )
+                algo.total_trades += 1
+            else:
+                algo.interface_trade.place_order(
+                    price=order["price"],
+                    side=order["side"],
+                    asset=order["asset"],
+                    timestamp=order["timestamp"],
+                    exit_type=order["exit_type"]
+                )
+                algo.closed_count += 1
+                algo.total_trades += 1
@@ -1,14 +1,20 @@
 import os
+import time
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 import importlib
 
+import CBarArrays
+
 
 class CTradingAlgo:
-    def __init__(self, l_interface_trade, risk_per_trade_pct: float = 0.1, strategy_name: str = "strategy_1"):
+    def __init__(self, l_interface_trade, risk_per_trade_pct: float = 0.1, strategy_name: str = "strategy_1",
+                 strategy_params: dict = None):
         self.interface_trade = l_interface_trade
         self.risk_per_trade_pct = risk_per_trade_pct
         self.strategy_name = strategy_name
+        self.strategy_params = strategy_params or {}
         self.stop_loss_ratio = 0.98
 
         self.open_positions = []
@@ -18,6 +24,12 @@ class CTradingAlgo:
         # Stockage des DataFrames par symbol
         self.symbol_dfs = {}
 
+        # Statistiques du dernier run (moteur, barres, durée, barres/s)
+        self.last_run_stats = {}
+
+        # Journal des marqueurs d'actions : symbol → colonne → {timestamp: valeur}
+        self.action_journal = {}
+
         # # Dynamically instantiate the strategy class
         # if self.strategy_name == "4h_HA":
         #     self.strategy = CStrat_4h_HA(self.interface_trade, self.risk_per_trade_pct, self.stop_loss_ratio)
@@ -38,26 +50,72 @@ class CTradingAlgo:
         except (ImportError, AttributeError):
             raise ValueError(f"Unknown strategy: {self.strategy_name}")
 
-        # Instanciation
+        # Instanciation (paramètres supplémentaires du constructeur via strategy_params)
         self.strategy = strategy_class(
             self.interface_trade,
             self.risk_per_trade_pct,
+            **self.strategy_params
         )
 
-    def run(self, list_data: list, execution):
-        merged = []
+    def run(self, list_data: list, execution, engine: str = "pandas", save: bool = True):
+        """
+        Exécute la stratégie sur les données fournies.
+
+        :param list_data: liste de tuples (DataFrame, symbole)
+        :param execution: True → mode production (seule la dernière minute est débloquée)
+        :param engine: "pandas" (boucle groupby/iterrows historique) ou
+                       "array" (tableaux NumPy pré-alignés, itération par index de barre)
+        :param save: sauvegarde des .panda en fin de backtest (execution=False)
+        """
+        if engine not in ("pandas", "array"):
+            raise ValueError(f"Unknown engine: {engine}")
+
+        symbols = []
         for df, symbol in list_data:
+            symbols.append(symbol)
             df = df.copy()
             df["symbol"] = symbol
             # Ajout des colonnes vides
             df["entry_price_*_g_P1"] = None
             df["exit_price_*_r_P1"] = None
             self.symbol_dfs[symbol] = df
-            merged.append(df)
 
-        full_df = pd.concat(merged).sort_index()
+        start = time.perf_counter()
+        if engine == "array":
+            n_bars = self._run_array(symbols, execution)
+        else:
+            n_bars = self._run_pandas(symbols, execution)
+        elapsed = time.perf_counter() - start
+
+        self.last_run_stats = {
+            "engine": engine,
+            "bars": n_bars,
+            "seconds": elapsed,
+            "bars_per_sec": n_bars / elapsed if elapsed > 0 else float("inf")
+        }
+        print(f"⚡ [{engine}] {n_bars} barres en {elapsed:.2f}s "
+              f"({self.last_run_stats['bars_per_sec']:.0f} barres/s)")
+
+        # Écriture groupée des marqueurs avant sauvegarde
+        self._flush_journal()
+
+        # Sauvegarde des df par pièce
+        if not execution and save:
+            self._save_results()
+
+    def run_parallel(self, list_data: list, max_workers=None, engine: str = "array", save: bool = True):
+        """
+        Backtest découpé par symbole sur plusieurs processus, puis rejeu déterministe
+        des ordres dans interface_trade. Réservé aux stratégies symbol_independent.
+        """
+        import CSymbolParallel
+        CSymbolParallel.CSymbolParallel(self, max_workers=max_workers, engine=engine).run(list_data, save=save)
+
+    def _run_pandas(self, symbols, execution):
+        full_df = pd.concat([self.symbol_dfs[sym] for sym in symbols]).sort_index()
         grouped = full_df.groupby(full_df.index)
         total_ticks = len(grouped)
+        n_bars = 0
 
         # Initialisation de blocked
         blocked = execution  # si exec=False -> blocked=False, si exec=True -> blocked=True
@@ -75,55 +133,118 @@ class CTradingAlgo:
                 if timestamp not in df.index:
                     continue
 
+                n_bars += 1
                 actions = self.strategy.apply(df, symbol, row, timestamp, self.open_positions, blocked)
 
                 if blocked:
                     continue
 
-                for action in actions:
-                    if action["action"] == "OPEN":
-                        self._open_position(
-                            symbol=action["symbol"],
-                            price=action["price"],
-                            sl=action["sl"],
-                            timestamp=timestamp,
-                            side=action["side"],
-                            usdc=action["usdc"]
-                        )
-
-                        if action["side"] == "LONG":
-                            # On écrit dans la colonne entry_price
-                            df.loc[timestamp, "entry_price_^_g_P1"] = action["price"]
-                        else:
-                            # On écrit dans la colonne entry_price
-                            df.loc[timestamp, "entry_price_v_g_P1"] = action["price"]
-
-
-                    elif action["action"] == "CLOSE":
-                        self._close_position(
-                            pos=[],
-                            exit_price=action["exit_price"],
-                            symbol=action["symbol"],
-                            timestamp=timestamp,
-                            exit_side=action["exit_side"],
-                            reason=action["reason"]
-                        )
-                        if action["side"] == "LONG":
-                            # On écrit dans la colonne exit_price
-                            df.loc[timestamp, "exit_price_^_r_P1"] = action["exit_price"]
-                        else:
-                            # On écrit dans la colonne exit_price
-                            df.loc[timestamp, "exit_price_v_r_P1"] = action["exit_price"]
-
-                    elif action["action"] == "M1":
-                        df.loc[timestamp, "entry_price_^_g_P1"] = action["price"]
-
-                    elif action["action"] == "M2":
-                        df.loc[timestamp, "entry_price_v_g_P1"] = action["price"]
+                self._handle_actions(actions, symbol, timestamp)
 
-        # Sauvegarde des df par pièce
-        if not execution:
-            self._save_results()
+        return n_bars
+
+    def _run_array(self, symbols, execution):
+        """
+        Boucle par index de barre entier sur des tableaux pré-alignés.
+        Les stratégies reçoivent le DataFrame du symbole (inchangé) et une vue
+        CBarRow à la place de la Series pandas.
+        """
+        arrays = CBarArrays.CBarArrays([(self.symbol_dfs[sym], sym) for sym in symbols])
+        timestamps = list(arrays.index)
+        total_ticks = len(timestamps)
+        present = arrays.present
+        n_bars = 0
+
+        blocked = execution
+
+        for t in tqdm(range(total_ticks), total=total_ticks, desc="🔄 Simulation trading (array)"):
+            if execution and t == total_ticks - 1:
+                blocked = False
+
+            timestamp = timestamps[t]
+            for s in np.flatnonzero(present[t]):
+                symbol = symbols[s]
+                df = self.symbol_dfs[symbol]
+
+                n_bars += 1
+                actions = self.strategy.apply(df, symbol, arrays.row(t, s), timestamp, self.open_positions, blocked)
+
+                if blocked:
+                    continue
+
+                self._handle_actions(actions, symbol, timestamp)
+
+        return n_bars
+
+    def _handle_actions(self, actions, symbol, timestamp):
+        for action in actions:
+            if action["action"] == "OPEN":
+                self._open_position(
+                    symbol=action["symbol"],
+                    price=action["price"],
+                    sl=action["sl"],
+                    timestamp=timestamp,
+                    side=action["side"],
+                    usdc=action["usdc"]
+                )
+
+                if action["side"] == "LONG":
+                    # On écrit dans la colonne entry_price
+                    self._journal(symbol, timestamp, "entry_price_^_g_P1", action["price"])
+                else:
+                    # On écrit dans la colonne entry_price
+                    self._journal(symbol, timestamp, "entry_price_v_g_P1", action["price"])
+
+
+            elif action["action"] == "CLOSE":
+                self._close_position(
+                    pos=[],
+                    exit_price=action["exit_price"],
+                    symbol=action["symbol"],
+                    timestamp=timestamp,
+                    exit_side=action["exit_side"],
+                    reason=action["reason"]
+                )
+                if action["side"] == "LONG":
+                    # On écrit dans la colonne exit_price
+                    self._journal(symbol, timestamp, "exit_price_^_r_P1", action["exit_price"])
+                else:
+                    # On écrit dans la colonne exit_price
+                    self._journal(symbol, timestamp, "exit_price_v_r_P1", action["exit_price"])
+
+            elif action["action"] == "M1":
+                self._journal(symbol, timestamp, "entry_price_^_g_P1", action["price"])
+
+            elif action["action"] == "M2":
+                self._journal(symbol, timestamp, "entry_price_v_g_P1", action["price"])
+
+    # ======================================================
+    # JOURNAL DES MARQUEURS (entry_price_* / exit_price_*)
+    # ======================================================
+    def _journal(self, symbol, timestamp, column, value):
+        """Enregistre un marqueur sans toucher au DataFrame (dernière écriture gagnante)."""
+        self.action_journal.setdefault(symbol, {}).setdefault(column, {})[timestamp] = value
+
+    def _flush_journal(self):
+        """
+        Matérialise les marqueurs du journal dans les DataFrames par symbole, en une
+        écriture par colonne. Même résultat que les df.loc[timestamp, col] = value successifs :
+        colonnes créées dans l'ordre de première écriture, en float avec NaN ailleurs.
+        """
+        for symbol, columns in self.action_journal.items():
+            df = self.symbol_dfs[symbol]
+            for column, marks in columns.items():
+                if column not in df.columns:
+                    df[column] = np.nan
+
+                if df.index.is_unique:
+                    pos = df.index.get_indexer(list(marks.keys()))
+                    df.iloc[pos, df.columns.get_loc(column)] = list(marks.values())
+                else:
+                    for timestamp, value in marks.items():
+                        df.loc[timestamp, column] = value
+
+        self.action_journal = {}
 
     def _open_position(self, symbol, price, sl, timestamp, side, usdc):
         self.open_positions.append({
@@ -53,7 +53,7 @@ symbols = [
 list_data = load_symbol_data(symbols)
 
 # Lancement de l'algo
-algo.run(list_data,execution=False)
+algo.run(list_data, execution=False, engine="array")
 
 evaluator.print_summary()
 evaluator.plot_combined()
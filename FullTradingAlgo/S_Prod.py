@@ -1,8 +1,9 @@
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from downloader import CBinanceDataFetcher
 from downloader import CBitgetDataFetcher
 import CTradingAlgo
+import CCandleRing
 import pandas as pd
 #import CEvaluateROI
 import requests
@@ -45,19 +46,6 @@ def display_last_indicators_with_state(symbol_dfs: dict, algo: CTradingAlgo):
     print("\n📊 Dernière bougie avec indicateurs appliqués et état :")
     print(df_display.to_string(index=False))
 
-def extend_df_with_sym(df_sym: pd.DataFrame, df_new: pd.DataFrame) -> pd.DataFrame:
-    """
-    Ajoute dans df_new les colonnes présentes dans df_sym mais absentes dans df_new.
-    Les nouvelles colonnes sont créées et remplies avec NaN.
-    Retourne un DataFrame élargi qui contient toutes les colonnes de df_new + manquantes.
-    """
-    missing_cols = [c for c in df_sym.columns if c not in df_new.columns]
-
-    for col in missing_cols:
-        df_new[col] = pd.NA  # ou np.nan si tu préfères
-
-    return df_new
-
 def align_df_to_new(df_sym: pd.DataFrame, df_new: pd.DataFrame) -> pd.DataFrame:
     """
     Supprime dans df_sym toutes les colonnes qui n'existent pas dans df_new.
@@ -84,7 +72,7 @@ trader = COrders_Bitget.COrders_Bitget(identifiants["api_key"], identifiants["ap
 
 # === INITIALISATION ===
 #fetcher = CBinanceDataFetcher.BinanceDataFetcher()
-fetcher = CBitgetDataFetcher.BitgetDataFetcher()
+fetcher = CBitgetDataFetcher.BitgetDataFetcher(cache_dir="candle_cache")  # cache disque : seule la fin manquante est téléchargée
 algo = CTradingAlgo.CTradingAlgo(l_interface_trade=trader, risk_per_trade_pct=10, strategy_name="CStrat_TrackerShort")
 
 # === 1. Téléchargement et simulation historique ===
@@ -93,10 +81,12 @@ df_hist = fetcher.get_historical_klines(symbols, interval=interval, days=days)
 
 # Préparation des DataFrames par symbole
 symbol_dfs = {}
+rings = {}  # buffers circulaires à capacité fixe (taille de l'historique)
 for sym in symbols:
     df_sym = df_hist[df_hist["symbol"] == sym].drop(columns=["symbol"])
     df_sym = algo.strategy.apply_indicators(df_sym, is_btc_file=(sym == "BTCUSDC"))
     symbol_dfs[sym] = df_sym
+    rings[sym] = CCandleRing.CCandleRing.from_df(df_sym)
 
 # Simulation historique complète
 list_data_hist = [(df, sym) for sym, df in symbol_dfs.items()]
@@ -131,53 +121,30 @@ while True:
         list_data_last = []
 
         for sym in symbols:
-            df_sym = symbol_dfs[sym]
+            ring = rings[sym]
 
             # Extraire la dernière bougie Binance
             df_new = df_last[df_last["symbol"] == sym].drop(columns=["symbol"])
 
-            # Aligner df_sym sur les colonnes de df_new
-            #df_sym = align_df_to_new(df_sym, df_new)
-            df_new = extend_df_with_sym(df_sym, df_new)
-
             # ======= DETECTION ET COMBLEMENT DES GAPS =======
-            # Vérifie s'il y a un gap entre la dernière bougie DF et df_new
-            if not df_sym.empty:
-                last_time = df_sym.index[-1]
-                new_time = df_new.index[-1]
-                expected_time = last_time + timedelta(minutes=1)
-
-                if expected_time < new_time:
-                    print(f"⚠️ Gap détecté pour {sym}: {expected_time} -> {new_time}")
-                    # Générer des bougies "fictives" avec close = dernière close connue
-                    n_missing = int((new_time - expected_time).total_seconds() / 60)
-                    for i in range(n_missing):
-                        missing_time = expected_time + timedelta(minutes=i)
-                        missing_row = df_sym.iloc[[-1]].copy()
-                        missing_row.index = [missing_time]
-                        df_sym = pd.concat([df_sym, missing_row])
-
-            # Vérifie si des doublons existent déjà dans df_sym
-            dups = df_sym.index[df_sym.index.duplicated()]
-            if not dups.empty:
-                print("⚠️ Doublons détectés dans df_sym:", dups)
-
-
-            df_sym = pd.concat([df_sym.iloc[1:], df_new])
-
-            # Nettoyage : doublons et tri par index
-            # df_sym = df_sym[~df_sym.index.duplicated(keep='last')]
-            # df_sym = df_sym.sort_index()
-
-            # Réappliquer les indicateurs sur tout df_sym
-            original_cols = df_sym.columns.tolist()
-            df_sym = algo.strategy.apply_indicators(df_sym, is_btc_file=(sym == "BTCUSDC"))
+            # Bougies "fictives" avec close = dernière close connue, ajoutées en une fois
+            df_gap = ring.gap_frame(df_new.index[-1])
+            if not df_gap.empty:
+                print(f"⚠️ Gap détecté pour {sym}: {df_gap.index[0]} -> {df_new.index[-1]}")
+                ring.append(df_gap)
+
+            # Ajout en place (la plus ancienne bougie sort du buffer)
+            ring.append(df_new)
+
+            # Réappliquer les indicateurs sur la fenêtre, puis réécriture dans le buffer
+            df_sym = algo.strategy.apply_indicators(ring.view(), is_btc_file=(sym == "BTCUSDC"))
+            ring.load(df_sym)
 
             # Mise à jour mémoire
-            symbol_dfs[sym] = df_sym
+            symbol_dfs[sym] = ring.view()
 
             # ⚡ On ne garde que la dernière bougie enrichie pour le run
-            df_last_with_ind = df_sym.tail(1)
+            df_last_with_ind = ring.tail(1)
             list_data_last.append((df_last_with_ind, sym))
 
         # Exécution algo uniquement sur la dernière bougie
@@ -0,0 +1,46 @@
+import pandas as pd
+
+import CParamSweep
+
+
+def load_symbol_data(symbols, start_date="20250101_0101", end_date="20250724_0101", folder="panda"):
+    """
+    Charge les DataFrames .panda pour une liste de symboles (cf. S_BackTest_Main).
+
+    Returns:
+        list: Liste de tuples (DataFrame, symbole)
+    """
+    list_data = []
+    for sym in symbols:
+        filename = f"{folder}/{sym}_{start_date}_{end_date}.panda"
+        try:
+            list_data.append((pd.read_pickle(filename), sym))
+        except FileNotFoundError:
+            print(f"⚠️ Fichier introuvable : {filename}")
+    return list_data
+
+
+if __name__ == "__main__":
+    symbols = [
+        "ADAUSDC",
+        "ATOMUSDC",
+        "DOTUSDC",
+        "LINKUSDC",
+        "SOLUSDC"
+    ]
+
+    list_data = load_symbol_data(symbols)
+
+    sweep = CParamSweep.CParamSweep("CStrat_RSI5min30", list_data, initial_usdc=1000,
+                                    trading_fee_rate=0.001, risk_per_trade_pct=1)
+
+    param_sets = sweep.grid({
+        "break_max_timeout_bars": [12, 24, 48],
+        "max_bars_in_trade": [144, 288, 576],
+        "stop_loss_ratio": [0.97, 0.98, 0.99]
+    })
+    # param_sets = sweep.random_search({"stop_loss_ratio": (0.95, 0.99), "max_bars_in_trade": (60, 600)}, n_iter=30)
+
+    sweep.run(param_sets)
+
+    print(sweep.sort("roi").to_string(index=False))
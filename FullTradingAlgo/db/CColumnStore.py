@@ -0,0 +1,120 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class CColumnStore:
+    """
+    Format binaire colonnaire pour les tables larges (index temps × symboles) :
+
+        MAGIC | longueur de l'en-tête (uint64) | en-tête JSON | index int64 | valeurs float64
+
+    - Les valeurs sont stockées colonne par colonne (ordre Fortran) : la colonne d'un
+      symbole est contiguë, et une lecture de sous-ensemble ne touche que ces octets.
+    - Le fichier est relu en memmap (pas de parsing, précision float64 complète).
+    - L'index est soit temporel (int64 ns, tz éventuelle dans l'en-tête), soit une
+      liste de libellés stockée dans l'en-tête (ex. table des weights par symbole).
+    """
+
+    MAGIC = b"CCOLSTORE1\n"
+    ALIGN = 64
+
+    # ======================================================
+    # ÉCRITURE
+    # ======================================================
+    @classmethod
+    def write(cls, path, df: pd.DataFrame):
+        """Écrit df (colonnes numériques) de façon atomique : fichier temporaire + fsync + os.replace."""
+        n, k = df.shape
+        header = {
+            "n_rows": n,
+            "columns": [str(c) for c in df.columns],
+            "index_name": df.index.name
+        }
+
+        if isinstance(df.index, pd.DatetimeIndex):
+            header["index"] = "datetime"
+            header["tz"] = str(df.index.tz) if df.index.tz is not None else None
+            header["unit"] = df.index.unit
+            index = df.index.tz_convert("UTC") if df.index.tz is not None else df.index
+            index_bytes = index.as_unit("ns").asi8.astype("<i8").tobytes()
+        else:
+            header["index"] = "labels"
+            header["labels"] = [str(x) for x in df.index]
+            index_bytes = b""
+
+        raw = json.dumps(header).encode()
+        prefix_len = len(cls.MAGIC) + 8
+        pad = (-(prefix_len + len(raw))) % cls.ALIGN
+        raw += b" " * pad
+
+        values = np.asfortranarray(df.to_numpy(dtype=np.float64, na_value=np.nan))
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(cls.MAGIC)
+            f.write(np.uint64(len(raw)).tobytes())
+            f.write(raw)
+            f.write(index_bytes)
+            values.T.astype("<f8", copy=False).tofile(f)   # colonne par colonne
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    # ======================================================
+    # LECTURE
+    # ======================================================
+    @classmethod
+    def open(cls, path):
+        """
+        Ouvre le fichier en memmap.
+        :return: (header, index, values) avec values de forme (n_rows, n_cols), ordre Fortran
+        """
+        with open(path, "rb") as f:
+            magic = f.read(len(cls.MAGIC))
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} n'est pas un fichier CColumnStore")
+            header_len = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_len))
+
+        n, k = header["n_rows"], len(header["columns"])
+        offset = len(cls.MAGIC) + 8 + header_len
+
+        if header["index"] == "datetime":
+            if n:
+                ns = np.memmap(path, dtype="<i8", mode="r", offset=offset, shape=(n,))
+                index = pd.DatetimeIndex(np.asarray(ns).view("datetime64[ns]"), name=header["index_name"])
+            else:
+                index = pd.DatetimeIndex([], dtype="datetime64[ns]", name=header["index_name"])
+            if header.get("tz"):
+                index = index.tz_localize("UTC").tz_convert(header["tz"])
+            index = index.as_unit(header.get("unit", "ns"))
+            offset += 8 * n
+        else:
+            index = pd.Index(header["labels"], name=header["index_name"])
+
+        if n and k:
+            values = np.memmap(path, dtype="<f8", mode="r", offset=offset, shape=(n, k), order="F")
+        else:
+            values = np.empty((n, k))
+
+        return header, index, values
+
+    @classmethod
+    def read(cls, path, columns=None):
+        """
+        Relit le fichier en DataFrame ; columns = sous-ensemble de colonnes à lire (None = toutes).
+        Seules les colonnes demandées sont copiées hors du memmap.
+        """
+        header, index, values = cls.open(path)
+        all_cols = header["columns"]
+        if columns is None:
+            selected = list(range(len(all_cols)))
+        else:
+            pos = {c: j for j, c in enumerate(all_cols)}
+            selected = [pos[c] for c in columns if c in pos]
+
+        data = np.array(values[:, selected], order="F") if selected else np.empty((len(index), 0))
+        return pd.DataFrame(data, index=index, columns=[all_cols[j] for j in selected])
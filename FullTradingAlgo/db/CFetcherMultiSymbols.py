@@ -1,69 +1,106 @@
+import numpy as np
 import pandas as pd
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 class CFetcherMultiSymbols:
-    def __init__(self, fetcher, interval="15m", limit=500):
+
+    PRICE_TYPES = ["high", "low", "close"]
+
+    def __init__(self, fetcher, interval="15m", limit=500, max_workers=16):
         """
         fetcher : objet possédant la méthode _fetch_klines3(symbol, interval, limit)
         interval : timeframe Binance (ex: '1m', '5m', '15m', '1h')
         limit : nombre de bougies à récupérer
+        max_workers : nombre de symboles téléchargés en parallèle (1 = séquentiel) ;
+                      le débit reste borné par le limiteur du fetcher (CHttpPool)
         """
         self.fetcher = fetcher
         self.interval = interval
         self.limit = limit
+        self.max_workers = max_workers
 
-    def fetch(self, symbols, sleep_between_symbols=0.1):
-        """
-        symbols : liste de symboles (ex: ["BTCUSDT", "ETHUSDT"])
-        retourne : dict { "high": df, "low": df, "close": df }
-        """
-
-        datasets = {
-            "high": None,
-            "low": None,
-            "close": None
-        }
-
-        print(f"[{self.interval}] Fetching {len(symbols)} symbols")
+    def _fetch_one(self, symbol):
+        """Retourne (index, {price_type: valeurs float64}) du symbole, ou None."""
+        try:
+            print(f"[{self.interval}] Fetch {symbol}")
 
-        for symbol in symbols:
-            try:
-                print(f"[{self.interval}] Fetch {symbol}")
+            df = self.fetcher._fetch_klines3(
+                symbol,
+                interval=self.interval,
+                limit=self.limit
+            )
 
-                df = self.fetcher._fetch_klines3(
-                    symbol,
-                    interval=self.interval,
-                    limit=self.limit
-                )
+            if df is None or df.empty:
+                return None
 
-                if df is None or df.empty:
-                    continue
+            # 🔹 Exclure la bougie en cours
+            df = df.iloc[:-1]
 
-                # 🔹 Exclure la bougie en cours
-                df = df.iloc[:-1]
+            # 🔹 S'assurer que l'index est datetime
+            index = pd.to_datetime(df.index)
 
-                # 🔹 S'assurer que l'index est datetime
-                df.index = pd.to_datetime(df.index)
+            values = {
+                price_type: df[price_type].to_numpy(dtype=np.float64)
+                for price_type in self.PRICE_TYPES
+                if price_type in df.columns
+            }
+            return index, values
 
-                for price_type in datasets.keys():
+        except Exception as e:
+            print(f"[{self.interval}] Error {symbol}: {e}")
+            return None
 
-                    if price_type not in df.columns:
-                        continue
-
-                    series = df[price_type].astype(float).copy()
-                    series.name = symbol
+    def fetch(self, symbols, sleep_between_symbols=0.1):
+        """
+        symbols : liste de symboles (ex: ["BTCUSDT", "ETHUSDT"])
+        sleep_between_symbols : pause entre deux symboles en mode séquentiel (max_workers=1)
+        retourne : dict { "high": df, "low": df, "close": df }
+        """
 
-                    if datasets[price_type] is None:
-                        datasets[price_type] = series.to_frame()
-                    else:
-                        datasets[price_type] = datasets[price_type].join(
-                            series, how="outer"
-                        )
+        print(f"[{self.interval}] Fetching {len(symbols)} symbols")
 
+        symbols = list(symbols)
+        if self.max_workers > 1 and len(symbols) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(symbols))) as pool:
+                results = list(pool.map(self._fetch_one, symbols))
+        else:
+            results = []
+            for symbol in symbols:
+                results.append(self._fetch_one(symbol))
                 time.sleep(sleep_between_symbols)
 
-            except Exception as e:
-                print(f"[{self.interval}] Error {symbol}: {e}")
+        fetched = [(symbol, r[0], r[1]) for symbol, r in zip(symbols, results) if r is not None]
+        return self._assemble(fetched)
 
-        return datasets
\ No newline at end of file
+    def _assemble(self, fetched):
+        """
+        Construit chaque matrice large (temps × symboles) en une fois : index = union
+        triée des index des symboles, une colonne par symbole, NaN où il manque une bougie
+        (même résultat que des join(how="outer") successifs, sans recopier la table).
+        """
+        datasets = {price_type: None for price_type in self.PRICE_TYPES}
+        if not fetched:
+            return datasets
+
+        index = fetched[0][1]
+        if len(fetched) > 1:
+            index = index.append([idx for _, idx, _ in fetched[1:]])
+        index = index.unique().sort_values()
+        positions = [index.get_indexer(idx) for _, idx, _ in fetched]
+
+        for price_type in self.PRICE_TYPES:
+            columns = [j for j, (_, _, values) in enumerate(fetched) if price_type in values]
+            if not columns:
+                continue
+
+            matrix = np.full((len(index), len(columns)), np.nan)
+            for k, j in enumerate(columns):
+                matrix[positions[j], k] = fetched[j][2][price_type]
+
+            datasets[price_type] = pd.DataFrame(
+                matrix, index=index, columns=[fetched[j][0] for j in columns]
+            )
+
+        return datasets
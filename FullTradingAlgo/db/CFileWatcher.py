@@ -0,0 +1,150 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+
+class CFileWatcher:
+    """
+    Surveille un répertoire dans un thread de fond et appelle callback(key) une fois
+    qu'un groupe de fichiers (même clé, ex. l'intervalle "4h") a fini d'être écrit.
+
+    - Linux : inotify (IN_CLOSE_WRITE / IN_MOVED_TO) → seules les écritures terminées
+      ou les renommages atomiques sont vus, sans parcourir le répertoire.
+    - Autres systèmes (ou inotify indisponible) : repli par scrutation (os.scandir,
+      taille + mtime) toutes les poll_interval secondes.
+
+    Un enregistrement écrit plusieurs fichiers (high, low, close, rsi, weights) : le
+    callback n'est appelé qu'après settle secondes sans nouvel événement pour la clé.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory, key_func, callback, exts=(".csv", ".bin"), settle=5.0, poll_interval=2.0):
+        """
+        :param key_func: nom de fichier → clé (ou None pour ignorer le fichier)
+        :param callback: appelé dans le thread de fond avec la clé modifiée
+        """
+        self.directory = directory
+        self.key_func = key_func
+        self.callback = callback
+        self.exts = tuple(exts)
+        self.settle = settle
+        self.poll_interval = poll_interval
+
+        self.pending = {}           # clé → instant du dernier événement
+        self._stop = threading.Event()
+        self._thread = None
+        self._fd = self._init_inotify()
+        self.mode = "inotify" if self._fd is not None else "polling"
+
+    # ======================================================
+    # INOTIFY (ctypes, sans dépendance)
+    # ======================================================
+    def _init_inotify(self):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+            if fd < 0:
+                return None
+            wd = libc.inotify_add_watch(
+                fd, os.fsencode(os.path.abspath(self.directory)),
+                self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+            )
+            if wd < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _read_inotify(self, timeout):
+        """Noms de fichiers terminés (close-write / rename) reçus pendant timeout secondes."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        names = []
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(buf):
+            _, _, _, length = self.EVENT_HEADER.unpack_from(buf, offset)
+            offset += self.EVENT_HEADER.size
+            names.append(os.fsdecode(buf[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    # ======================================================
+    # REPLI PAR SCRUTATION
+    # ======================================================
+    def _snapshot(self):
+        snap = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(self.exts):
+                    st = entry.stat()
+                    snap[entry.name] = (st.st_size, st.st_mtime_ns)
+        return snap
+
+    # ======================================================
+    # BOUCLE
+    # ======================================================
+    def _on_names(self, names):
+        now = time.monotonic()
+        for name in names:
+            if not name.endswith(self.exts):
+                continue   # fichiers temporaires (.tmp) ignorés : on attend le rename
+            key = self.key_func(name)
+            if key is not None:
+                self.pending[key] = now
+
+    def _flush_settled(self):
+        now = time.monotonic()
+        for key, last in list(self.pending.items()):
+            if now - last >= self.settle:
+                del self.pending[key]
+                try:
+                    self.callback(key)
+                except Exception as e:
+                    print(f"⚠ Watcher callback error {key}: {e}")
+
+    def _run(self):
+        previous = self._snapshot() if self._fd is None else None
+        while not self._stop.is_set():
+            timeout = min(self.settle, self.poll_interval) if self.pending else self.poll_interval
+            if self._fd is not None:
+                self._on_names(self._read_inotify(timeout))
+            else:
+                self._stop.wait(timeout)
+                current = self._snapshot()
+                self._on_names([n for n, sig in current.items() if previous.get(n) != sig])
+                previous = current
+            self._flush_settled()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="CFileWatcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
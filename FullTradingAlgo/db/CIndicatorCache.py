@@ -0,0 +1,83 @@
+import threading
+
+import pandas as pd
+
+
+class CIndicatorCache:
+    """
+    Mémoïsation des valeurs dérivées des séries stockées (MA daily, fenêtres RSI...) entre
+    deux tours de scan : une série 1d ne change qu'au rechargement de son intervalle.
+
+    Clé : (symbol, interval, nom, génération). CLoadDB appelle invalidate(interval) à chaque
+    rechargement / rattachement ; la génération de l'intervalle avance et ses entrées sont
+    abandonnées. Chaque entrée garde aussi les séries source : si l'appelant passe un autre
+    objet (DB d'un autre instantané), la valeur est recalculée plutôt que servie à tort.
+
+        cache = loader.indicator_cache
+        ma_last, ma_prev = cache.ma_last_two("BTCUSDT", "1d", 10, DB["BTCUSDT"]["1d"]["close"])
+    """
+
+    def __init__(self):
+        self.generations = {}    # interval → compteur de rechargements
+        self._entries = {}       # (symbol, interval, nom, génération) → (sources, valeur)
+        self._lock = threading.Lock()
+
+    # ======================================================
+    # INVALIDATION
+    # ======================================================
+    def invalidate(self, interval):
+        """Nouvelle génération pour l'intervalle : ses valeurs en cache sont abandonnées."""
+        with self._lock:
+            self.generations[interval] = self.generations.get(interval, 0) + 1
+            self._entries = {k: v for k, v in self._entries.items() if k[1] != interval}
+
+    def clear(self):
+        with self._lock:
+            for interval in self.generations:
+                self.generations[interval] += 1
+            self._entries = {}
+
+    # ======================================================
+    # ACCÈS
+    # ======================================================
+    def get(self, symbol, interval, name, sources, compute):
+        """
+        :param name: identifiant hashable de la valeur (ex: ("ma", 10))
+        :param sources: tuple des séries dont la valeur dépend (comparées par identité)
+        :param compute: fonction sans argument qui calcule la valeur (appelée si absente)
+        """
+        if symbol is None:
+            return compute()
+
+        key = (symbol, interval, name, self.generations.get(interval, 0))
+        entry = self._entries.get(key)
+        if entry is not None and len(entry[0]) == len(sources) \
+                and all(a is b for a, b in zip(entry[0], sources)):
+            return entry[1]
+
+        value = compute()
+        with self._lock:
+            # Une invalidation pendant le calcul change la clé : l'entrée devient inaccessible
+            if key[3] == self.generations.get(interval, 0):
+                self._entries[key] = (sources, value)
+        return value
+
+    # ======================================================
+    # MA
+    # ======================================================
+    def ma_last_two(self, symbol, interval, period, closes):
+        """
+        (MA courante, MA précédente) de closes.rolling(period).mean(), NaN si indisponible.
+        La pente de la MA est ma_last - ma_prev.
+        """
+        def compute():
+            ma = pd.Series(closes).rolling(window=period).mean()
+            ma_last = ma.iloc[-1] if len(ma) >= 1 else float("nan")
+            ma_prev = ma.iloc[-2] if len(ma) >= 2 else float("nan")
+            return ma_last, ma_prev
+
+        return self.get(symbol, interval, ("ma", period), (closes,), compute)
+
+    def ma_slope(self, symbol, interval, period, closes):
+        ma_last, ma_prev = self.ma_last_two(symbol, interval, period, closes)
+        return ma_last - ma_prev
@@ -12,10 +12,24 @@ class CIndicators:
     Convention d'arguments:
     - DBOneS: Dict contenant les données d'UN symbole (DB[symbol])
     - dfoneminute: DataFrame avec les données minute (ou None si non requis)
+    - symbol: symbole de DBOneS (optionnel) ; avec un cache, les MA calculées sur les
+      séries stockées sont gardées jusqu'au rechargement de l'intervalle
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, cache=None):
+        """
+        Args:
+            cache: CIndicatorCache partagé (loader.indicator_cache) ou None (aucun cache)
+        """
+        self.cache = cache
+
+    def _ma_last_two(self, closes, ma_period, timeframe, symbol=None):
+        """(MA courante, MA précédente) des closes stockés, via le cache si disponible."""
+        if self.cache is not None:
+            return self.cache.ma_last_two(symbol, timeframe, ma_period, closes)
+
+        ma = pd.DataFrame({"close": closes})["close"].rolling(window=ma_period).mean()
+        return ma.iloc[-1], (ma.iloc[-2] if len(ma) >= 2 else float("nan"))
 
     # ======================================================
     # CALCUL RSI COURANT
@@ -100,7 +114,7 @@ class CIndicators:
     # ======================================================
     # MA DAILY depuis DBOneS
     # ======================================================
-    def is_close_near_daily_ma(self, DBOneS, dfoneminute):
+    def is_close_near_daily_ma(self, DBOneS, dfoneminute, symbol=None):
         """
         Vérifie si le prix est proche d'une MA daily (10, 20, 50 ou 100)
         Proche = prix entre MA et MA * 1.01
@@ -108,6 +122,7 @@ class CIndicators:
         Args:
             DBOneS: Dict avec données d'un symbole (contient "1d" avec "close")
             dfoneminute: DataFrame avec le prix courant (colonne "close")
+            symbol: Symbole de DBOneS (clé du cache des MA, optionnel)
         
         Returns:
             bool: True si proche d'une MA, False sinon
@@ -121,16 +136,15 @@ class CIndicators:
             return False
 
         last_close = dfoneminute["close"].iloc[-1]
-        df = pd.DataFrame({"close": closes})
 
         periods = [10, 20, 50, 100]
 
         for period in periods:
 
-            if len(df) < period:
+            if len(closes) < period:
                 continue
 
-            ma = df["close"].rolling(window=period).mean().iloc[-1]
+            ma = self._ma_last_two(closes, period, "1d", symbol)[0]
 
             if pd.isna(ma):
                 continue
@@ -172,7 +186,7 @@ class CIndicators:
     # ======================================================
     # CHECK: Prix au-dessus de MA (1day) ET MA en hausse
     # ======================================================
-    def check_above_ma_and_ma_inc(self, DBOneS, dfoneminute, ma_period=10, timeframe="1d"):
+    def check_above_ma_and_ma_inc(self, DBOneS, dfoneminute, ma_period=10, timeframe="1d", symbol=None):
         """
         Vérifie que:
         1. Le prix courant est au-dessus de la MA (1day)
@@ -183,6 +197,7 @@ class CIndicators:
             dfoneminute: DataFrame avec le prix courant
             ma_period: Période de la moyenne mobile (défaut: 10)
             timeframe: Timeframe à utiliser (défaut: "1d")
+            symbol: Symbole de DBOneS (clé du cache des MA, optionnel)
         
         Returns:
             bool: True si prix > MA ET MA en hausse, False sinon
@@ -196,11 +211,7 @@ class CIndicators:
         if closes is None or len(closes) < ma_period + 1:
             return False
         
-        df = pd.DataFrame({"close": closes})
-        ma = df["close"].rolling(window=ma_period).mean()
-        
-        ma_last = ma.iloc[-1]
-        ma_prev = ma.iloc[-2]
+        ma_last, ma_prev = self._ma_last_two(closes, ma_period, timeframe, symbol)
         
         if pd.isna(ma_last) or pd.isna(ma_prev):
             return False
@@ -220,7 +231,7 @@ class CIndicators:
     # ======================================================
     # CHECK: Prix au-dessus d'une MA donnée
     # ======================================================
-    def check_close_above_ma(self, DBOneS, dfoneminute, ma_period=50, timeframe="1d"):
+    def check_close_above_ma(self, DBOneS, dfoneminute, ma_period=50, timeframe="1d", symbol=None):
         """
         Vérifie que le prix courant est au-dessus de la MA spécifiée
         
@@ -229,6 +240,7 @@ class CIndicators:
             dfoneminute: DataFrame avec le prix courant
             ma_period: Période de la moyenne mobile (défaut: 50)
             timeframe: Timeframe à utiliser (défaut: "1d")
+            symbol: Symbole de DBOneS (clé du cache des MA, optionnel)
         
         Returns:
             bool: True si close > MA, False sinon
@@ -242,8 +254,7 @@ class CIndicators:
         if closes is None or len(closes) < ma_period:
             return False
         
-        df = pd.DataFrame({"close": closes})
-        ma = df["close"].rolling(window=ma_period).mean().iloc[-1]
+        ma = self._ma_last_two(closes, ma_period, timeframe, symbol)[0]
         
         if pd.isna(ma):
             return False
@@ -255,7 +266,7 @@ class CIndicators:
     # ======================================================
     # CHECK: MA en hausse (entre 2 dernières valeurs)
     # ======================================================
-    def check_ma_increasing(self, DBOneS, dfoneminute=None, ma_period=10, timeframe="1d"):
+    def check_ma_increasing(self, DBOneS, dfoneminute=None, ma_period=10, timeframe="1d", symbol=None):
         """
         Vérifie que la MA est en hausse entre ses 2 dernières valeurs
         
@@ -264,6 +275,7 @@ class CIndicators:
             dfoneminute: Non utilisé (peut être None)
             ma_period: Période de la moyenne mobile (défaut: 10)
             timeframe: Timeframe à utiliser (défaut: "1d")
+            symbol: Symbole de DBOneS (clé du cache des MA, optionnel)
         
         Returns:
             bool: True si MA en hausse, False sinon
@@ -277,11 +289,7 @@ class CIndicators:
         if closes is None or len(closes) < ma_period + 1:
             return False
         
-        df = pd.DataFrame({"close": closes})
-        ma = df["close"].rolling(window=ma_period).mean()
-        
-        ma_last = ma.iloc[-1]
-        ma_prev = ma.iloc[-2]
+        ma_last, ma_prev = self._ma_last_two(closes, ma_period, timeframe, symbol)
         
         if pd.isna(ma_last) or pd.isna(ma_prev):
             return False
@@ -291,7 +299,7 @@ class CIndicators:
     # ======================================================
     # CHECK: Plusieurs MAs en ordre (10 > 20 > 50 > 100)
     # ======================================================
-    def check_ma_alignment(self, DBOneS, dfoneminute, timeframe="1d"):
+    def check_ma_alignment(self, DBOneS, dfoneminute, timeframe="1d", symbol=None):
         """
         Vérifie que les MAs sont alignées (10 > 20 > 50 > 100) et close > MA10
         Utile pour vérifier une tendance haussière
@@ -300,6 +308,7 @@ class CIndicators:
             DBOneS: Dict avec données d'un symbole
             dfoneminute: DataFrame avec le prix courant
             timeframe: Timeframe à utiliser (défaut: "1d")
+            symbol: Symbole de DBOneS (clé du cache des MA, optionnel)
         
         Returns:
             bool: True si alignement correct, False sinon
@@ -313,12 +322,10 @@ class CIndicators:
         if closes is None or len(closes) < 100:
             return False
         
-        df = pd.DataFrame({"close": closes})
-        
-        ma10 = df["close"].rolling(window=10).mean().iloc[-1]
-        ma20 = df["close"].rolling(window=20).mean().iloc[-1]
-        ma50 = df["close"].rolling(window=50).mean().iloc[-1]
-        ma100 = df["close"].rolling(window=100).mean().iloc[-1]
+        ma10 = self._ma_last_two(closes, 10, timeframe, symbol)[0]
+        ma20 = self._ma_last_two(closes, 20, timeframe, symbol)[0]
+        ma50 = self._ma_last_two(closes, 50, timeframe, symbol)[0]
+        ma100 = self._ma_last_two(closes, 100, timeframe, symbol)[0]
         
         if pd.isna(ma10) or pd.isna(ma20) or pd.isna(ma50) or pd.isna(ma100):
             return False
@@ -330,7 +337,7 @@ class CIndicators:
     # ======================================================
     # CHECK: Distance à une MA (en %)
     # ======================================================
-    def get_ma_distance_percent(self, DBOneS, dfoneminute, ma_period=10, timeframe="1d"):
+    def get_ma_distance_percent(self, DBOneS, dfoneminute, ma_period=10, timeframe="1d", symbol=None):
         """
         Retourne la distance (en %) entre le prix courant et la MA
         Distance positive = prix au-dessus
@@ -341,6 +348,7 @@ class CIndicators:
             dfoneminute: DataFrame avec le prix courant
             ma_period: Période de la moyenne mobile (défaut: 10)
             timeframe: Timeframe à utiliser (défaut: "1d")
+            symbol: Symbole de DBOneS (clé du cache des MA, optionnel)
         
         Returns:
             float: Distance en % (None si erreur)
@@ -354,8 +362,7 @@ class CIndicators:
         if closes is None or len(closes) < ma_period:
             return None
         
-        df = pd.DataFrame({"close": closes})
-        ma = df["close"].rolling(window=ma_period).mean().iloc[-1]
+        ma = self._ma_last_two(closes, ma_period, timeframe, symbol)[0]
         
         if pd.isna(ma):
             return None
@@ -9,8 +9,12 @@ class CIndicators2:
     Classe contenant les indicateurs techniques réutilisables
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, cache=None):
+        """
+        Args:
+            cache: CIndicatorCache partagé (loader.indicator_cache) ou None (aucun cache)
+        """
+        self.cache = cache
 
     # ======================================================
     # CALCUL RSI COURANT
@@ -81,6 +85,35 @@ class CIndicators2:
 
         return rsi
 
+    # ======================================================
+    # RSI MIN SUR LES N DERNIÈRES BOUGIES
+    # ======================================================
+    def _rsi_min_window(self, rsi_values, close_values, symbol, period, timeframe, n_last_values):
+        """
+        (RSI min, prix à ce RSI min, prix min) sur les N dernières valeurs stockées.
+        Ne dépend que de la DB : gardé dans le cache tant que l'intervalle n'est pas rechargé.
+        """
+
+        def compute():
+            last_rsi_values = rsi_values[-n_last_values:]
+            last_close_values = close_values[-n_last_values:]
+
+            rsi_min = last_rsi_values.min()
+            index_rsi_min = last_rsi_values.argmin()
+            price_at_rsi_min = last_close_values.iloc[index_rsi_min]
+
+            price_min_interval = min(last_close_values)
+
+            return rsi_min, price_at_rsi_min, price_min_interval
+
+        if self.cache is None:
+            return compute()
+
+        return self.cache.get(
+            symbol, timeframe, ("rsi_min", period, n_last_values),
+            (rsi_values, close_values), compute
+        )
+
     # ======================================================
     # RSI MIN + VARIATION PRIX
     # ======================================================
@@ -132,24 +165,11 @@ class CIndicators2:
             return None
 
         # ======================================================
-        # EXTRACTION DERNIERES VALEURS
-        # ======================================================
-        last_rsi_values = rsi_values[-n_last_values:]
-        last_close_values = close_values[-n_last_values:]
-
-        # ======================================================
-        # RSI MIN
+        # RSI MIN + PRIX MIN (séries stockées → cache jusqu'au reload)
         # ======================================================
-        rsi_min = last_rsi_values.min()
-
-        index_rsi_min = last_rsi_values.argmin()
-
-        price_at_rsi_min = last_close_values.iloc[index_rsi_min]
-
-        # ======================================================
-        # PRIX MIN SUR INTERVAL
-        # ======================================================
-        price_min_interval = min(last_close_values)
+        rsi_min, price_at_rsi_min, price_min_interval = self._rsi_min_window(
+            rsi_values, close_values, symbol, period, timeframe, n_last_values
+        )
 
         # ======================================================
         # RSI COURANT
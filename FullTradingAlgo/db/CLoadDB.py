@@ -1,16 +1,49 @@
-import time
-from pathlib import Path
+import threading
+
+from CFileWatcher import CFileWatcher
+from CIndicatorCache import CIndicatorCache
+from CManifest import CManifest
+from CSharedDB import CSharedDB
 
 
 class CLoadDB:
 
-    def __init__(self, available_intervals, price_db, rsi_db, rsi_period, directory="."):
+    def __init__(self, available_intervals, price_db, rsi_db, rsi_period, directory=".",
+                 shared=None, shared_dir="shared_db", settle=0.5):
+        """
+        :param shared: None     → chargement local (chaque processus lit les fichiers)
+                       "publish" → charge les fichiers puis publie la base partagée (CSharedDB)
+                       "attach"  → se rattache à la base publiée, en lecture seule sans copie
+        :param shared_dir: répertoire de la base partagée
+        :param settle: délai (s) de regroupement des publications d'un intervalle
+                       (le manifeste n'est publié qu'une fois les fichiers complets)
+        """
+
+        if shared not in (None, "publish", "attach"):
+            raise ValueError(f"Mode shared '{shared}' non supporté (None | publish | attach)")
 
         self.available_intervals = available_intervals
         self.l_PriceDatabase = price_db
         self.l_RSIDatabase = rsi_db
         self.l_rsiperiod = rsi_period
         self.directory = directory
+        self.shared = shared
+        self.shared_db = CSharedDB(shared_dir) if shared else None
+        self.generations = {}
+        self.tables = {}        # interval → {"price": CWideFrame, "rsi": CWideFrame}
+        self.settle = settle
+        self.watcher = None
+        self._reload_lock = threading.Lock()
+        # Valeurs dérivées des séries stockées (MA daily...), vidées au reload de l'intervalle
+        self.indicator_cache = CIndicatorCache()
+
+        if shared == "attach":
+            # Symboles et données viennent du publisher : aucun fichier prix/RSI relu ici
+            self.DB = {}
+            for interval in self.available_intervals:
+                self._attach_interval(interval)
+            self.symbols = sorted(self.DB)
+            return
 
         # 🔥 SYMBOLS AUTO
         self.symbols = self.get_common_spot_symbols()
@@ -25,8 +58,8 @@ class CLoadDB:
         # Chargement initial
         self._initial_load()
 
-        # Map fichiers
-        self.file_map = self._map_interval_files()
+        # Surveillance du répertoire : les rechargements partent dès la fin d'écriture
+        self._start_watcher()
 
     # ======================================================
     # SYMBOLS AUTO
@@ -96,21 +129,36 @@ class CLoadDB:
     # ======================================================
     # INTERNAL UTILS
     # ======================================================
-    def _map_interval_files(self):
-        interval_map = {}
-
-        for f in Path(self.directory).glob("*.csv"):
-            parts = f.stem.split("_")
-            if len(parts) >= 2:
-                interval = parts[0]
-                interval_map[interval] = f.name
-
-        return interval_map
+    def _interval_of(self, filename):
+        """'{interval}_manifest.json' → interval (None si le fichier n'est pas un manifeste suivi)."""
+        interval, sep, rest = filename.partition("_")
+        if sep and rest == "manifest.json" and interval in self.available_intervals:
+            return interval
+        return None
+
+    def _load_files(self, interval):
+        """Prix, RSI et weights d'un même manifeste (jeu cohérent, lu une seule fois)."""
+        manifest = CManifest(interval, self.directory).read()
+        self.generations[interval] = manifest["generation"] if manifest else None
+
+        # Tableaux larges : DB[symbol][interval][champ] sont des vues sur leurs colonnes
+        price_db_all = self.l_PriceDatabase.load_wide(resolution=interval, manifest=manifest)
+        rsi_db_all = self.l_RSIDatabase.load_rsi_wide(
+            resolution=interval,
+            rsi_period=self.l_rsiperiod,
+            manifest=manifest
+        )
+        weights_all = self.l_RSIDatabase.load_rsi_weights(
+            resolution=interval,
+            rsi_period=self.l_rsiperiod,
+            manifest=manifest
+        )
+        return price_db_all, rsi_db_all, weights_all
 
-    def _inject_weights(self, weights_all, symbol, interval):
+    def _inject_weights(self, weights_all, symbol, target):
         try:
             if symbol in weights_all:
-                self.DB[symbol][interval][f"RSI{self.l_rsiperiod}_WEIGHTS"] = {
+                target[f"RSI{self.l_rsiperiod}_WEIGHTS"] = {
                     "avg_gain": weights_all[symbol]["avg_gain"],
                     "avg_loss": weights_all[symbol]["avg_loss"],
                     "last_close": weights_all[symbol]["last_close"]
@@ -127,15 +175,7 @@ class CLoadDB:
 
             print(f"⏳ Chargement initial {interval}...")
 
-            price_db_all = self.l_PriceDatabase.load(resolution=interval)
-            rsi_db_all = self.l_RSIDatabase.load_rsi(
-                resolution=interval,
-                rsi_period=self.l_rsiperiod
-            )
-            weights_all = self.l_RSIDatabase.load_rsi_weights(
-                resolution=interval,
-                rsi_period=self.l_rsiperiod
-            )
+            price_db_all, rsi_db_all, weights_all = self._load_files(interval)
 
             for symbol in self.symbols:
 
@@ -147,69 +187,130 @@ class CLoadDB:
                     self.DB[symbol][interval][f"RSI{self.l_rsiperiod}"] = \
                         rsi_db_all[symbol][interval, f"RSI{self.l_rsiperiod}"]
 
-                    self._inject_weights(weights_all, symbol, interval)
+                    self._inject_weights(weights_all, symbol, self.DB[symbol][interval])
 
                 except Exception as e:
                     print(f"⚠ Load error {symbol} {interval}: {e}")
 
+            self.tables[interval] = {"price": price_db_all, "rsi": rsi_db_all}
+
+            if self.shared == "publish":
+                self.shared_db.publish(interval, self.DB, self.l_rsiperiod)
+
         print(f"✅ DB initialisée avec RSI{self.l_rsiperiod} + WEIGHTS")
 
     # ======================================================
     # RELOAD INTERVAL
     # ======================================================
     def reload_interval(self, interval):
+        """
+        Recharge un intervalle en copie sur écriture : la nouvelle base est construite à
+        côté puis substituée d'un bloc (self.DB = new_DB). Une boucle de scan qui a pris
+        DB = loader.DB continue sur l'instantané précédent, jamais sur un état mélangé.
+        """
 
-        print(f"⚡ Reload {interval}")
+        with self._reload_lock:
 
-        price_db_all = self.l_PriceDatabase.load(resolution=interval)
-        rsi_db_all = self.l_RSIDatabase.load_rsi(
-            resolution=interval,
-            rsi_period=self.l_rsiperiod
-        )
-        weights_all = self.l_RSIDatabase.load_rsi_weights(
-            resolution=interval,
-            rsi_period=self.l_rsiperiod
-        )
+            print(f"⚡ Reload {interval}")
 
-        for symbol in self.symbols:
+            price_db_all, rsi_db_all, weights_all = self._load_files(interval)
 
-            try:
-                if symbol not in self.DB:
-                    self.DB[symbol] = {}
-                if interval not in self.DB[symbol]:
-                    self.DB[symbol][interval] = {}
+            # Copie superficielle : seuls les dicts de l'intervalle rechargé sont neufs,
+            # les Series des autres intervalles sont partagées avec l'ancienne base
+            new_DB = {symbol: dict(intervals) for symbol, intervals in self.DB.items()}
+
+            for symbol in self.symbols:
+
+                # Part de l'ancienne entrée : un champ en erreur garde sa dernière valeur
+                entry = dict(new_DB.setdefault(symbol, {}).get(interval, {}))
+
+                try:
+                    entry["close"] = price_db_all[symbol][interval, "close"]
+                    entry["high"]  = price_db_all[symbol][interval, "high"]
+                    entry["low"]   = price_db_all[symbol][interval, "low"]
+
+                    entry[f"RSI{self.l_rsiperiod}"] = \
+                        rsi_db_all[symbol][interval, f"RSI{self.l_rsiperiod}"]
+
+                    self._inject_weights(weights_all, symbol, entry)
+
+                except Exception as e:
+                    print(f"⚠ Reload error {symbol} {interval}: {e}")
 
-                self.DB[symbol][interval]["close"] = price_db_all[symbol][interval, "close"]
-                self.DB[symbol][interval]["high"]  = price_db_all[symbol][interval, "high"]
-                self.DB[symbol][interval]["low"]   = price_db_all[symbol][interval, "low"]
+                new_DB[symbol][interval] = entry
 
-                self.DB[symbol][interval][f"RSI{self.l_rsiperiod}"] = \
-                    rsi_db_all[symbol][interval, f"RSI{self.l_rsiperiod}"]
+            tables = dict(self.tables)
+            tables[interval] = {"price": price_db_all, "rsi": rsi_db_all}
 
-                self._inject_weights(weights_all, symbol, interval)
+            # 🔥 Bascule atomique (affectation d'une référence)
+            self.DB = new_DB
+            self.tables = tables
+            self.indicator_cache.invalidate(interval)
 
-            except Exception as e:
-                print(f"⚠ Reload error {symbol} {interval}: {e}")
+            if self.shared == "publish":
+                self.shared_db.publish(interval, self.DB, self.l_rsiperiod)
 
-        print(f"✅ {interval} reloaded")
+            print(f"✅ {interval} reloaded")
 
     # ======================================================
-    # CHECK FILES
+    # SHARED DB (mode attach)
     # ======================================================
-    def check_and_update_files(self):
-
-        new_file_map = self._map_interval_files()
-        changed_intervals = [
-            i for i in new_file_map
-            if i not in self.file_map or self.file_map[i] != new_file_map[i]
-        ]
+    def _attach_interval(self, interval):
+        """(Re)lie DB[*][interval] à la génération publiée courante (vues memmap, sans copie)."""
+        generation, data = self.shared_db.attach(interval, self.l_rsiperiod)
+        if generation is None:
+            print(f"⚠ Aucune base partagée publiée pour {interval}")
+            return
+
+        for symbol, fields in data.items():
+            self.DB.setdefault(symbol, {})[interval] = fields
+        for symbol in self.DB:
+            if symbol not in data:
+                self.DB[symbol][interval] = {}
 
-        if changed_intervals:
-            print(f"⚠ Changes detected: {changed_intervals}")
-            time.sleep(40)
+        self.generations[interval] = generation
+        self.indicator_cache.invalidate(interval)
+        print(f"🔗 {interval} rattaché (génération {generation}, {len(data)} symbols)")
 
-            for interval in changed_intervals:
-                if interval in self.available_intervals:
-                    self.reload_interval(interval)
+    # ======================================================
+    # CHECK FILES
+    # ======================================================
+    def check_and_update_files(self):
 
-            self.file_map = new_file_map
\ No newline at end of file
+        if self.shared == "attach":
+            # Nouvelle génération publiée → rebascule (fichiers déjà complets, pas d'attente)
+            for interval in self.available_intervals:
+                pointer = self.shared_db.current(interval)
+                if pointer and pointer["generation"] != self.generations.get(interval):
+                    self._attach_interval(interval)
+            self.symbols = sorted(self.DB)
+            return
+
+        # Les rechargements se font dans le thread du watcher, sans bloquer la boucle
+        # de scan qui relit loader.DB à chaque tour (plus d'attente ni de glob ici)
+        if self.watcher is None:
+            self._start_watcher()
+
+    def _start_watcher(self):
+        """Démarre la surveillance du répertoire (inotify, ou scrutation en repli)."""
+        self.watcher = CFileWatcher(
+            self.directory,
+            key_func=self._interval_of,
+            callback=self._on_interval_changed,
+            exts=(".json",),
+            settle=self.settle
+        ).start()
+        print(f"👀 Surveillance de {self.directory} ({self.watcher.mode})")
+
+    def _on_interval_changed(self, interval):
+        manifest = CManifest(interval, self.directory).read()
+        if manifest is None or manifest["generation"] == self.generations.get(interval):
+            return
+        print(f"⚠ Changes detected: {interval} (génération {manifest['generation']})")
+        self.reload_interval(interval)
+
+    def stop(self):
+        """Arrête la surveillance des fichiers."""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
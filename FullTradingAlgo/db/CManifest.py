@@ -0,0 +1,138 @@
+import glob
+import json
+import os
+from datetime import datetime
+
+
+class CManifest:
+    """
+    Manifeste versionné d'une résolution : {resolution}_manifest.json désigne le jeu
+    cohérent de fichiers (high, low, close, rsi{p}, rsi{p}_weights) à lire.
+
+    - Les écrivains (CPriceDatabase.save, CRSIDatabase.save_rsi_from_data) écrivent des
+      fichiers neufs (nom unique par génération, fichier temporaire + fsync + os.replace)
+      puis les déclarent ici (stage) ; publish() bascule le manifeste d'un seul os.replace.
+    - Les lecteurs lisent le manifeste une fois puis les fichiers désignés : jamais de
+      fichier absent ou à moitié écrit, sans verrou ni attente.
+    - Les fichiers des générations trop anciennes sont supprimés au publish suivant
+      (la génération précédente reste lisible pour les lecteurs en cours).
+
+    Plusieurs écrivains peuvent partager une transaction :
+
+        with CManifest(interval) as manifest:
+            db_price.save(data, interval, manifest=manifest)
+            db_rsi.save_rsi_from_data(data, interval, rsi_period, manifest=manifest)
+    """
+
+    KEEP_GENERATIONS = 2
+    DATA_EXTS = (".bin", ".csv")
+
+    def __init__(self, resolution, directory="."):
+        self.resolution = resolution
+        self.directory = directory
+        self.path = os.path.join(directory, f"{resolution}_manifest.json")
+
+        current = self.read()
+        self._next_generation((current["generation"] if current else 0) + 1)
+
+    def _next_generation(self, generation):
+        self.generation = generation
+        self.tag = f"{datetime.utcnow().strftime('%Y_%m_%dT%H%M')}_g{generation:06d}"
+        self.staged = {}
+        self.staged_exports = {}
+
+    # ======================================================
+    # LECTURE
+    # ======================================================
+    def read(self):
+        """Manifeste courant ({"generation", "files", "exports", "history"}) ou None."""
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @classmethod
+    def resolve(cls, manifest, key, directory="."):
+        """Chemin du fichier `key` désigné par le manifeste (None si absent)."""
+        if not manifest:
+            return None
+        name = manifest["files"].get(key)
+        if name is None:
+            return None
+        path = os.path.join(directory, name)
+        return path if os.path.exists(path) else None
+
+    # ======================================================
+    # ÉCRITURE
+    # ======================================================
+    @staticmethod
+    def write_atomic(path, write, mode="w"):
+        """Écrit path via write(f) dans un fichier temporaire, fsync, puis os.replace."""
+        tmp = f"{path}.tmp"
+        with open(tmp, mode, **({"newline": ""} if "b" not in mode else {})) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def filename(self, name, ext):
+        """Nom unique pour cette génération : {resolution}_{name}_{ts}_g{generation}{ext}."""
+        return os.path.join(self.directory, f"{self.resolution}_{name}_{self.tag}{ext}")
+
+    def stage(self, files, exports=None):
+        """
+        Déclare des fichiers déjà écrits : files = {clé: chemin} lus par les loaders,
+        exports = {clé: chemin} des copies annexes (CSV en mode bin), conservées avec la génération.
+        """
+        self.staged.update({key: os.path.basename(path) for key, path in files.items()})
+        self.staged_exports.update({key: os.path.basename(path) for key, path in (exports or {}).items()})
+
+    def publish(self):
+        """Bascule atomiquement le manifeste sur les fichiers déclarés, puis nettoie."""
+        if not self.staged and not self.staged_exports:
+            return None
+
+        current = self.read() or {"files": {}, "exports": {}, "history": []}
+
+        # Les clés non réécrites (ex. RSI lors d'un save prix seul) restent inchangées
+        files = {**current["files"], **self.staged}
+        exports = {**current.get("exports", {}), **self.staged_exports}
+
+        history = current.get("history", [])
+        history = (history + [sorted(set(files.values()) | set(exports.values()))])[-self.KEEP_GENERATIONS:]
+
+        self.write_atomic(self.path, lambda f: json.dump({
+            "generation": self.generation,
+            "files": files,
+            "exports": exports,
+            "history": history
+        }, f))
+        print(f"[{self.resolution}] Manifest publié (génération {self.generation})")
+
+        self._garbage_collect(history)
+        published = self.generation
+        self._next_generation(published + 1)
+        return published
+
+    def _garbage_collect(self, history):
+        """Supprime les fichiers de la résolution qui ne sont plus référencés par l'historique."""
+        referenced = set().union(*map(set, history))
+        for ext in self.DATA_EXTS:
+            for path in glob.glob(os.path.join(self.directory, f"{self.resolution}_*{ext}")):
+                if os.path.basename(path) not in referenced:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass   # fichier encore ouvert (Windows) : supprimé au prochain publish
+
+    # ======================================================
+    # TRANSACTION
+    # ======================================================
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.publish()
+        return False
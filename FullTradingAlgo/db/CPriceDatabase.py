@@ -1,7 +1,10 @@
 import os
 import glob
 import pandas as pd
-from datetime import datetime
+
+from CColumnStore import CColumnStore
+from CManifest import CManifest
+from CWideFrame import CWideFrame
 
 
 # ==========================================================
@@ -13,97 +16,143 @@ DB = {}
 class CPriceDatabase:
 
     EXT = ".csv"
+    EXT_BIN = ".bin"
+
+    def __init__(self, fmt="bin", export_csv=False):
+        """
+        :param fmt: "bin" (CColumnStore : float64 complet, memmap, lecture par colonnes)
+                    ou "csv" (ancien format texte ;-séparé)
+        :param export_csv: en mode "bin", écrit aussi le CSV (ouverture dans un tableur)
+        """
+        if fmt not in ("bin", "csv"):
+            raise ValueError(f"Format '{fmt}' non supporté (bin | csv)")
+        self.fmt = fmt
+        self.export_csv = export_csv
+        self.EXT = self.EXT_BIN if fmt == "bin" else CPriceDatabase.EXT
 
-    def __init__(self):
-        pass
+    # ======================================================
+    # FICHIERS
+    # ======================================================
+    def _latest_file(self, pattern_base, manifest=None, key=None):
+        """
+        Fichier désigné par le manifeste pour `key` ; à défaut (arbre sans manifeste),
+        fichier le plus récent pour pattern_base + extension (repli CSV en mode bin).
+        """
+        path = CManifest.resolve(manifest, key)
+        if path is not None:
+            return path
+        for ext in dict.fromkeys([self.EXT, CPriceDatabase.EXT]):
+            files = glob.glob(f"{pattern_base}{ext}")
+            if files:
+                return max(files, key=os.path.getctime)
+        return None
+
+    @staticmethod
+    def _read_table(filename, symbols=None):
+        """Relit une table large (index temps × symboles) quel que soit son format."""
+        if filename.endswith(CPriceDatabase.EXT_BIN):
+            return CColumnStore.read(filename, columns=symbols)
+
+        df = pd.read_csv(filename, sep=";", index_col=0)
+        df.index = pd.to_datetime(df.index)
+        if symbols is not None:
+            df = df[[s for s in symbols if s in df.columns]]
+        return df
 
     # ======================================================
     # SAVE DATASETS
     # ======================================================
-    def save(self, datasets: dict, resolution: str):
+    def save(self, datasets: dict, resolution: str, manifest=None):
+        """
+        Écrit chaque table dans un fichier neuf (temporaire + fsync + os.replace) puis publie
+        le manifeste de la résolution : les anciens fichiers restent lisibles jusqu'à la
+        bascule et sont supprimés par le nettoyage des générations (plus d'os.remove préalable).
 
-        prefix = f"{resolution}_"
+        :param manifest: CManifest partagé avec d'autres écrivains (ex. save_rsi_from_data) ;
+                         publié par l'appelant. None = publication immédiate.
+        """
+
+        own_manifest = manifest is None
+        if own_manifest:
+            manifest = CManifest(resolution)
 
-        # Supprimer anciens fichiers de cette résolution
-        for f in glob.glob(f"{prefix}*{self.EXT}"):
-            os.remove(f)
+        files = {}
+        exports = {}
 
         for price_type, df in datasets.items():
 
             if df is None or df.empty:
                 continue
 
-            # 🔥 Dates récentes en haut dans le fichier
-            df_to_save = df.sort_index(ascending=False)
+            if self.fmt == "bin":
+                filename = manifest.filename(price_type, self.EXT)
+                CColumnStore.write(filename, df.sort_index())
+                files[price_type] = filename
+                print(f"[{resolution}] Saved {filename}")
 
-            ts = datetime.utcnow().strftime("%Y_%m_%dT%H%M")
-            filename = f"{prefix}{price_type}_{ts}{self.EXT}"
+            if self.fmt == "csv" or self.export_csv:
+                # 🔥 Dates récentes en haut dans le fichier
+                df_to_save = df.sort_index(ascending=False)
 
-            df_to_save.to_csv(
-                filename,
-                sep=";",
-                float_format="%.3e"
-            )
+                filename = manifest.filename(price_type, CPriceDatabase.EXT)
 
-            print(f"[{resolution}] Saved {filename}")
+                CManifest.write_atomic(filename, lambda f: df_to_save.to_csv(
+                    f,
+                    sep=";",
+                    float_format="%.3e"
+                ))
+                (files if self.fmt == "csv" else exports)[price_type] = filename
+
+                print(f"[{resolution}] Saved {filename}")
+
+        manifest.stage(files, exports)
+        if own_manifest:
+            manifest.publish()
 
     # ======================================================
     # LOAD INTO DB
     # ======================================================
-    def load(self, resolution: str):
+    def load_wide(self, resolution: str, symbols=None, manifest=None):
+        """
+        Charge high/low/close en tableaux larges (CWideFrame) : wide[symbol]["close"]
+        renvoie une vue, sans construire un DataFrame par symbole.
 
-        DB = {}
+        :param symbols: sous-ensemble de symboles à charger (None = tous) ;
+                        en mode bin seules leurs colonnes sont lues
+        :param manifest: manifeste déjà lu (CManifest.read()) pour lire le même jeu de
+                         fichiers que d'autres loaders ; None = manifeste courant
+        """
 
         prefix = f"{resolution}_"
 
+        if manifest is None:
+            manifest = CManifest(resolution).read()
+
         datasets = {}
 
         for price_type in ["high", "low", "close"]:
 
-            files = glob.glob(f"{prefix}{price_type}_*{self.EXT}")
+            latest_file = self._latest_file(f"{prefix}{price_type}_*", manifest, price_type)
 
-            if not files:
+            if latest_file is None:
                 continue
 
-            latest_file = max(files, key=os.path.getctime)
-
-            df = pd.read_csv(
-                latest_file,
-                sep=";",
-                index_col=0
-            )
-
-            df.index = pd.to_datetime(df.index)
+            df = self._read_table(latest_file, symbols)
 
             # 🔥 Remettre en ordre chronologique
             df.sort_index(inplace=True)
 
             datasets[price_type] = df
 
-        # ==================================================
-        # Reconstruction DB[symbol][(resolution, price_type)]
-        # ==================================================
-        for price_type, df in datasets.items():
-
-            for symbol in df.columns:
-
-                series = df[symbol].astype(float)
-
-                if symbol not in DB:
-                    DB[symbol] = pd.DataFrame(index=series.index)
-
-                DB[symbol][(resolution, price_type)] = series
-
-        # 🔥 Nettoyage MultiIndex
-        for symbol in DB:
-
-            DB[symbol].columns = pd.MultiIndex.from_tuples(
-                DB[symbol].columns
-            )
-
-            DB[symbol].sort_index(axis=1, inplace=True)
-            DB[symbol].sort_index(inplace=True)
+        wide = CWideFrame.from_frames(resolution, datasets)
 
         print(f"[{resolution}] DB updated")
 
-        return DB
+        return wide
+
+    def load(self, resolution: str, symbols=None, manifest=None):
+        """
+        Ancien format : DB[symbol] = DataFrame colonnes MultiIndex (resolution, price_type).
+        Préférer load_wide() (même accès DB[symbol][(resolution, price_type)], sans copie).
+        """
+        return self.load_wide(resolution, symbols, manifest).to_dict()
@@ -1,14 +1,43 @@
 import os
 import glob
+import numpy as np
 import pandas as pd
-from datetime import datetime
+
+from CColumnStore import CColumnStore
+from CManifest import CManifest
+from CPriceDatabase import CPriceDatabase
+from CWideFrame import CWideFrame
 
 class CRSIDatabase:
 
     EXT = ".csv"
-
-    def __init__(self):
-        pass
+    EXT_BIN = ".bin"
+
+    def __init__(self, fmt="bin", export_csv=False):
+        """
+        :param fmt: "bin" (CColumnStore : float64 complet, memmap, lecture par colonnes)
+                    ou "csv" (ancien format texte ;-séparé)
+        :param export_csv: en mode "bin", écrit aussi les CSV (ouverture dans un tableur)
+        """
+        if fmt not in ("bin", "csv"):
+            raise ValueError(f"Format '{fmt}' non supporté (bin | csv)")
+        self.fmt = fmt
+        self.export_csv = export_csv
+        self.EXT = self.EXT_BIN if fmt == "bin" else CRSIDatabase.EXT
+
+    def _latest_file(self, pattern_base, manifest=None, key=None):
+        """
+        Fichier désigné par le manifeste pour `key` ; à défaut (arbre sans manifeste),
+        fichier le plus récent pour pattern_base + extension (repli CSV en mode bin).
+        """
+        path = CManifest.resolve(manifest, key)
+        if path is not None:
+            return path
+        for ext in dict.fromkeys([self.EXT, CRSIDatabase.EXT]):
+            files = glob.glob(f"{pattern_base}{ext}")
+            if files:
+                return max(files, key=os.path.getctime)
+        return None
 
     # ======================================================
     # CALCUL RSI (VERSION WILDER AVEC RETOUR DES WEIGHTS)
@@ -32,123 +61,427 @@ class CRSIDatabase:
 
         return rsi, avg_gain, avg_loss
 
+    @staticmethod
+    def compute_rsi_matrix(close: np.ndarray, period: int = 14, state=None):
+        """
+        Même RSI que compute_rsi_with_weights(close[:, j].dropna()) pour toutes les colonnes
+        d'un coup : un seul passage sur l'axe 0, chaque opération portant sur la ligne
+        entière des symboles. Reprend la récurrence de pandas ewm(alpha, adjust=True)
+        (valeurs identiques au calcul par symbole) ; les NaN d'une colonne (historique
+        plus court, trous) sont sautés comme par dropna().
+
+        :param close: matrice (n_bougies, n_symboles) des close, NaN = pas de bougie
+        :param state: (avg_gain, avg_loss, last_close, nobs) par colonne pour reprendre le
+                      calcul après les bougies déjà traitées (update_rsi) ; None = départ à vide
+        :return: (rsi (n, k), avg_gain final (k), avg_loss final (k), last_close (k), nobs (k))
+                 nobs = nombre de deltas valides par colonne
+        """
+        close = np.asarray(close, dtype=np.float64)
+        n, k = close.shape
+        factor = 1 - 1 / period
+
+        if state is None:
+            w_gain = np.full(k, np.nan)
+            w_loss = np.full(k, np.nan)
+            prev = np.full(k, np.nan)
+            nobs = np.zeros(k, dtype=np.int64)
+        else:
+            w_gain, w_loss, prev, nobs = (np.array(a, dtype=dt) for a, dt in zip(
+                state, (np.float64, np.float64, np.float64, np.int64)
+            ))
+        old_wt = CRSIDatabase._old_wt(nobs, period)
+
+        rsi = np.full((n, k), np.nan)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i in range(n):
+                c = close[i]
+                delta = c - prev                        # NaN si pas de close courant ou précédent
+                prev = np.where(c == c, c, prev)
+                obs = delta == delta
+
+                gain = np.maximum(delta, 0)
+                loss = np.maximum(-delta, 0)
+
+                started = w_gain == w_gain
+                upd = started & obs
+                first = ~started & obs
+
+                wt = np.where(upd, old_wt * factor, old_wt)
+                new_gain = np.where(w_gain != gain, (wt * w_gain + gain) / (wt + 1.0), w_gain)
+                new_loss = np.where(w_loss != loss, (wt * w_loss + loss) / (wt + 1.0), w_loss)
+                w_gain = np.where(upd, new_gain, np.where(first, gain, w_gain))
+                w_loss = np.where(upd, new_loss, np.where(first, loss, w_loss))
+                old_wt = np.where(upd, wt + 1.0, wt)
+                nobs += obs
+
+                ready = obs & (nobs >= period)
+                if ready.any():
+                    row = 100 - (100 / (1 + w_gain / w_loss))
+                    rsi[i] = np.where(ready, np.where(w_loss != 0, row, 100.0), np.nan)
+
+        return rsi, w_gain, w_loss, prev, nobs
+
+    @staticmethod
+    def _old_wt(nobs, period):
+        """
+        Poids cumulé de l'ewm après nobs deltas (1 au premier, puis wt * (1 - alpha) + 1),
+        recalculé avec les mêmes opérations que la récurrence pour des valeurs identiques.
+        """
+        factor = 1 - 1 / period
+        old_wt = np.ones(len(nobs))
+        for step in range(1, int(nobs.max(initial=0))):
+            old_wt = np.where(step < nobs, old_wt * factor + 1.0, old_wt)
+        return old_wt
+
     # ======================================================
     # SAVE RSI + WEIGHTS (OPTIMISÉ)
     # ======================================================
-    def save_rsi_from_data(self, data: dict, resolution: str, rsi_period: int):
+    def save_rsi_from_data(self, data: dict, resolution: str, rsi_period: int, manifest=None):
+        """
+        Calcule le RSI + weights depuis data["close"], écrit des fichiers neufs puis publie
+        le manifeste (voir CPriceDatabase.save).
+
+        :param manifest: CManifest partagé avec CPriceDatabase.save pour publier prix + RSI
+                         comme un seul jeu cohérent ; None = publication immédiate.
+        """
 
         df_close = data.get("close")
         if df_close is None or df_close.empty:
             print("No close data to compute RSI")
             return None
 
-        prefix = f"{resolution}_"
+        df_rsi, df_weights = self._compute_full(df_close, rsi_period)
+        self._write_rsi(df_rsi, df_weights, resolution, rsi_period, manifest)
 
-        # Clean anciens fichiers
-        pattern = f"{prefix}rsi{rsi_period}_*{self.EXT}"
-        for f in glob.glob(pattern):
-            os.remove(f)
+        return df_rsi
 
-        # ✅ STRUCTURE OPTIMALE
-        rsi_dict = {}
-        weights_rows = []
+    def _compute_full(self, df_close, rsi_period):
+        """RSI + weights de tous les symboles de df_close depuis le début de l'historique."""
 
-        for symbol in df_close.columns:
+        # ✅ RSI de tous les symboles en un passage (matrice n_bougies × n_symboles)
+        rsi, avg_gain, avg_loss, last_close, nobs = self.compute_rsi_matrix(
+            df_close.to_numpy(dtype=np.float64), rsi_period
+        )
 
-            series = df_close[symbol].dropna()
-            if len(series) < rsi_period + 1:
-                continue
+        # Symboles avec au moins rsi_period + 1 close ; lignes où l'un d'eux a un close
+        keep = np.flatnonzero(nobs >= rsi_period)
+        rows = df_close.notna().to_numpy()[:, keep].any(axis=1)
+        symbols = df_close.columns[keep]
 
-            rsi_series, avg_gain, avg_loss = self.compute_rsi_with_weights(series, rsi_period)
+        df_rsi = pd.DataFrame(rsi[np.ix_(rows, keep)], index=df_close.index[rows], columns=symbols)
 
-            # ✅ STOCKAGE TEMPORAIRE (PAS DE FRAGMENTATION)
-            rsi_dict[symbol] = rsi_series
+        df_weights = pd.DataFrame({
+            "avg_gain": avg_gain[keep],
+            "avg_loss": avg_loss[keep],
+            "last_close": last_close[keep],
+            "nobs": nobs[keep]
+        }, index=pd.Index(symbols, name="symbol"))
 
-            weights_rows.append({
-                "symbol": symbol,
-                "avg_gain": avg_gain.iloc[-1],
-                "avg_loss": avg_loss.iloc[-1],
-                "last_close": series.iloc[-1]
-            })
+        return df_rsi, df_weights
 
-        # ✅ BUILD FINAL (UNE SEULE FOIS)
-        df_rsi = pd.DataFrame(rsi_dict)
+    def _write_rsi(self, df_rsi, df_weights, resolution, rsi_period, manifest=None):
+        """Écrit RSI + weights (index = symbol) dans des fichiers neufs et les déclare au manifeste."""
 
-        # ===== SAVE RSI =====
-        df_rsi_to_save = df_rsi.sort_index(ascending=False)
+        own_manifest = manifest is None
+        if own_manifest:
+            manifest = CManifest(resolution)
 
-        ts = datetime.utcnow().strftime("%Y_%m_%dT%H%M")
-        rsi_filename = f"{prefix}rsi{rsi_period}_{ts}.csv"
+        rsi_key = f"rsi{rsi_period}"
+        weights_key = f"rsi{rsi_period}_weights"
 
-        df_rsi_to_save.to_csv(rsi_filename, sep=";", float_format="%.1f")
-        print(f"[{resolution}] Saved RSI -> {rsi_filename}")
+        files = {}
+        exports = {}
 
-        # ===== SAVE WEIGHTS =====
-        weights_filename = f"{prefix}rsi{rsi_period}_weights{self.EXT}"
-        df_weights = pd.DataFrame(weights_rows)
+        if self.fmt == "bin":
+            # ===== SAVE RSI + WEIGHTS (binaire, float64 complet) =====
+            rsi_filename = manifest.filename(rsi_key, self.EXT)
+            CColumnStore.write(rsi_filename, df_rsi.sort_index())
+            print(f"[{resolution}] Saved RSI -> {rsi_filename}")
 
-        df_weights.to_csv(weights_filename, sep=";", index=False, float_format="%.10f")
-        print(f"[{resolution}] Saved WEIGHTS -> {weights_filename}")
+            weights_filename = manifest.filename(weights_key, self.EXT)
+            CColumnStore.write(weights_filename, df_weights)
+            print(f"[{resolution}] Saved WEIGHTS -> {weights_filename}")
 
-        return df_rsi
+            files.update({rsi_key: rsi_filename, weights_key: weights_filename})
+
+        if self.fmt == "csv" or self.export_csv:
+            # ===== SAVE RSI =====
+            df_rsi_to_save = df_rsi.sort_index(ascending=False)
+
+            rsi_filename = manifest.filename(rsi_key, CRSIDatabase.EXT)
+
+            CManifest.write_atomic(rsi_filename, lambda f: df_rsi_to_save.to_csv(f, sep=";", float_format="%.1f"))
+            print(f"[{resolution}] Saved RSI -> {rsi_filename}")
+
+            # ===== SAVE WEIGHTS =====
+            weights_filename = manifest.filename(weights_key, CRSIDatabase.EXT)
+
+            CManifest.write_atomic(
+                weights_filename,
+                lambda f: df_weights.reset_index().to_csv(f, sep=";", index=False, float_format="%.10f")
+            )
+            print(f"[{resolution}] Saved WEIGHTS -> {weights_filename}")
+
+            (files if self.fmt == "csv" else exports).update({rsi_key: rsi_filename, weights_key: weights_filename})
+
+        manifest.stage(files, exports)
+        if own_manifest:
+            manifest.publish()
 
     # ======================================================
-    # LOAD RSI INTO DB (inchangé)
+    # MISE À JOUR INCRÉMENTALE
     # ======================================================
-    def load_rsi(self, resolution: str, rsi_period: int):
+    def update_rsi(self, new_closes: pd.DataFrame, resolution: str, rsi_period: int,
+                   manifest=None, history=None, max_rows=None):
+        """
+        Fait avancer le RSI stocké sur les seules nouvelles bougies : l'état de chaque
+        symbole (avg_gain, avg_loss, last_close, nobs du fichier weights) est repris là où
+        le dernier calcul s'est arrêté, et les nouvelles lignes sont ajoutées à la série.
+        Résultat identique à save_rsi_from_data sur l'historique complet.
+
+        Recalcul complet (depuis history) pour les symboles :
+        - absents des weights (nouveau symbole) ou sans nobs (fichier d'avant cette version)
+        - dont une bougie déjà traitée a changé ou est apparue (révision) : tout le
+          recouvrement de new_closes est comparé aux close stockés (table close du
+          manifeste courant), et la dernière bougie stockée à last_close des weights
+        - si les nouvelles bougies ne suivent pas la dernière stockée (trou)
+
+        :param new_closes: close des bougies récentes (index temps × symboles), clôturées ;
+                           peut recouvrir les bougies déjà stockées
+        :param manifest: CManifest de la transaction en cours ; None = publication immédiate
+        :param history: historique complet des close pour les recalculs (défaut : close
+                        stockés, complétés par new_closes)
+        :param max_rows: ne garder que les max_rows dernières lignes de RSI (None = tout)
+        :return: DataFrame RSI mis à jour (None si rien à calculer)
+        """
+
+        if new_closes is None or new_closes.empty:
+            print("No close data to update RSI")
+            return None
 
-        DB = {}
-        prefix = f"{resolution}_"
-        price_type = f"RSI{rsi_period}"
+        current = CManifest(resolution).read()
+        df_rsi_old = self._read_rsi_frame(resolution, rsi_period, current)
+        weights_old = self._read_weights_frame(resolution, rsi_period, current)
+
+        if df_rsi_old is None or weights_old is None or df_rsi_old.empty:
+            print(f"[{resolution}] Pas de RSI{rsi_period} stocké : calcul complet")
+            return self.save_rsi_from_data({"close": self._history(history, new_closes, resolution, current)},
+                                           resolution, rsi_period, manifest)
+
+        new_closes = new_closes.sort_index()
+        last_time = df_rsi_old.index[-1]
+        new_rows = new_closes.loc[new_closes.index > last_time]
+        overlap = new_closes.loc[new_closes.index <= last_time]
+
+        # ==================================================
+        # Symboles repris incrémentalement / recalculés
+        # ==================================================
+        symbols = list(dict.fromkeys(list(df_rsi_old.columns) + list(new_closes.columns)))
+        full = set()
+
+        if "nobs" not in weights_old.columns:
+            full.update(symbols)
+        else:
+            full.update(s for s in new_closes.columns if s not in weights_old.index)
+
+        # Trou : la première nouvelle bougie doit suivre la dernière bougie stockée
+        step = df_rsi_old.index.to_series().diff().min() if len(df_rsi_old) > 1 else None
+        if len(new_rows) and len(overlap) == 0 and step is not None and new_rows.index[0] - last_time > step:
+            print(f"[{resolution}] Trou avant {new_rows.index[0]} : recalcul complet")
+            full.update(symbols)
+
+        # Révision : une bougie déjà traitée diffère de l'état stocké
+        if len(overlap):
+            stored_last = self._last_valid_times(df_rsi_old)
+            checked = [s for s in overlap.columns
+                       if s not in full and s in weights_old.index and s in stored_last]
+            stored, rtol = self._stored_closes(resolution, current, checked)
+            for symbol in checked:
+                col = overlap[symbol]
+                after = col.loc[col.index > stored_last[symbol]]
+                at = col.get(stored_last[symbol])
+                if after.notna().any() or (
+                    at is not None and at == at and
+                    not np.isclose(at, weights_old.at[symbol, "last_close"], rtol=1e-9, atol=0)
+                ):
+                    full.add(symbol)
+                elif stored is not None and self._revised(col, stored.get(symbol), rtol):
+                    full.add(symbol)
+
+        incremental = [s for s in weights_old.index if s not in full]
+
+        # ==================================================
+        # Avance de l'état sur les nouvelles bougies uniquement
+        # ==================================================
+        index = df_rsi_old.index.append(new_rows.index)
+        df_rsi = df_rsi_old.reindex(index=index, columns=[s for s in symbols if s in df_rsi_old.columns or s in full])
+        df_weights = weights_old.copy()
+
+        if incremental and len(new_rows):
+            state = weights_old.loc[incremental, ["avg_gain", "avg_loss", "last_close", "nobs"]]
+            close = new_rows.reindex(columns=incremental).to_numpy(dtype=np.float64)
+            rsi, avg_gain, avg_loss, last_close, nobs = self.compute_rsi_matrix(
+                close, rsi_period, state=[state[c].to_numpy() for c in state.columns]
+            )
+            df_rsi.loc[new_rows.index, incremental] = rsi
+            df_weights.loc[incremental, "avg_gain"] = avg_gain
+            df_weights.loc[incremental, "avg_loss"] = avg_loss
+            df_weights.loc[incremental, "last_close"] = last_close
+            df_weights.loc[incremental, "nobs"] = nobs
+
+        keep_rows = df_rsi.index.isin(df_rsi_old.index) | df_rsi.notna().any(axis=1).to_numpy()
+
+        if full:
+            print(f"[{resolution}] Recalcul complet de {len(full)} symbols")
+            close_all = self._history(history, new_closes, resolution, current)
+            recompute = close_all.reindex(columns=[s for s in symbols if s in full])
+            rsi_full, weights_full = self._compute_full(recompute, rsi_period)
+
+            df_rsi = df_rsi.loc[keep_rows].drop(columns=[s for s in full if s in df_rsi.columns])
+            df_rsi = df_rsi.join(rsi_full, how="outer")
+            df_weights = pd.concat([df_weights.drop(index=[s for s in full if s in df_weights.index]), weights_full])
+        else:
+            # Nouvelles lignes sans aucun close : absentes d'un calcul complet
+            df_rsi = df_rsi.loc[keep_rows]
+
+        if max_rows is not None:
+            df_rsi = df_rsi.iloc[-max_rows:]
+        df_weights = df_weights.loc[df_weights.index.isin(df_rsi.columns)]
+        df_weights["nobs"] = df_weights["nobs"].astype(np.int64)
+
+        print(f"[{resolution}] RSI{rsi_period} : {len(new_rows)} nouvelles bougies, "
+              f"{len(incremental)} symbols incrémentaux, {len(full)} recalculés")
+
+        self._write_rsi(df_rsi, df_weights, resolution, rsi_period, manifest)
+        return df_rsi
 
-        files = glob.glob(f"{prefix}rsi{rsi_period}_2*{self.EXT}")
-        if not files:
-            print(f"[{resolution}] Aucun fichier RSI{rsi_period} trouvé")
-            return DB
+    def _history(self, history, new_closes, resolution, manifest):
+        """Historique complet des close : history, ou close stockés complétés par new_closes."""
+        if history is not None:
+            return history.sort_index()
+
+        stored, _ = self._stored_closes(resolution, manifest)
+        if stored is None:
+            return new_closes.sort_index()
+        return new_closes.combine_first(stored).sort_index()
+
+    def _stored_closes(self, resolution, manifest, symbols=None):
+        """
+        Table close désignée par le manifeste, et tolérance relative de comparaison :
+        les close CSV sont arrondis à 4 chiffres significatifs (%.3e).
+
+        :return: (DataFrame ou None, rtol)
+        """
+        filename = CPriceDatabase(fmt=self.fmt)._latest_file(f"{resolution}_close_*", manifest, "close")
+        if filename is None:
+            return None, None
+        rtol = 1e-9 if filename.endswith(CPriceDatabase.EXT_BIN) else 1e-3
+        return CPriceDatabase._read_table(filename, symbols), rtol
 
-        latest_file = max(files, key=os.path.getctime)
+    @staticmethod
+    def _revised(col, stored_col, rtol):
+        """Une bougie du recouvrement diffère du close stocké, ou manquait dans la table stockée."""
+        new = col.dropna()
+        if stored_col is None:
+            return False
+        old = stored_col.reindex(new.index)
+        if old.isna().any():
+            return True
+        return not np.isclose(new.to_numpy(dtype=np.float64), old.to_numpy(dtype=np.float64),
+                              rtol=rtol, atol=0).all()
 
-        df = pd.read_csv(latest_file, sep=";", index_col=0)
-        df.index = pd.to_datetime(df.index)
+    @staticmethod
+    def _last_valid_times(df):
+        """Dernier instant non-NaN de chaque colonne."""
+        valid = df.notna().to_numpy()
+        has = valid.any(axis=0)
+        last = len(df) - 1 - np.argmax(valid[::-1], axis=0)
+        return {col: df.index[pos] for col, pos, ok in zip(df.columns, last, has) if ok}
+
+    # ======================================================
+    # LECTURE DES FICHIERS
+    # ======================================================
+    def _read_rsi_frame(self, resolution, rsi_period, manifest, symbols=None):
+        """Table RSI (index temps × symboles) désignée par le manifeste, ou None."""
+        latest_file = self._latest_file(f"{resolution}_rsi{rsi_period}_2*", manifest, f"rsi{rsi_period}")
+        if latest_file is None:
+            return None
+
+        if latest_file.endswith(CRSIDatabase.EXT_BIN):
+            df = CColumnStore.read(latest_file, columns=symbols)
+        else:
+            df = pd.read_csv(latest_file, sep=";", index_col=0)
+            df.index = pd.to_datetime(df.index)
+            if symbols is not None:
+                df = df[[s for s in symbols if s in df.columns]]
         df.sort_index(inplace=True)
+        return df
+
+    def _read_weights_frame(self, resolution, rsi_period, manifest):
+        """Table des weights (index = symbol), ou None."""
+        filename = self._latest_file(
+            f"{resolution}_rsi{rsi_period}_weights*", manifest, f"rsi{rsi_period}_weights"
+        )
+        if filename is None:
+            return None
 
-        for symbol in df.columns:
-            series = df[symbol].astype(float)
+        if filename.endswith(CRSIDatabase.EXT_BIN):
+            return CColumnStore.read(filename).rename_axis("symbol")
+        return pd.read_csv(filename, sep=";").set_index("symbol")
 
-            if symbol not in DB:
-                DB[symbol] = pd.DataFrame(index=series.index)
+    # ======================================================
+    # LOAD RSI INTO DB
+    # ======================================================
+    def load_rsi_wide(self, resolution: str, rsi_period: int, symbols=None, manifest=None):
+        """
+        Charge le RSI en tableau large (CWideFrame, champ "RSI{period}") :
+        wide[symbol][(resolution, "RSI{period}")] renvoie une vue.
 
-            DB[symbol][(resolution, price_type)] = series
+        :param symbols: sous-ensemble de symboles à charger (None = tous) ;
+                        en mode bin seules leurs colonnes sont lues
+        :param manifest: manifeste déjà lu (CManifest.read()) ; None = manifeste courant
+        """
 
-        for symbol in DB:
-            DB[symbol].columns = pd.MultiIndex.from_tuples(DB[symbol].columns)
-            DB[symbol].sort_index(axis=1, inplace=True)
-            DB[symbol].sort_index(inplace=True)
+        price_type = f"RSI{rsi_period}"
+
+        if manifest is None:
+            manifest = CManifest(resolution).read()
+
+        df = self._read_rsi_frame(resolution, rsi_period, manifest, symbols)
+        if df is None:
+            print(f"[{resolution}] Aucun fichier RSI{rsi_period} trouvé")
+            return CWideFrame.from_frames(resolution, {})
 
         print(f"[{resolution}] DB updated with {price_type}")
-        return DB
+        return CWideFrame.from_frames(resolution, {price_type: df})
+
+    def load_rsi(self, resolution: str, rsi_period: int, symbols=None, manifest=None):
+        """
+        Ancien format : DB[symbol] = DataFrame colonne (resolution, "RSI{period}").
+        Préférer load_rsi_wide() (même accès, sans DataFrame par symbole).
+        """
+        return self.load_rsi_wide(resolution, rsi_period, symbols, manifest).to_dict()
 
     # ======================================================
     # LOAD RSI WEIGHTS
     # ======================================================
-    def load_rsi_weights(self, resolution: str, rsi_period: int):
+    def load_rsi_weights(self, resolution: str, rsi_period: int, manifest=None):
+        """:param manifest: manifeste déjà lu (CManifest.read()) ; None = manifeste courant"""
 
-        prefix = f"{resolution}_"
-        filename = f"{prefix}rsi{rsi_period}_weights{self.EXT}"
+        if manifest is None:
+            manifest = CManifest(resolution).read()
 
-        if not os.path.exists(filename):
+        df = self._read_weights_frame(resolution, rsi_period, manifest)
+
+        if df is None:
             print(f"[{resolution}] Aucun fichier WEIGHTS trouvé")
             return {}
 
-        df = pd.read_csv(filename, sep=";")
-        weights = {}
-
-        for _, row in df.iterrows():
-            weights[row["symbol"]] = {
-                "avg_gain": float(row["avg_gain"]),
-                "avg_loss": float(row["avg_loss"]),
-                "last_close": float(row["last_close"])
-            }
+        weights = {
+            symbol: {"avg_gain": float(g), "avg_loss": float(l), "last_close": float(c)}
+            for symbol, g, l, c in zip(df.index, df["avg_gain"], df["avg_loss"], df["last_close"])
+        }
 
         print(f"[{resolution}] WEIGHTS loaded")
-        return weights
\ No newline at end of file
+        return weights
@@ -0,0 +1,157 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from FullTradingAlgo.downloader.CHttpPool import CTokenBucket
+
+
+class CStageStats:
+    """Temps cumulés d'une étape du pipeline (thread-safe)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, duration, error=False):
+        with self.lock:
+            self.count += 1
+            self.errors += int(error)
+            self.total += duration
+            self.max = max(self.max, duration)
+
+    def __str__(self):
+        mean = self.total / self.count if self.count else 0.0
+        return (
+            f"{self.name:<6} n={self.count:<4} err={self.errors:<3} "
+            f"moy={mean * 1000:8.1f} ms | max={self.max * 1000:8.1f} ms | cumul={self.total:7.2f} s"
+        )
+
+
+class CScanPipeline:
+    """
+    Scan de la shortlist en pipeline : les fetchs 1m partent en parallèle, chaque résultat
+    est poussé dans une file dès son arrivée, et un pool de workers lance les tests
+    (tester.realiser) pendant que les fetchs suivants sont encore en cours.
+
+        pipeline = CScanPipeline(fetcher, l_TestOneSymbol)
+        results = pipeline.run(filtered_symbols, DB)     # {symbol: résultat de realiser}
+        pipeline.print_stats()
+
+    Le fetcher n'a besoin que de _fetch_klines3(symbol, interval, limit) : un fetcher de
+    test (sans réseau) suffit. Le débit vers l'exchange est borné par le limiteur du
+    fetcher (CHttpPool) ; rate ajoute un limiteur propre au pipeline si le fetcher n'en a pas.
+    """
+
+    def __init__(self, fetcher, tester, interval="1m", limit=1000,
+                 fetch_workers=8, test_workers=4, queue_size=32, rate=None):
+        """
+        :param tester: objet possédant realiser(DBOneS, dfoneminute, symbol=...)
+        :param fetch_workers: fetchs simultanés
+        :param test_workers: tests simultanés
+        :param queue_size: bougies en attente de test (au-delà, les fetchs attendent)
+        :param rate: requêtes / seconde max côté pipeline (None = limiteur du fetcher seul)
+        """
+        self.fetcher = fetcher
+        self.tester = tester
+        self.interval = interval
+        self.limit = limit
+        self.fetch_workers = fetch_workers
+        self.test_workers = test_workers
+        self.queue_size = queue_size
+        self.bucket = CTokenBucket(rate) if rate else None
+        self.stats = {}
+        self.wall = 0.0
+
+    # ======================================================
+    # ÉTAPES
+    # ======================================================
+    def _fetch(self, symbol, out):
+        """Étape 1 : bougies 1m du symbole → file (rien si vide ou en erreur)."""
+        if self.bucket is not None:
+            self.bucket.acquire()
+
+        t0 = time.perf_counter()
+        try:
+            df = self.fetcher._fetch_klines3(symbol=symbol, interval=self.interval, limit=self.limit)
+        except Exception as e:
+            self.stats["fetch"].add(time.perf_counter() - t0, error=True)
+            print(f"Erreur fetch pour {symbol}: {e}")
+            return
+        self.stats["fetch"].add(time.perf_counter() - t0)
+
+        if df is None or df.empty:
+            return
+
+        out.put((symbol, df, time.perf_counter()))
+
+    def _test_worker(self, DB, inbox, results):
+        """Étape 2 : tests des symboles au fil de leur arrivée (None = fin de la file)."""
+        while True:
+            item = inbox.get()
+            if item is None:
+                return
+
+            symbol, df, queued_at = item
+            t0 = time.perf_counter()
+            self.stats["queue"].add(t0 - queued_at)
+
+            try:
+                results[symbol] = self.tester.realiser(DB[symbol], df, symbol=symbol)
+                self.stats["test"].add(time.perf_counter() - t0)
+            except Exception as e:
+                self.stats["test"].add(time.perf_counter() - t0, error=True)
+                print(f"Erreur test pour {symbol}: {e}")
+
+    # ======================================================
+    # RUN
+    # ======================================================
+    def run(self, symbols, DB):
+        """
+        :param symbols: shortlist à scanner
+        :param DB: instantané de la base (DB[symbol] passé à realiser)
+        :return: {symbol: résultat de realiser} pour les symboles fetchés et testés
+        """
+        symbols = list(symbols)
+        self.stats = {name: CStageStats(name) for name in ("fetch", "queue", "test")}
+        results = {}
+        if not symbols:
+            self.wall = 0.0
+            return results
+
+        start = time.perf_counter()
+        inbox = queue.Queue(maxsize=self.queue_size)
+
+        workers = [
+            threading.Thread(target=self._test_worker, args=(DB, inbox, results), daemon=True)
+            for _ in range(max(1, self.test_workers))
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.fetch_workers, len(symbols)))) as pool:
+                for symbol in symbols:
+                    pool.submit(self._fetch, symbol, inbox)
+        finally:
+            # Tous les fetchs sont terminés : un marqueur de fin par worker
+            for _ in workers:
+                inbox.put(None)
+            for worker in workers:
+                worker.join()
+
+        self.wall = time.perf_counter() - start
+        return results
+
+    def print_stats(self):
+        print(f"⏱ Scan pipeline : {self.wall:.2f} s")
+        for stage in self.stats.values():
+            print(f"   {stage}")
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+from CWideFrame import CWideFrame
+
+
+class CScreener:
+    """
+    Filtres cross-symboles évalués sur tout l'univers d'un coup, à partir des tableaux
+    larges de CLoadDB (loader.tables) au lieu d'une boucle Python par symbole.
+
+    Les séries dérivées d'un intervalle (dernier close, MA, RSI courant...) sont calculées
+    une fois puis gardées en cache jusqu'au rechargement de cet intervalle (compteur
+    loader.indicator_cache.generations, incrémenté par reload_interval et en mode attach) :
+    un screen ne coûte ensuite que quelques opérations NumPy sur des vecteurs de n_symboles.
+
+        screener = CScreener(loader)
+        symbols = screener.screen([
+            ("rsi_below", {"interval": "4h", "rsi_period": 5, "threshold": 40}),
+            ("near_ma",   {"interval": "1d", "periods": (10, 20, 50, 100)}),
+            ("ma_rising", {"interval": "1d", "period": 10}),
+        ])
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self._cache = {}         # interval → (clé de version, {nom: valeur dérivée})
+
+    # ======================================================
+    # TABLES / CACHE
+    # ======================================================
+    def _version(self, interval):
+        # Compteur croissant (jamais réutilisé, contrairement à l'id() d'une table libérée)
+        return self.loader.indicator_cache.generations.get(interval, 0)
+
+    def _derived(self, interval):
+        """Cache des séries dérivées de l'intervalle (vidé quand l'intervalle est rechargé)."""
+        version = self._version(interval)
+        cached = self._cache.get(interval)
+        if cached is None or cached[0] != version:
+            cached = (version, {})
+            self._cache[interval] = cached
+        return cached[1]
+
+    def _table(self, interval, kind):
+        """CWideFrame "price" ou "rsi" de l'intervalle (reconstruit depuis DB en mode attach)."""
+        tables = self.loader.tables.get(interval)
+        if tables is not None:
+            return tables[kind]
+
+        derived = self._derived(interval)
+        key = ("table", kind)
+        if key not in derived:
+            fields = ["close", "high", "low"] if kind == "price" else [f"RSI{self.loader.l_rsiperiod}"]
+            frames = {}
+            for field in fields:
+                series = {
+                    symbol: intervals[interval][field]
+                    for symbol, intervals in self.loader.DB.items()
+                    if field in intervals.get(interval, {})
+                }
+                if series:
+                    frames[field] = pd.DataFrame(series)
+            derived[key] = CWideFrame.from_frames(interval, frames)
+        return derived[key]
+
+    def _cached(self, interval, key, compute):
+        derived = self._derived(interval)
+        if key not in derived:
+            derived[key] = compute()
+        return derived[key]
+
+    def _to_universe(self, interval, field, table, local_mask):
+        """Masque par colonne du champ → masque aligné sur loader.symbols."""
+        def positions():
+            universe = {s: i for i, s in enumerate(self.loader.symbols)}
+            cols = table.columns.get(field, [])
+            src = np.array([j for j, s in enumerate(cols) if s in universe], dtype=np.int64)
+            dst = np.array([universe[cols[j]] for j in src], dtype=np.int64)
+            return src, dst
+
+        src, dst = self._cached(interval, ("positions", field, id(self.loader.symbols), len(self.loader.symbols)), positions)
+        mask = np.zeros(len(self.loader.symbols), dtype=bool)
+        mask[dst] = local_mask[src]
+        return mask
+
+    # ======================================================
+    # SÉRIES DÉRIVÉES
+    # ======================================================
+    def _last_row(self, interval, kind, field):
+        """Dernière ligne du champ (comme series.iloc[-1] : NaN si la dernière bougie manque)."""
+        table = self._table(interval, kind)
+
+        def compute():
+            if field not in table.arrays or len(table.index) == 0:
+                return np.full(len(table.columns.get(field, [])), np.nan)
+            return np.array(table.matrix(field)[-1])
+
+        return self._cached(interval, ("last", field), compute)
+
+    def _ma_last_two(self, interval, period):
+        """(MA courante, MA précédente) de rolling(period).mean() sur les close de l'intervalle."""
+        table = self._table(interval, "price")
+
+        def compute():
+            closes = table.matrix("close") if "close" in table.arrays else np.empty((0, 0))
+            n, k = closes.shape
+            ma_last = np.full(k, np.nan)
+            ma_prev = np.full(k, np.nan)
+            if n >= period:
+                ma_last = closes[n - period:].mean(axis=0)          # NaN dans la fenêtre → NaN
+            if n >= period + 1:
+                ma_prev = closes[n - period - 1:n - 1].mean(axis=0)
+            return ma_last, ma_prev
+
+        return self._cached(interval, ("ma", period), compute)
+
+    def _prices(self, interval, prices):
+        """Prix courants par colonne "close" : prices (dict symbole → prix) ou dernier close stocké."""
+        table = self._table(interval, "price")
+        if prices is None:
+            return self._last_row(interval, "price", "close")
+        return np.array([prices.get(s, np.nan) for s in table.columns.get("close", [])], dtype=np.float64)
+
+    # ======================================================
+    # CONDITIONS (masques alignés sur loader.symbols)
+    # ======================================================
+    def rsi_below(self, interval="4h", rsi_period=5, threshold=40):
+        """RSI{period} de la dernière bougie < threshold."""
+        field = f"RSI{rsi_period}"
+        table = self._table(interval, "rsi")
+        rsi = self._last_row(interval, "rsi", field)
+        with np.errstate(invalid="ignore"):
+            return self._to_universe(interval, field, table, rsi < threshold)
+
+    def near_ma(self, interval="1d", periods=(10, 20, 50, 100), tolerance=0.01, prices=None):
+        """Prix entre une des MA et MA * (1 + tolerance) (cf. CIndicators.is_close_near_daily_ma)."""
+        table = self._table(interval, "price")
+        price = self._prices(interval, prices)
+        mask = np.zeros(len(price), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for period in periods:
+                ma = self._ma_last_two(interval, period)[0]
+                mask |= (ma <= price) & (price <= ma * (1 + tolerance))
+        return self._to_universe(interval, "close", table, mask)
+
+    def ma_rising(self, interval="1d", period=10):
+        """MA(period) en hausse entre ses deux dernières valeurs."""
+        table = self._table(interval, "price")
+        ma_last, ma_prev = self._ma_last_two(interval, period)
+        with np.errstate(invalid="ignore"):
+            return self._to_universe(interval, "close", table, ma_last > ma_prev)
+
+    def above_ma(self, interval="1d", period=10, prices=None):
+        """Prix strictement au-dessus de la MA(period)."""
+        table = self._table(interval, "price")
+        price = self._prices(interval, prices)
+        ma_last = self._ma_last_two(interval, period)[0]
+        with np.errstate(invalid="ignore"):
+            return self._to_universe(interval, "close", table, price > ma_last)
+
+    # ======================================================
+    # SCREEN
+    # ======================================================
+    def screen(self, conditions):
+        """
+        :param conditions: liste de (nom de condition, kwargs), combinées par ET
+        :return: symboles (ordre de loader.symbols) qui satisfont toutes les conditions
+        """
+        mask = np.ones(len(self.loader.symbols), dtype=bool)
+        for name, kwargs in conditions:
+            mask &= getattr(self, name)(**kwargs)
+        return [self.loader.symbols[i] for i in np.flatnonzero(mask)]
@@ -0,0 +1,149 @@
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from CColumnStore import CColumnStore
+
+
+class CSharedDB:
+    """
+    Base partagée entre processus scanners, par fichiers mappés en mémoire.
+
+    Un processus "publisher" (CLoadDB(shared="publish")) écrit, pour chaque intervalle,
+    une génération = un fichier CColumnStore (colonnes "symbole|champ" : close, high,
+    low, RSI) + un fichier des weights, puis bascule atomiquement le pointeur
+    {interval}.current (os.replace). Les processus "attach" relisent ces fichiers en
+    memmap, en lecture seule et sans copie : une seule copie des tableaux en RAM (page
+    cache) quel que soit le nombre de scanners, et jamais de génération à moitié écrite.
+    """
+
+    SEP = "|"
+    KEEP_GENERATIONS = 2   # génération courante + précédente (lecteurs pas encore basculés)
+
+    def __init__(self, directory="shared_db"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    # ======================================================
+    # CHEMINS
+    # ======================================================
+    def _pointer_path(self, interval):
+        return os.path.join(self.directory, f"{interval}.current")
+
+    def _gen_paths(self, interval, generation):
+        base = os.path.join(self.directory, f"{interval}_g{generation:06d}")
+        return base + ".bin", base + "_weights.bin"
+
+    def current(self, interval):
+        """Pointeur de la génération courante ({"generation", "data", "weights"}) ou None."""
+        try:
+            with open(self._pointer_path(interval)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    # ======================================================
+    # PUBLICATION
+    # ======================================================
+    def publish(self, interval, DB, rsi_period):
+        """
+        Publie DB[symbol][interval] (close/high/low/RSI + weights) comme nouvelle génération.
+        :return: numéro de génération publié
+        """
+        rsi_key = f"RSI{rsi_period}"
+        weights_key = f"{rsi_key}_WEIGHTS"
+        fields = ["close", "high", "low", rsi_key]
+
+        series = {}
+        weights = {}
+        for symbol, intervals in DB.items():
+            data = intervals.get(interval, {})
+            for field in fields:
+                s = data.get(field)
+                if s is not None and len(s):
+                    series[f"{symbol}{self.SEP}{field}"] = s
+            if weights_key in data:
+                weights[symbol] = data[weights_key]
+
+        if not series:
+            return None
+
+        df = pd.DataFrame(series)
+        df.sort_index(inplace=True)
+
+        pointer = self.current(interval)
+        generation = pointer["generation"] + 1 if pointer else 1
+        data_path, weights_path = self._gen_paths(interval, generation)
+
+        CColumnStore.write(data_path, df)
+        CColumnStore.write(
+            weights_path,
+            pd.DataFrame.from_dict(weights, orient="index", columns=["avg_gain", "avg_loss", "last_close"])
+        )
+
+        # 🔥 Bascule atomique : les lecteurs voient l'ancienne ou la nouvelle génération
+        tmp = self._pointer_path(interval) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "generation": generation,
+                "data": os.path.basename(data_path),
+                "weights": os.path.basename(weights_path)
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._pointer_path(interval))
+
+        self._garbage_collect(interval, generation)
+        print(f"[{interval}] Shared DB publiée (génération {generation})")
+        return generation
+
+    def _garbage_collect(self, interval, generation):
+        """Supprime les générations trop anciennes (les lecteurs déjà mappés gardent leurs pages)."""
+        for path in glob.glob(os.path.join(self.directory, f"{interval}_g*.bin")):
+            name = os.path.basename(path)
+            try:
+                gen = int(name[len(interval) + 2:].split("_")[0].split(".")[0])
+            except ValueError:
+                continue
+            if gen <= generation - self.KEEP_GENERATIONS:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass   # fichier encore ouvert (Windows) : supprimé au prochain passage
+
+    # ======================================================
+    # RATTACHEMENT (lecture seule, sans copie)
+    # ======================================================
+    def attach(self, interval, rsi_period):
+        """
+        :return: (generation, {symbol: {"close": Series, "high": ..., "low": ..., "RSI{p}": ...,
+                                        "RSI{p}_WEIGHTS": dict}}) ou (None, {}) si rien n'est publié
+        """
+        pointer = self.current(interval)
+        if pointer is None:
+            return None, {}
+
+        header, index, values = CColumnStore.open(os.path.join(self.directory, pointer["data"]))
+        weights_header, weights_index, weights_values = CColumnStore.open(
+            os.path.join(self.directory, pointer["weights"])
+        )
+
+        data = {}
+        for j, col in enumerate(header["columns"]):
+            symbol, field = col.split(self.SEP, 1)
+            # Vue sur le memmap (colonne contiguë), sans copie
+            data.setdefault(symbol, {})[field] = pd.Series(values[:, j], index=index, name=symbol, copy=False)
+
+        weights_key = f"RSI{rsi_period}_WEIGHTS"
+        w = np.asarray(weights_values)
+        for i, symbol in enumerate(weights_index):
+            data.setdefault(symbol, {})[weights_key] = {
+                "avg_gain": float(w[i, 0]),
+                "avg_loss": float(w[i, 1]),
+                "last_close": float(w[i, 2])
+            }
+
+        return pointer["generation"], data
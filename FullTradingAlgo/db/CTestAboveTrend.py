@@ -13,9 +13,9 @@ class CTestAboveTrend:
     Utilise les indicateurs de CIndicators pour les calculs
     """
 
-    def __init__(self, n_dernieres_minutes_touche_100=60):
+    def __init__(self, n_dernieres_minutes_touche_100=60, indicator_cache=None):
         self.n_dernieres_minutes_touche_100 = n_dernieres_minutes_touche_100
-        self.indicators = CIndicators()
+        self.indicators = CIndicators(cache=indicator_cache)
 
     # ======================================================
     # MAIN
@@ -84,7 +84,7 @@ class CTestAboveTrend:
         # ETAPE 2 : PROCHE MA DAILY (1D)
         # ======================================================
         print(f"{symbol_log} | TEST 2 : Proche MA daily")
-        if not self.indicators.is_close_near_daily_ma(DBOneS=DBOneS, dfoneminute=dfoneminute):
+        if not self.indicators.is_close_near_daily_ma(DBOneS=DBOneS, dfoneminute=dfoneminute, symbol=symbol):
             print(f"{symbol_log} | ❌ FAIL : pas proche MA daily\n")
             return False
         print(f"{symbol_log} | ✅ PASS : Proche MA daily | close: {last_close:.4f}\n")
@@ -14,8 +14,8 @@ class CTestHighDivergence:
     Utilise les indicateurs de CIndicators pour les calculs
     """
 
-    def __init__(self):
-        self.indicators2 = CIndicators2()
+    def __init__(self, indicator_cache=None):
+        self.indicators2 = CIndicators2(cache=indicator_cache)
 
     # ======================================================
     # MAIN
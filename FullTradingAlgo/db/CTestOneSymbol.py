@@ -16,8 +16,12 @@ class CTestOneSymbol:
     Classe orchestratrice qui teste un symbole avec différentes stratégies
     """
 
-    def __init__(self):
-        self.test_above_trend = CTestHighDivergence()
+    def __init__(self, indicator_cache=None):
+        """
+        Args:
+            indicator_cache: CIndicatorCache du loader (loader.indicator_cache) ou None
+        """
+        self.test_above_trend = CTestHighDivergence(indicator_cache=indicator_cache)
         self.launcher = CLauncher3()
 
     def realiser(self, DBOneS, dfoneminute, symbol=None):
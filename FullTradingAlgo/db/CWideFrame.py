@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+
+class CWideFrame:
+    """
+    Données d'une résolution gardées en quelques tableaux larges (temps × symboles),
+    un par champ (high, low, close, RSI5, ...), en ordre Fortran : la colonne d'un
+    symbole est contiguë et renvoyée comme vue, sans DataFrame par symbole.
+
+        wide = price_db.load_wide("4h")
+        wide["BTCUSDT"]["close"]             → Series (vue)
+        wide["BTCUSDT"]["4h", "close"]       → idem (clé (résolution, champ) de load())
+        wide.matrix("close")                 → ndarray (n_bougies, n_symboles)
+    """
+
+    def __init__(self, resolution, index, arrays, columns):
+        """
+        :param index: DatetimeIndex commun à tous les champs
+        :param arrays: {champ: ndarray (len(index), n_symboles_du_champ)}
+        :param columns: {champ: liste des symboles (ordre des colonnes)}
+        """
+        self.resolution = resolution
+        self.index = index
+        self.arrays = {field: np.asfortranarray(a, dtype=np.float64) for field, a in arrays.items()}
+        self.columns = {field: list(cols) for field, cols in columns.items()}
+        self.positions = {field: {s: j for j, s in enumerate(cols)} for field, cols in self.columns.items()}
+        self.symbols = list(dict.fromkeys(s for cols in self.columns.values() for s in cols))
+        self._symbol_set = set(self.symbols)
+
+    @classmethod
+    def from_frames(cls, resolution, frames):
+        """
+        Construit depuis des DataFrames larges {champ: df (temps × symboles)}, alignés
+        sur l'union de leurs index (NaN là où un champ n'a pas la bougie).
+        """
+        fields = sorted(frames)
+        if not fields:
+            return cls(resolution, pd.DatetimeIndex([]), {}, {})
+
+        index = frames[fields[0]].index
+        for field in fields[1:]:
+            if not frames[field].index.equals(index):
+                index = index.union(frames[field].index)
+
+        arrays = {}
+        for field in fields:
+            df = frames[field]
+            if not df.index.equals(index):
+                df = df.reindex(index)
+            arrays[field] = df.to_numpy(dtype=np.float64)
+
+        return cls(resolution, index, arrays, {field: frames[field].columns for field in fields})
+
+    # ======================================================
+    # ACCÈS
+    # ======================================================
+    def column(self, field, symbol):
+        """Série du symbole pour un champ : vue sur la colonne du tableau large."""
+        j = self.positions[field][symbol]
+        return pd.Series(
+            self.arrays[field][:, j], index=self.index, name=(self.resolution, field), copy=False
+        )
+
+    def matrix(self, field):
+        """Tableau large (n_bougies, n_symboles) du champ, colonnes dans l'ordre de self.columns[field]."""
+        return self.arrays[field]
+
+    def fields_of(self, symbol):
+        return [field for field in sorted(self.arrays) if symbol in self.positions[field]]
+
+    def __getitem__(self, symbol):
+        if symbol not in self._symbol_set:
+            raise KeyError(symbol)
+        return CWideSymbol(self, symbol)
+
+    def __contains__(self, symbol):
+        return symbol in self._symbol_set
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def keys(self):
+        return list(self.symbols)
+
+    def items(self):
+        return ((symbol, CWideSymbol(self, symbol)) for symbol in self.symbols)
+
+    def get(self, symbol, default=None):
+        return CWideSymbol(self, symbol) if symbol in self._symbol_set else default
+
+    def to_dict(self):
+        """Ancien format de load() : {symbol: DataFrame colonnes MultiIndex (résolution, champ)}."""
+        DB = {}
+        multi_columns = {}
+        for symbol in self.symbols:
+            fields = tuple(self.fields_of(symbol))
+            values = np.column_stack([self.arrays[f][:, self.positions[f][symbol]] for f in fields])
+            if fields not in multi_columns:
+                multi_columns[fields] = pd.MultiIndex.from_tuples([(self.resolution, f) for f in fields])
+            DB[symbol] = pd.DataFrame(values, index=self.index, columns=multi_columns[fields])
+        return DB
+
+
+class CWideSymbol:
+    """Accès léger aux champs d'un symbole d'un CWideFrame (rien n'est copié)."""
+
+    __slots__ = ("table", "symbol")
+
+    def __init__(self, table, symbol):
+        self.table = table
+        self.symbol = symbol
+
+    def _field(self, key):
+        if isinstance(key, tuple):
+            resolution, field = key
+            if resolution != self.table.resolution:
+                raise KeyError(key)
+            return field
+        return key
+
+    def __getitem__(self, key):
+        field = self._field(key)
+        if field not in self.table.positions or self.symbol not in self.table.positions[field]:
+            raise KeyError(key)
+        return self.table.column(field, self.symbol)
+
+    def __contains__(self, key):
+        try:
+            field = self._field(key)
+        except KeyError:
+            return False
+        return field in self.table.positions and self.symbol in self.table.positions[field]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        return [(self.table.resolution, field) for field in self.table.fields_of(self.symbol)]
@@ -0,0 +1,89 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from CRSIDatabase import CRSIDatabase
+
+
+# ==========================================================
+# DONNÉES SYNTHÉTIQUES (taille d'un run S_db_one_resolution.py)
+# ==========================================================
+def make_closes(n_candles=1000, n_symbols=400, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=n_candles, freq="1h", tz="UTC", name="time")
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_candles, n_symbols)), axis=0))
+
+    # Historiques plus courts (listings récents) + quelques trous
+    starts = rng.integers(0, n_candles // 2, n_symbols)
+    starts[: n_symbols // 2] = 0
+    for j, start in enumerate(starts):
+        values[:start, j] = np.nan
+    holes = rng.random(values.shape) < 0.002
+    values[holes] = np.nan
+
+    return pd.DataFrame(values, index=index, columns=[f"SYM{j:03d}USDT" for j in range(n_symbols)])
+
+
+# ==========================================================
+# RÉFÉRENCE : BOUCLE PAR SYMBOLE (ancienne implémentation)
+# ==========================================================
+def rsi_loop(df_close, rsi_period):
+    rsi_dict = {}
+    weights = {}
+    for symbol in df_close.columns:
+        series = df_close[symbol].dropna()
+        if len(series) < rsi_period + 1:
+            continue
+        rsi_series, avg_gain, avg_loss = CRSIDatabase.compute_rsi_with_weights(series, rsi_period)
+        rsi_dict[symbol] = rsi_series
+        weights[symbol] = (avg_gain.iloc[-1], avg_loss.iloc[-1], series.iloc[-1])
+    return pd.DataFrame(rsi_dict), weights
+
+
+def rsi_matrix(df_close, rsi_period):
+    rsi, avg_gain, avg_loss, last_close, nobs = CRSIDatabase.compute_rsi_matrix(
+        df_close.to_numpy(dtype=np.float64), rsi_period
+    )
+    keep = np.flatnonzero(nobs >= rsi_period)
+    rows = df_close.notna().to_numpy()[:, keep].any(axis=1)
+    df_rsi = pd.DataFrame(rsi[np.ix_(rows, keep)], index=df_close.index[rows], columns=df_close.columns[keep])
+    weights = {
+        df_close.columns[j]: (avg_gain[j], avg_loss[j], last_close[j]) for j in keep
+    }
+    return df_rsi, weights
+
+
+def bench(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+# ==========================================================
+# MAIN
+# ==========================================================
+def main():
+    rsi_period = 5
+
+    for n_candles, n_symbols in [(1000, 100), (1000, 400)]:
+        df_close = make_closes(n_candles, n_symbols)
+
+        t_loop, (rsi_ref, w_ref) = bench(rsi_loop, df_close, rsi_period)
+        t_mat, (rsi_new, w_new) = bench(rsi_matrix, df_close, rsi_period)
+
+        pd.testing.assert_frame_equal(rsi_new, rsi_ref, check_exact=False, rtol=1e-12, check_freq=False)
+        assert w_new.keys() == w_ref.keys()
+        assert np.allclose(np.array(list(w_new.values())), np.array(list(w_ref.values())), rtol=1e-12)
+
+        print(
+            f"{n_candles} bougies × {n_symbols} symbols : "
+            f"boucle {t_loop * 1000:.1f} ms | matrice {t_mat * 1000:.1f} ms | x{t_loop / t_mat:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
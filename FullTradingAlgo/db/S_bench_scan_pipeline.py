@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from CScanPipeline import CScanPipeline
+
+
+# ==========================================================
+# FETCHER / TESTEUR SIMULÉS (aucun appel réseau)
+# ==========================================================
+class CStubFetcher:
+    """_fetch_klines3 simulé : latence réseau fixe + bougies 1m synthétiques."""
+
+    def __init__(self, latency=0.4, n_candles=1000):
+        self.latency = latency
+        self.n_candles = n_candles
+
+    def _fetch_klines3(self, symbol, interval, limit=1000):
+        time.sleep(self.latency)
+        rng = np.random.default_rng(abs(hash(symbol)) % 2**32)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, self.n_candles)))
+        index = pd.date_range("2024-01-01", periods=self.n_candles, freq="1min", tz="UTC")
+        return pd.DataFrame({"high": close * 1.001, "low": close * 0.999, "close": close}, index=index)
+
+
+class CStubTester:
+    """realiser simulé : MA100 1m + comparaison au dernier close (ordre de grandeur d'un test)."""
+
+    def realiser(self, DBOneS, dfoneminute, symbol=None):
+        ma100 = dfoneminute["close"].rolling(window=100).mean()
+        return bool(dfoneminute["close"].iloc[-1] < ma100.iloc[-1])
+
+
+def scan_sequential(fetcher, tester, symbols, DB):
+    """Ancienne boucle de S_load_db_and_run.py : fetch puis test, un symbole à la fois."""
+    results = {}
+    for symbol in symbols:
+        df = fetcher._fetch_klines3(symbol=symbol, interval="1m", limit=1000)
+        if df is None or df.empty:
+            continue
+        results[symbol] = tester.realiser(DB[symbol], df, symbol=symbol)
+    return results
+
+
+# ==========================================================
+# MAIN
+# ==========================================================
+def main():
+    symbols = [f"SYM{j:03d}USDT" for j in range(60)]
+    DB = {symbol: {} for symbol in symbols}
+    fetcher = CStubFetcher()
+    tester = CStubTester()
+
+    t0 = time.perf_counter()
+    ref = scan_sequential(fetcher, tester, symbols, DB)
+    t_seq = time.perf_counter() - t0
+
+    # 20 requêtes / s : limite candles Bitget par IP
+    pipeline = CScanPipeline(fetcher, tester, fetch_workers=8, test_workers=4, rate=20)
+    results = pipeline.run(symbols, DB)
+
+    assert results == ref
+
+    print(f"{len(symbols)} symbols : séquentiel {t_seq:.2f} s | pipeline {pipeline.wall:.2f} s | x{t_seq / pipeline.wall:.1f}")
+    pipeline.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from CFetcherMultiSymbols import CFetcherMultiSymbols
 from FullTradingAlgo.downloader import CBitgetDataFetcher
 from CPriceDatabase import CPriceDatabase
 from CRSIDatabase import CRSIDatabase
+from CManifest import CManifest
 
 
 # ==========================================================
@@ -91,14 +92,25 @@ def main():
 
     # 🔹 Gestion base de données
     db_price = CPriceDatabase()
+    db_rsi = CRSIDatabase()
+    rsi_period = 5
 
-    # 1️⃣ Sauvegarde CSV
-    db_price.save(data, interval)
+    # 1️⃣ Sauvegarde prix + RSI, publiés ensemble (un seul manifeste → jeu cohérent)
+    with CManifest(interval) as manifest:
+        db_price.save(data, interval, manifest=manifest)
+        # RSI : avance les weights stockés sur les seules nouvelles bougies
+        # (calcul complet depuis data["close"] si rien n'est stocké, trou ou nouveau symbole)
+        datasets_rsi = db_rsi.update_rsi(
+            data["close"], interval, rsi_period,
+            manifest=manifest,
+            history=data["close"],
+            max_rows=len(data["close"])
+        )
 
     # 2️⃣ Chargement dans DB
     DB = db_price.load(interval)
 
-    # 3️⃣ Exemple d’accès : premier symbole de la liste
+    # Exemple d’accès : premier symbole de la liste
     first_symbol = symbols[0]
     btc_close = DB[first_symbol][(interval, "close")]
     btc_high = DB[first_symbol][(interval, "high")]
@@ -106,13 +118,7 @@ def main():
     print(f"{first_symbol} - dernier close: {btc_close.iloc[-1]}")
     print(f"{first_symbol} - dernier high: {btc_high.iloc[-1]}")
 
-    rsi_period = 5
-
-    db_rsi = CRSIDatabase()
-    # 1️⃣ Calcul et sauvegarde RSI depuis data["close"]
-    datasets_rsi = db_rsi.save_rsi_from_data(data, interval, rsi_period)
-
-    # 2️⃣ Chargement dans DB
+    # Chargement RSI
     DB = db_rsi.load_rsi(interval, rsi_period)
 
     # 3️⃣ Accès au RSI
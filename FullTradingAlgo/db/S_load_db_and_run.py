@@ -10,30 +10,8 @@ from CPriceDatabase import CPriceDatabase
 from CRSIDatabase import CRSIDatabase
 from FullTradingAlgo.db.CTestOneSymbol import CTestOneSymbol
 from CLoadDB import CLoadDB
-
-
-# ==========================================================
-# FILTER RSI
-# ==========================================================
-def filter_symbols_rsi_4h(DB, rsi_period=5, threshold=40):
-    filtered = []
-
-    for symbol, data in DB.items():
-        try:
-            tf_data = data.get("4h", {})
-            rsi_series = tf_data.get(f"RSI{rsi_period}", None)
-
-            if rsi_series is None or len(rsi_series) == 0:
-                continue
-
-            if rsi_series.iloc[-1] < threshold:
-                filtered.append(symbol)
-
-        except Exception as e:
-            print(f"RSI filter error {symbol}: {e}")
-            continue
-
-    return filtered
+from CScreener import CScreener
+from CScanPipeline import CScanPipeline
 
 
 # ==========================================================
@@ -44,10 +22,13 @@ available_intervals = ["1d", "4h", "1h"]
 fetcher = CBitgetDataFetcher.BitgetDataFetcher()  # FIX: instanciation correcte
 l_PriceDatabase = CPriceDatabase()
 l_RSIDatabase = CRSIDatabase()
-l_TestOneSymbol = CTestOneSymbol()
 
 l_rsiperiod = 5
 
+# Base partagée entre scanners : "publish" (un seul processus lit les fichiers),
+# "attach" (les autres se rattachent sans copie), rien = chargement local
+shared_mode = sys.argv[1] if len(sys.argv) > 1 else None
+
 
 # ==========================================================
 # LOAD DB
@@ -57,12 +38,25 @@ loader = CLoadDB(
     price_db=l_PriceDatabase,
     rsi_db=l_RSIDatabase,
     rsi_period=l_rsiperiod,
-    directory="."
+    directory=".",
+    shared=shared_mode
 )
 
 DB = loader.DB
 symbols = loader.symbols
 
+# MA daily / fenêtres RSI calculées une fois par génération (cache vidé au reload)
+l_TestOneSymbol = CTestOneSymbol(indicator_cache=loader.indicator_cache)
+
+# Fetch 1m concurrents (débit borné par le limiteur du fetcher) + tests au fil de l'eau
+pipeline = CScanPipeline(fetcher, l_TestOneSymbol, interval="1m", limit=1000)
+
+# Filtres évalués sur tout l'univers d'un coup (cache par intervalle jusqu'au reload)
+screener = CScreener(loader)
+screen_conditions = [
+    ("rsi_below", {"interval": "4h", "rsi_period": l_rsiperiod, "threshold": 40}),
+]
+
 print(f"Symbols utilisés ({len(symbols)})")
 
 
@@ -76,30 +70,12 @@ while True:
 
         DB = loader.DB  # 🔥 important : refresh DB à chaque loop
 
-        filtered_symbols = filter_symbols_rsi_4h(
-            DB,
-            rsi_period=l_rsiperiod,
-            threshold=40
-        )
+        filtered_symbols = screener.screen(screen_conditions)
 
         print(f"🎯 {len(filtered_symbols)} symbols avec RSI4h < 40")
 
-        for symbol in filtered_symbols:
-
-            try:
-                df = fetcher._fetch_klines3(
-                    symbol=symbol,
-                    interval="1m",
-                    limit=1000
-                )
-
-                if df is None or df.empty:
-                    continue
-
-                l_TestOneSymbol.realiser(DB[symbol], df, symbol=symbol)
-
-            except Exception as e:
-                print(f"Erreur fetch pour {symbol}: {e}")
+        pipeline.run(filtered_symbols, DB)
+        pipeline.print_stats()
 
     except Exception as e:
         print(f"Erreur boucle principale: {e}")
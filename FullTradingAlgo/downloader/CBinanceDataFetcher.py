@@ -2,11 +2,23 @@ import requests, time
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 
+from . import CHttpPool
+from . import CCandleCache
+
 class BinanceDataFetcher:
     BASE_URL = "https://api.binance.com/api/v3/klines"
 
-    def __init__(self):
-        pass
+    def __init__(self, max_workers=16, rate=40, base_url=None, cache_dir=None):
+        """
+        :param max_workers: nombre de symboles téléchargés en parallèle
+        :param rate: requêtes / seconde (klines = poids 2, limite Binance 6000 de poids / min ≈ 50/s)
+        :param base_url: URL alternative (ex. serveur local de test)
+        :param cache_dir: répertoire du cache disque des bougies (None = pas de cache)
+        """
+        if base_url is not None:
+            self.BASE_URL = base_url
+        self.http = CHttpPool.CHttpPool(max_workers=max_workers, rate=rate)
+        self.cache = CCandleCache.CCandleCache(cache_dir, "binance") if cache_dir else None
 
     def _prepare_dataframe(self, candles):
         """
@@ -55,9 +67,7 @@ class BinanceDataFetcher:
             success = False
             for attempt in range(max_retries):
                 try:
-                    response = requests.get(url, params=params, timeout=(3, 5))
-                    response.raise_for_status()
-                    data = response.json()
+                    data = self.http.get_json(url, params=params)
                     success = True
                     break
                 except requests.exceptions.RequestException as e:
@@ -88,6 +98,23 @@ class BinanceDataFetcher:
         df["symbol"] = symbol
         return df
 
+    def _fetch_klines_cached(self, symbol, interval, start_time, end_time):
+        """
+        Comme _fetch_klines, mais via le cache disque s'il est activé : seules les plages
+        absentes du cache (début, trous, fin) sont demandées à l'API.
+        """
+        if self.cache is None:
+            return self._fetch_klines(symbol, interval, start_time, end_time)
+
+        df = self.cache.get(
+            symbol, interval, start_time, end_time,
+            fetch_range=lambda start, end: self._fetch_klines(symbol, interval, start, end),
+            utc=False
+        )
+        if not df.empty:
+            df["symbol"] = symbol
+        return df
+
     def get_historical_klines(self, symbols, interval="1m", days=1):
         """
         Récupère les bougies historiques pour une liste de symboles,
@@ -97,10 +124,8 @@ class BinanceDataFetcher:
         end_time = (datetime.now(timezone.utc) - timedelta(minutes=1)).replace(second=0, microsecond=0)
         start_time = end_time - timedelta(days=days)
 
-        all_dfs = []
-        for sym in symbols:
-            df = self._fetch_klines(sym, interval, start_time, end_time)
-            all_dfs.append(df)
+        # Symboles en parallèle (concurrence bornée), ordre des symboles conservé
+        all_dfs = self.http.map(lambda sym: self._fetch_klines_cached(sym, interval, start_time, end_time), symbols)
 
         return pd.concat(all_dfs)
 
@@ -112,11 +137,8 @@ class BinanceDataFetcher:
         end_time = (datetime.now(timezone.utc) - timedelta(minutes=1)).replace(second=0, microsecond=0)
         start_time = end_time - timedelta(minutes=3)  # marge de sécurité
 
-        all_dfs = []
-        for sym in symbols:
-            df = self._fetch_klines(sym, interval, start_time, end_time)
-            if not df.empty:
-                all_dfs.append(df.iloc[[-1]])  # dernière bougie complète uniquement
+        dfs = self.http.map(lambda sym: self._fetch_klines(sym, interval, start_time, end_time), symbols)
+        all_dfs = [df.iloc[[-1]] for df in dfs if not df.empty]  # dernière bougie complète uniquement
 
         if all_dfs:
             return pd.concat(all_dfs)
@@ -1,8 +1,10 @@
-import requests
 import time
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 
+from . import CHttpPool
+from . import CCandleCache
+
 class BitgetDataFetcher:
     BASE_URL = "https://api.bitget.com/api/v2/spot/market/candles"
 
@@ -22,8 +24,17 @@ class BitgetDataFetcher:
         "1M": "1M"
     }
 
-    def __init__(self):
-        pass
+    def __init__(self, max_workers=16, rate=20, base_url=None, cache_dir=None):
+        """
+        :param max_workers: nombre de symboles téléchargés en parallèle
+        :param rate: requêtes / seconde (limite Bitget market candles : 20/s par IP)
+        :param base_url: URL alternative (ex. serveur local de test)
+        :param cache_dir: répertoire du cache disque des bougies (None = pas de cache)
+        """
+        if base_url is not None:
+            self.BASE_URL = base_url
+        self.http = CHttpPool.CHttpPool(max_workers=max_workers, rate=rate)
+        self.cache = CCandleCache.CCandleCache(cache_dir, "bitget") if cache_dir else None
 
     def _prepare_dataframe(self, candles):
         df = pd.DataFrame(candles, columns=["time", "open", "high", "low", "close", "volume","x","y"])
@@ -53,9 +64,7 @@ class BitgetDataFetcher:
 
         for attempt in range(max_retries):
             try:
-                r = requests.get(self.BASE_URL, params=params, timeout=(3, 5))
-                r.raise_for_status()
-                data = r.json()
+                data = self.http.get_json(self.BASE_URL, params=params)
                 break
             except Exception as e:
                 print(f"[{symbol}] Erreur réseau ({attempt + 1}/{max_retries}) : {e}")
@@ -78,6 +87,8 @@ class BitgetDataFetcher:
         """
         Récupère les bougies 1 minute de Bitget entre start_time et end_time,
         en faisant des requêtes successives de 1000 par 1000.
+
+        :return: DataFrame (vide si aucune bougie), ou None si un segment a épuisé ses tentatives
         """
 
         url = self.BASE_URL
@@ -116,9 +127,7 @@ class BitgetDataFetcher:
                         "productType": "usdt-futures"
                     }
 
-                    response = requests.get(url, params=params, timeout=(3, 5))
-                    response.raise_for_status()
-                    data = response.json()
+                    data = self.http.get_json(url, params=params)
                 except Exception as e:
                     print(f"[{symbol}] Erreur réseau : {e} (tentative {attempt + 1}/{max_retries})")
                     time.sleep(2)
@@ -141,14 +150,15 @@ class BitgetDataFetcher:
                 print(f"✅ {symbol} : {len(candles)} bougies récupérées ({current_time} → {window_end})")
                 break
             else:
+                # Tentatives épuisées : échec de toute la plage (le cache la laisse en trou)
                 print(f"❌ Impossible d’obtenir des données pour {symbol} ({current_time} → {window_end}).")
+                return None
 
             # Avance au prochain segment
             last_ts = int(candles[-1][0]) / 1000.0 if candles else current_time.timestamp()
             current_time = datetime.fromtimestamp(last_ts, tz=timezone.utc) + timedelta(seconds=one_candle_seconds)
 
-            # Petit délai pour éviter le rate-limit
-            time.sleep(0.2)
+            # Le rate-limit est géré par le token bucket partagé (self.http)
 
         if not all_candles:
             print(f"⚠️ Aucune bougie récupérée pour {symbol}.")
@@ -182,9 +192,7 @@ class BitgetDataFetcher:
 
             for attempt in range(max_retries):
                 try:
-                    response = requests.get(url, params=params, timeout=(3, 5))
-                    response.raise_for_status()
-                    data = response.json()
+                    data = self.http.get_json(url, params=params)
                     break
                 except Exception as e:
                     print(f"[{symbol}] Erreur réseau : {e} (tentative {attempt+1}/{max_retries})")
@@ -215,16 +223,33 @@ class BitgetDataFetcher:
         df["symbol"] = symbol
         return df
 
+    def _fetch_klines_cached(self, symbol, interval, start_time, end_time):
+        """
+        Comme _fetch_klines, mais via le cache disque s'il est activé : seules les plages
+        absentes du cache (début, trous, fin) sont demandées à l'API.
+        """
+        if self.cache is None:
+            return self._fetch_klines(symbol, interval, start_time, end_time)
+
+        df = self.cache.get(
+            symbol, interval, start_time, end_time,
+            fetch_range=lambda start, end: self._fetch_klines(symbol, interval, start, end),
+            utc=True
+        )
+        if not df.empty:
+            df["symbol"] = symbol
+        return df
+
     def get_historical_klines(self, symbols, interval="1m", days=1):
         end_time = (datetime.now(timezone.utc) - timedelta(minutes=1)).replace(second=0, microsecond=0)
         start_time = end_time - timedelta(days=days)
 
-        all_dfs = []
-        for sym in symbols:
+        def fetch(sym):
             print(f"Téléchargement {sym} ({interval}) ...")
-            df = self._fetch_klines(sym, interval, start_time, end_time)
-            if df is not None and not df.empty:
-                all_dfs.append(df)
+            return self._fetch_klines_cached(sym, interval, start_time, end_time)
+
+        # Symboles en parallèle (concurrence bornée), ordre des symboles conservé
+        all_dfs = [df for df in self.http.map(fetch, symbols) if df is not None and not df.empty]
 
         return pd.concat(all_dfs) if all_dfs else pd.DataFrame(columns=["open","high","low","close","volume","moy_l_h_e_c","symbol"])
 
@@ -232,10 +257,7 @@ class BitgetDataFetcher:
         end_time = (datetime.now(timezone.utc) - timedelta(minutes=1)).replace(second=0, microsecond=0)
         start_time = end_time - timedelta(minutes=3)
 
-        all_dfs = []
-        for sym in symbols:
-            df = self._fetch_klines(sym, interval, start_time, end_time)
-            if df is not None and not df.empty:
-                all_dfs.append(df.iloc[[-1]])
+        dfs = self.http.map(lambda sym: self._fetch_klines(sym, interval, start_time, end_time), symbols)
+        all_dfs = [df.iloc[[-1]] for df in dfs if df is not None and not df.empty]
 
         return pd.concat(all_dfs) if all_dfs else pd.DataFrame(columns=["open","high","low","close","volume","moy_l_h_e_c","symbol"])
@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+
+class CCandleCache:
+    """
+    Cache disque des bougies, un fichier .npy (tableau structuré, relu en mmap) par
+    clé (exchange, symbole, intervalle), plus un .json des plages déjà téléchargées.
+
+    get() ne demande à l'API que les plages manquantes (début, trous, fin). Une plage
+    nettement passée téléchargée sans bougie (symbole pas encore listé, suspension de
+    cotation) est mémorisée comme couverte pour ne pas être redemandée à chaque
+    démarrage. Une plage qui s'approche de maintenant (RECENT_INTERVALS intervalles)
+    n'est couverte que jusqu'à la dernière bougie reçue : les bougies pas encore
+    publiées par l'exchange seront redemandées. Une plage en échec (fetch_range → None)
+    reste un trou et sera redemandée.
+    """
+
+    RECENT_INTERVALS = 5
+
+    DTYPE = np.dtype([
+        ("time", "<i8"), ("open", "<f8"), ("high", "<f8"),
+        ("low", "<f8"), ("close", "<f8"), ("volume", "<f8")
+    ])
+
+    INTERVAL_SECONDS = {
+        "1m": 60, "3m": 180, "5m": 300, "15m": 900, "30m": 1800,
+        "1h": 3600, "2h": 7200, "4h": 14400, "6h": 21600, "12h": 43200,
+        "1d": 86400, "1w": 604800
+    }
+
+    def __init__(self, cache_dir, exchange):
+        """
+        :param cache_dir: répertoire racine du cache
+        :param exchange: nom de l'exchange (sous-répertoire, ex. "bitget")
+        """
+        self.cache_dir = cache_dir
+        self.exchange = exchange
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # ======================================================
+    # CHEMINS / VERROUS
+    # ======================================================
+    def _paths(self, symbol, interval):
+        folder = os.path.join(self.cache_dir, self.exchange, interval)
+        os.makedirs(folder, exist_ok=True)
+        base = os.path.join(folder, symbol)
+        return base + ".npy", base + ".json"
+
+    def _lock(self, symbol, interval):
+        with self._locks_guard:
+            return self._locks.setdefault((symbol, interval), threading.Lock())
+
+    # ======================================================
+    # LECTURE / ÉCRITURE
+    # ======================================================
+    def _read(self, symbol, interval):
+        """Retourne (tableau structuré en mmap, plages couvertes [[début_ms, fin_ms], ...])."""
+        data_path, cover_path = self._paths(symbol, interval)
+        if not (os.path.exists(data_path) and os.path.exists(cover_path)):
+            return np.empty(0, dtype=self.DTYPE), []
+        with open(cover_path) as f:
+            covered = json.load(f)["covered"]
+        return np.load(data_path, mmap_mode="r"), covered
+
+    def _write(self, symbol, interval, data, covered):
+        """Écriture atomique (fichier temporaire + os.replace) des données et de la couverture."""
+        data_path, cover_path = self._paths(symbol, interval)
+        for path, write in (
+            (data_path, lambda f: np.save(f, data)),
+            (cover_path, lambda f: f.write(json.dumps({"covered": covered}).encode()))
+        ):
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+
+    @staticmethod
+    def _merge_ranges(ranges, step_ms):
+        """Fusionne des plages [début, fin] (ms) qui se chevauchent ou se touchent."""
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + step_ms:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return merged
+
+    @staticmethod
+    def _missing_ranges(covered, start_ms, end_ms, step_ms):
+        """Plages de [start_ms, end_ms] non couvertes par le cache."""
+        missing = []
+        cursor = start_ms
+        for c_start, c_end in covered:
+            if c_end < cursor:
+                continue
+            if c_start > end_ms:
+                break
+            if c_start > cursor:
+                missing.append((cursor, c_start - step_ms))
+            cursor = max(cursor, c_end + step_ms)
+        if cursor <= end_ms:
+            missing.append((cursor, end_ms))
+        return missing
+
+    def _to_records(self, df):
+        records = np.empty(len(df), dtype=self.DTYPE)
+        records["time"] = pd.DatetimeIndex(df.index).as_unit("ms").asi8
+        for col in ("open", "high", "low", "close", "volume"):
+            records[col] = df[col].to_numpy(dtype=np.float64)
+        return records
+
+    @staticmethod
+    def _to_ms(dt):
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp() * 1000)
+
+    # ======================================================
+    # API
+    # ======================================================
+    def get(self, symbol, interval, start_time, end_time, fetch_range, utc=True):
+        """
+        Bougies de [start_time, end_time] : lecture locale + téléchargement des seules
+        plages manquantes via fetch_range(start_dt, end_dt) → DataFrame (index temporel,
+        colonnes open/high/low/close/volume), puis mise à jour du cache.
+
+        :param utc: index tz-aware UTC (Bitget) ou naïf (Binance)
+        :return: DataFrame open/high/low/close/volume/moy_l_h_e_c (vide si aucune donnée)
+        """
+        step_ms = self.INTERVAL_SECONDS.get(interval, 60) * 1000
+        start_ms = self._to_ms(start_time)
+        end_ms = self._to_ms(end_time)
+
+        recent_ms = int(time.time() * 1000) - self.RECENT_INTERVALS * step_ms
+
+        with self._lock(symbol, interval):
+            data, covered = self._read(symbol, interval)
+            missing = self._missing_ranges(covered, start_ms, end_ms, step_ms)
+
+            if missing:
+                # Copie en mémoire : le fichier mmap doit être libéré avant réécriture
+                data = np.array(data)
+                new_parts = []
+                fetched = []
+                for m_start, m_end in missing:
+                    df = fetch_range(
+                        datetime.fromtimestamp(m_start / 1000, tz=timezone.utc),
+                        datetime.fromtimestamp(m_end / 1000, tz=timezone.utc)
+                    )
+                    if df is None:
+                        continue  # échec réseau : la plage sera redemandée au prochain appel
+                    records = self._to_records(df) if not df.empty else None
+                    if records is not None:
+                        new_parts.append(records)
+
+                    if m_end < recent_ms:
+                        fetched.append([m_start, m_end])
+                    elif records is not None:
+                        # Fin de plage proche de maintenant : couverte jusqu'à la dernière
+                        # bougie reçue seulement (les suivantes ne sont peut-être pas publiées)
+                        last = int(records["time"].max())
+                        if last >= m_start:
+                            fetched.append([m_start, min(last, m_end)])
+
+                if new_parts:
+                    merged = np.concatenate([data] + new_parts)
+                    # Tri + dédoublonnage (la dernière version d'une bougie l'emporte)
+                    order = np.argsort(merged["time"], kind="stable")
+                    merged = merged[order]
+                    keep = np.r_[merged["time"][1:] != merged["time"][:-1], True]
+                    data = merged[keep]
+
+                covered = self._merge_ranges(covered + fetched, step_ms)
+                self._write(symbol, interval, data, covered)
+
+            lo = int(np.searchsorted(data["time"], start_ms, side="left"))
+            hi = int(np.searchsorted(data["time"], end_ms, side="right"))
+            window = np.array(data[lo:hi])
+
+        if len(window) == 0:
+            return pd.DataFrame()
+
+        index = pd.to_datetime(window["time"], unit="ms", utc=utc)
+        df = pd.DataFrame(
+            {col: window[col] for col in ("open", "high", "low", "close", "volume")},
+            index=pd.DatetimeIndex(index, name="time")
+        )
+        df["moy_l_h_e_c"] = (df["open"] + df["close"] + df["high"] + df["low"]) / 4
+        return df
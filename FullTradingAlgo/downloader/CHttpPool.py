@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class CTokenBucket:
+    def __init__(self, rate, burst=None):
+        """
+        Limiteur de débit "token bucket" partagé entre threads.
+
+        :param rate: nombre de requêtes autorisées par seconde (en régime établi)
+        :param burst: nombre de requêtes pouvant partir d'un coup (défaut = rate)
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else rate)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Bloque jusqu'à ce qu'un jeton soit disponible, puis le consomme."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CHttpPool:
+    def __init__(self, max_workers=16, rate=20, burst=None, timeout=(3, 5)):
+        """
+        Session HTTP keep-alive partagée + limiteur de débit + concurrence bornée,
+        pour les fetchers de bougies (un pool par fetcher).
+
+        :param max_workers: nombre maximal de requêtes simultanées
+        :param rate: requêtes / seconde autorisées par l'API (ex. Bitget candles : 20/s par IP)
+        :param burst: rafale maximale (défaut = rate)
+        :param timeout: (connexion, lecture) en secondes
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.bucket = CTokenBucket(rate, burst)
+
+        # Une connexion persistante par worker, réutilisée d'une minute à l'autre
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_json(self, url, params=None):
+        """GET limité en débit via la session partagée ; lève une exception en cas d'erreur HTTP."""
+        self.bucket.acquire()
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def map(self, func, items):
+        """Applique func à chaque élément en parallèle (ordre des résultats conservé)."""
+        items = list(items)
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            return list(pool.map(func, items))
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,112 @@
+import pandas as pd
+
+import CRSIStream
+import CMAStream
+import CMinMaxTrendStream
+
+
+# ==========================================================
+# ÉTAPES DU PIPELINE
+# apply(df) → df enrichi (calcul complet + init de l'état)
+# update(timestamp, candle) → dict {colonne: valeur} pour une nouvelle bougie
+# ==========================================================
+class CRSIStep:
+    def __init__(self, name, period=14, close_times=[(3,59),(7,59),(11,59),(15,59),(19,59),(23,59)]):
+        self.name = name
+        self.gain_col = f"avg_gain_{name}"
+        self.loss_col = f"avg_loss_{name}"
+        self.stream = CRSIStream.CRSIStream(period=period, close_times=close_times)
+
+    def apply(self, df):
+        avg_gain, avg_loss, rsi = self.stream.compute_full(df.index, df["close"].to_numpy(dtype=float))
+        df[self.gain_col] = avg_gain
+        df[self.loss_col] = avg_loss
+        df[self.name] = rsi
+        return df
+
+    def update(self, timestamp, candle):
+        gain, loss, rsi = self.stream.update(timestamp, candle["close"])
+        return {self.gain_col: gain, self.loss_col: loss, self.name: rsi}
+
+
+class CMAStep:
+    def __init__(self, name, period=20, close_times=[(3,59),(7,59),(11,59),(15,59),(19,59),(23,59)]):
+        self.name = name
+        self.stream = CMAStream.CMAStream(period=period, close_times=close_times)
+
+    def apply(self, df):
+        df[self.name] = self.stream.compute_full(df.index, df["close"].to_numpy(dtype=float))
+        return df
+
+    def update(self, timestamp, candle):
+        return {self.name: self.stream.update(timestamp, candle["close"])}
+
+
+class CMinMaxTrendStep:
+    def __init__(self, **kwargs):
+        """Paramètres identiques à CMinMaxTrend_V2 (kind, name, p_init, mode_day...)."""
+        self.stream = CMinMaxTrendStream.CMinMaxTrendStream(**kwargs)
+
+    def apply(self, df):
+        return self.stream.apply(df)
+
+    def update(self, timestamp, candle):
+        return self.stream.update(timestamp, candle)
+
+
+class CCopyStep:
+    def __init__(self, src, dst):
+        """Copie de colonne (renommage pour l'affichage / la stratégie)."""
+        self.src = src
+        self.dst = dst
+
+    def apply(self, df):
+        df[self.dst] = df[self.src]
+        return df
+
+    def update(self, timestamp, candle):
+        return {self.dst: candle[self.src]}
+
+
+class CIndicatorPipeline:
+    def __init__(self, steps):
+        """
+        Pipeline d'indicateurs à état : calcul complet une seule fois (apply),
+        puis coût par minute proportionnel au nombre de nouvelles bougies (update).
+
+        :param steps: liste d'étapes (CRSIStep, CMAStep, CMinMaxTrendStep, CCopyStep...)
+        """
+        self.steps = steps
+
+    def apply(self, df):
+        """Calcul complet sur l'historique et initialisation de l'état de chaque étape."""
+        df = df.copy()
+        df = df[~df.index.duplicated(keep='last')]
+        df = df.sort_index()
+
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("Le DataFrame doit avoir un index temporel (datetime).")
+
+        for step in self.steps:
+            df = step.apply(df)
+        return df
+
+    def update(self, df_new):
+        """
+        Fait avancer l'état sur les nouvelles bougies (dans l'ordre chronologique)
+        et retourne df_new complété des colonnes d'indicateurs.
+        """
+        df_new = df_new.copy()
+        rows = []
+        for timestamp, candle in zip(df_new.index, df_new.to_dict("records")):
+            values = {}
+            for step in self.steps:
+                out = step.update(timestamp, candle)
+                candle.update(out)
+                values.update(out)
+            rows.append(values)
+
+        if rows:
+            for col in rows[0]:
+                df_new[col] = [r[col] for r in rows]
+        return df_new
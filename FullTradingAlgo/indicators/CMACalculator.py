@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
 
+import CMAStream
+import CTimeBuckets
+
 class CMACalculator:
     def __init__(self, df, period=20,
                  close_times=[(3,59),(7,59),(11,59),(15,59),(19,59),(23,59)],
@@ -8,6 +12,7 @@ class CMACalculator:
         self.period = period
         self.close_times = close_times
         self.name = name
+        self.buckets = CTimeBuckets.CTimeBuckets(close_times)
 
         self._check_and_compute()
 
@@ -28,77 +33,41 @@ class CMACalculator:
         self.df = df
 
     def _compute_full(self):
-        """Calcul complet de la MA aux close_times + propagation minute par minute"""
+        """Calcul complet de la MA aux close_times + propagation minute par minute (vectorisé)"""
         df = self.df
-        period = self.period
-
-        # Marquage des close_times
-        df['is_custom_close'] = df.index.map(
-            lambda x: (x.hour, x.minute) in self.close_times
-        )
-
-        # Données closes uniquement
-        df_close = df[df['is_custom_close']].copy()
-
-        # MA simple basée sur les closes
-        df_close[self.name] = df_close['close'].rolling(
-            window=period, min_periods=period
-        ).mean()
 
-        # Fusion dans le df principal
-        df = df.merge(
-            df_close[[self.name]],
-            how="left",
-            left_index=True,
-            right_index=True
-        )
+        self.stream = CMAStream.CMAStream(period=self.period, close_times=self.close_times)
+        df[self.name] = self.stream.compute_full(df.index, df['close'].to_numpy(dtype=float))
 
-        # --- Propagation minute par minute ---
-        last_ma = None
-        last_idx = None
-
-        for idx in df.index:
-            ma_val = df.at[idx, self.name]
-
-            if pd.notna(ma_val):
-                last_ma = ma_val
-                last_idx = idx
-            elif last_idx is not None:
-                # Valeur figée entre deux close_times
-                df.at[idx, self.name] = last_ma
-
-        self.df = df.drop(columns=['is_custom_close'], errors='ignore')
+        self.df = df
 
     def _update_last(self):
         """Recalcule uniquement depuis le dernier close_time"""
         df = self.df
         period = self.period
 
-        # Dernier close_time valide
-        mask_close = df.index.map(
-            lambda x: (x.hour, x.minute) in self.close_times
-        )
-
-        valid_closes = df[mask_close].dropna(subset=[self.name])
+        # Dernier close_time valide (positions des close_times en cache pour cet index)
+        anchors = self.buckets.anchors(df.index)
+        ma = df[self.name].to_numpy(dtype=float)
+        valid = anchors[~np.isnan(ma[anchors])]
 
-        if valid_closes.empty:
+        if len(valid) == 0:
             self._compute_full()
             return
 
-        last_close_idx = valid_closes.index[-1]
+        last_close_pos = valid[-1]
 
         # Recalcul MA uniquement sur les closes
-        df_close = df[mask_close].copy()
-        df_close[self.name] = df_close['close'].rolling(
+        ma_close = pd.Series(df['close'].to_numpy(dtype=float)[anchors]).rolling(
             window=period, min_periods=period
-        ).mean()
-
-        # Mise à jour depuis le dernier close_time
-        for idx in df.loc[last_close_idx:].index:
-            if idx in df_close.index:
-                df.at[idx, self.name] = df_close.at[idx, self.name]
-            else:
-                df.at[idx, self.name] = df.at[last_close_idx, self.name]
+        ).mean().to_numpy()
+
+        # Mise à jour depuis le dernier close_time : MA du close_time sur ses lignes,
+        # MA du dernier close_time valide (recalculée) sur les autres
+        j = np.searchsorted(anchors, last_close_pos)
+        tail = np.full(len(df) - last_close_pos, ma_close[j])
+        tail[anchors[j:] - last_close_pos] = ma_close[j:]
+        df.iloc[last_close_pos:, df.columns.get_loc(self.name)] = tail
 
         self.df = df
 
@@ -0,0 +1,61 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import CTimeBuckets
+
+
+class CMAStream:
+    def __init__(self, period=20,
+                 close_times=[(3,59),(7,59),(11,59),(15,59),(19,59),(23,59)]):
+        """
+        MA simple sur les close aux close_times, propagée minute par minute (même
+        définition que CMACalculator), en calcul complet vectorisé ou mise à jour O(1).
+        """
+        self.period = period
+        self.close_times = close_times
+        self.buckets = CTimeBuckets.CTimeBuckets(close_times)
+        self.close_minutes = self.buckets.close_minutes
+        self._close_set = {(h, m) for h, m in close_times}
+
+        self.window = deque(maxlen=period)   # derniers close aux close_times
+        self.last_ma = np.nan                # dernière MA valide (propagée)
+
+    def close_mask(self, index):
+        """Masque booléen des lignes dont (heure, minute) est un close_time (partagé, en cache)."""
+        return self.buckets.mask(index)
+
+    # ======================================================
+    # CALCUL COMPLET VECTORISÉ
+    # ======================================================
+    def compute_full(self, index, close, mask=None):
+        """
+        :return: tableau float64 de la MA (valeur figée entre deux close_times)
+        """
+        close = np.asarray(close, dtype=np.float64)
+        if mask is None:
+            mask = self.close_mask(index)
+
+        anchor_pos = np.flatnonzero(mask)
+        ma_a = pd.Series(close[anchor_pos]).rolling(window=self.period, min_periods=self.period).mean()
+
+        ma = np.full(len(close), np.nan)
+        ma[anchor_pos] = ma_a.to_numpy()
+        ma = pd.Series(ma).ffill().to_numpy()
+
+        # État pour les mises à jour
+        self.window = deque(close[anchor_pos][-self.period:].tolist(), maxlen=self.period)
+        self.last_ma = ma[-1] if len(ma) else np.nan
+        return ma
+
+    # ======================================================
+    # MISE À JOUR O(1)
+    # ======================================================
+    def update(self, timestamp, close):
+        """Intègre une nouvelle bougie et retourne la MA pour celle-ci."""
+        if (timestamp.hour, timestamp.minute) in self._close_set:
+            self.window.append(float(close))
+            if len(self.window) == self.period and not any(np.isnan(self.window)):
+                self.last_ma = sum(self.window) / self.period
+        return self.last_ma
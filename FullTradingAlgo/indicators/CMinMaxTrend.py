@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+import CMinMaxTrendCore
+
 class CMinMaxTrend:
     def __init__(
         self, df, kind="max", name="trend", name_init="init_slope",
@@ -60,52 +62,29 @@ class CMinMaxTrend:
 
         trend = np.full_like(prices, np.nan, dtype=float)
         init_slope = np.full_like(prices, np.nan, dtype=float)
-        slope_change_point = np.full_like(prices, np.nan, dtype=float)
-        cur_slope = np.full_like(prices, np.nan, dtype=float)
         ref_values = np.full_like(prices, np.nan, dtype=float)
         ref_times = np.full(len(prices), np.datetime64('NaT'), dtype='datetime64[ns]')
 
+        # Minutes depuis l'ancrage (int64 → float, sans Timestamp par ligne) puis
+        # changements de pente trouvés par blocs : la pente est constante entre deux
+        core = CMinMaxTrendCore.CMinMaxTrendCore
+        dt = core.minutes_since(df.index, t_ref)
+        start = p_ref_index + 1
+        cur_slope, slope_change_point, first_change = core.scan(
+            prices, dt, start, p, p_ref_value, self.kind, self.CstValideMinutes, threshold=th
+        )
+
         trend[p_ref_index] = p_ref_value
+        trend[start:] = p_ref_value + cur_slope[start:] * dt[start:]
+
+        # Ligne "init" jusqu'au premier changement de pente (inclus)
+        end_init = len(prices) if first_change is None else first_change + 1
         init_slope[p_ref_index] = p_ref_value
-        cur_slope[p_ref_index] = p
-        ref_values[p_ref_index] = p_ref_value
-        ref_times[p_ref_index] = t_ref
-        slope_changed = False
+        init_slope[start:end_init] = p_ref_value + self.p_init * dt[start:end_init]
 
-        for i in range(p_ref_index + 1, len(prices)):
-            dt_minutes = (df.index[i] - t_ref).total_seconds() / 60.0
-
-            if not slope_changed:
-                init_slope[i] = p_ref_value + self.p_init * dt_minutes
-
-            val = p_ref_value + p * dt_minutes
-
-            if self.kind == "max":
-                if prices[i] > val + th:
-                    if dt_minutes >= self.CstValideMinutes:
-                        p_new = (prices[i] - p_ref_value) / dt_minutes
-                        if p_new <= 0:
-                            p = p_new
-                            slope_changed = True
-                            slope_change_point[i] = prices[i]
-                    trend[i] = p_ref_value + p * dt_minutes
-                else:
-                    trend[i] = val
-            else:
-                if prices[i] < val - th:
-                    if dt_minutes >= self.CstValideMinutes:
-                        p_new = (prices[i] - p_ref_value) / dt_minutes
-                        if p_new >= 0:
-                            p = p_new
-                            slope_changed = True
-                            slope_change_point[i] = prices[i]
-                    trend[i] = p_ref_value + p * dt_minutes
-                else:
-                    trend[i] = val
-
-            cur_slope[i] = p
-            ref_values[i] = p_ref_value
-            ref_times[i] = t_ref
+        cur_slope[p_ref_index] = p
+        ref_values[p_ref_index:] = p_ref_value
+        ref_times[p_ref_index:] = t_ref
 
         df[self.name] = trend
         df[self.name_init] = init_slope
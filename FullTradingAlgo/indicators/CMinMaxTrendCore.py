@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+
+# Unité de l'index (pandas ≥ 2) → nombre de ticks par seconde
+_TICKS_PER_SECOND = {"s": 1, "ms": 1_000, "us": 1_000_000, "ns": 1_000_000_000}
+
+
+class CMinMaxTrendCore:
+    """
+    Briques vectorisées communes à CMinMaxTrend et CMinMaxTrend_V2 :
+    - minutes écoulées depuis l'ancrage en int64 (mêmes flottants que
+      (t - t_ref).total_seconds() / 60.0, sans Timestamp par ligne)
+    - max/min de chaque jour calculés une fois (au lieu d'un df.loc par dépassement)
+    - recherche des changements de pente par blocs NumPy : entre deux changements la
+      pente est constante, le prochain dépassement se trouve sans boucle par minute
+    """
+
+    FIRST_BLOCK = 64
+    MAX_BLOCK = 1 << 16
+    SCALAR_RUN = 32         # lignes testées une à une après un changement (changements en rafale)
+
+    # ======================================================
+    # TEMPS
+    # ======================================================
+    @staticmethod
+    def ticks(index, t):
+        """Instant t en ticks int64 (UTC) dans l'unité de l'index."""
+        return np.int64(pd.Timestamp(t).as_unit(index.unit).asm8.view("i8"))
+
+    @staticmethod
+    def minutes_since(index, t_ref, ticks=None):
+        """(t - t_ref).total_seconds() / 60.0 pour chaque ligne (ou chaque valeur de ticks)."""
+        asi8 = index.asi8 if ticks is None else ticks
+        seconds = (asi8 - CMinMaxTrendCore.ticks(index, t_ref)) / _TICKS_PER_SECOND[index.unit]
+        return seconds / 60.0
+
+    # ======================================================
+    # EXTRÊMES JOURNALIERS
+    # ======================================================
+    @staticmethod
+    def day_extremes(index, prices, kind, t_ref):
+        """
+        Par ligne : extrême du jour (comme df.loc[day: day + 1 jour].max()/.min(), bornes
+        incluses), minutes entre 00h00 du jour et t_ref, fin (exclue) du jour.
+        L'index doit être trié (comme pour le df.loc d'origine).
+        """
+        n = len(prices)
+        day_ticks = index.normalize().asi8
+        starts = np.flatnonzero(np.r_[True, day_ticks[1:] != day_ticks[:-1]]) if n else np.empty(0, np.int64)
+        ends = np.r_[starts[1:], n].astype(np.int64)
+
+        # Fenêtre [00h00, 00h00 + 1 jour] de chaque jour (recouvre la 1re bougie du lendemain)
+        asi8 = index.asi8
+        one_day = 86_400 * _TICKS_PER_SECOND[index.unit]
+        lo = np.searchsorted(asi8, day_ticks[starts], side="left")
+        hi = np.searchsorted(asi8, day_ticks[starts] + one_day, side="right")
+
+        reduce = np.fmax.reduce if kind == "max" else np.fmin.reduce
+        ext = np.array([reduce(prices[a:b]) if b > a else np.nan for a, b in zip(lo, hi)])
+
+        group = np.repeat(np.arange(len(starts)), ends - starts)
+        dt_day = CMinMaxTrendCore.minutes_since(index, t_ref, ticks=day_ticks[starts])
+        return ext[group], dt_day[group], ends[group]
+
+    # ======================================================
+    # CHANGEMENTS DE PENTE
+    # ======================================================
+    @staticmethod
+    def scan(prices, dt, start, p, ref, kind, valid_minutes, threshold=0.0, day=None):
+        """
+        Rejoue la boucle minute par minute de _compute_full à partir de start.
+
+        :param day: None, ou (extrême du jour, minutes 00h00 → t_ref, fin du jour) par ligne
+                    (mode_day : pente recalculée sur l'extrême du jour à 00h00)
+        :return: (cur_slope, slope_change_point, première ligne modifiant la pente ou None)
+        """
+        n = len(prices)
+        is_max = kind == "max"
+        p0 = p
+        change_pos, change_p = [], []
+        marks = np.full(n, np.nan)
+
+        def candidates(a, b, p):
+            d = dt[a:b]
+            x = prices[a:b]
+            val = ref + p * d
+            breach = (x > val + threshold) if is_max else (x < val - threshold)
+            breach &= d >= valid_minutes
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if day is None:
+                    p_new = (x - ref) / d
+                    ok = (p_new <= 0) if is_max else (p_new >= 0)
+                else:
+                    p_new = (day[0][a:b] - ref) / day[1][a:b]
+                    ok = (day[1][a:b] > 0) & ((p_new <= 0) if is_max else (p_new >= 0))
+            return breach & ok, p_new
+
+        i = start
+        block = CMinMaxTrendCore.FIRST_BLOCK
+        while i < n:
+            end = min(n, i + block)
+            hit, p_new = candidates(i, end, p)
+            k = np.flatnonzero(hit)
+            if len(k) == 0:
+                i = end
+                block = min(block * 2, CMinMaxTrendCore.MAX_BLOCK)
+                continue
+
+            j = i + k[0]
+            p = p_new[k[0]]
+            change_pos.append(j)
+            change_p.append(p)
+
+            if day is None:
+                marks[j] = prices[j]
+                i = j + 1
+
+                # Un changement en suit souvent un autre de près : quelques lignes en
+                # scalaire (mêmes opérations flottantes) avant de repartir par blocs
+                run_end = min(n, i + CMinMaxTrendCore.SCALAR_RUN)
+                while i < run_end:
+                    d = float(dt[i])
+                    x = float(prices[i])
+                    val = ref + p * d
+                    breach = (x > val + threshold) if is_max else (x < val - threshold)
+                    if breach and d >= valid_minutes:
+                        p_i = (x - ref) / d
+                        if (p_i <= 0) if is_max else (p_i >= 0):
+                            p = p_i
+                            change_pos.append(i)
+                            change_p.append(p)
+                            marks[i] = x
+                            run_end = min(n, i + 1 + CMinMaxTrendCore.SCALAR_RUN)
+                    i += 1
+            else:
+                # Même jour → même extrême : la pente reste p_new, chaque nouveau
+                # dépassement du jour ne fait que marquer le point
+                day_end = day[2][j]
+                marks[j] = day[0][j]
+                rest, _ = candidates(j + 1, day_end, p)
+                marks[j + 1 + np.flatnonzero(rest)] = day[0][j]
+                i = day_end
+            block = CMinMaxTrendCore.FIRST_BLOCK
+
+        # Pente après chaque ligne : constante par morceaux entre deux changements
+        cur_slope = np.full(n, np.nan)
+        rows = np.arange(start, n)
+        seg = np.searchsorted(np.asarray(change_pos, dtype=np.int64), rows, side="right")
+        cur_slope[start:] = np.asarray([p0] + change_p, dtype=np.float64)[seg]
+        return cur_slope, marks, (change_pos[0] if change_pos else None)
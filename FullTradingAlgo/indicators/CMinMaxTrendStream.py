@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+import CMinMaxTrend_V2
+
+
+class CMinMaxTrendStream:
+    def __init__(
+        self, kind="max", name="trend", name_init="init_slope",
+        p_init=-0.01, CstValideMinutes=60, name_slope_change=None,
+        mode_day=False
+    ):
+        """
+        Version à état de CMinMaxTrend_V2 : calcul complet à l'initialisation, puis
+        mise à jour O(1) par bougie (même logique que _compute_last, avec le max/min
+        du jour maintenu en continu au lieu d'un df.loc sur la journée).
+
+        p_init peut être une fonction df → pente, évaluée une fois dans apply().
+        """
+        self.kind = kind
+        self.name = name
+        self.name_init = name_init
+        self.p_init = p_init
+        self.CstValideMinutes = CstValideMinutes
+        self.mode_day = mode_day
+        self.name_slope_change = name_slope_change or f"{self.name}_slope_change"
+
+        self.col_slope = f"{self.name}_cur_slope"
+        self.col_ref_value = f"{self.name}_ref_value"
+        self.col_ref_time = f"{self.name}_ref_time"
+
+        # État courant
+        self.p = np.nan
+        self.p_ref_value = np.nan
+        self.t_ref = None
+        self.day = None
+        self.day_extreme = np.nan
+
+    # ======================================================
+    # CALCUL COMPLET + INITIALISATION DE L'ÉTAT
+    # ======================================================
+    def apply(self, df):
+        if callable(self.p_init):
+            self.p_init = self.p_init(df)
+
+        df = CMinMaxTrend_V2.CMinMaxTrend(
+            df, kind=self.kind, name=self.name, name_init=self.name_init,
+            p_init=self.p_init, CstValideMinutes=self.CstValideMinutes,
+            name_slope_change=self.name_slope_change, mode_day=self.mode_day
+        ).get_df()
+
+        self.p = df[self.col_slope].iloc[-1]
+        self.p_ref_value = df[self.col_ref_value].iloc[-1]
+        self.t_ref = pd.Timestamp(df[self.col_ref_time].iloc[-1]).tz_localize(None)
+
+        price_col = "high" if self.kind == "max" else "low"
+        last = pd.Timestamp(df.index[-1])
+        self.day = last.tz_localize(None).normalize()
+        day_prices = df[price_col][df.index >= last.normalize()]
+        self.day_extreme = day_prices.max() if self.kind == "max" else day_prices.min()
+        return df
+
+    # ======================================================
+    # MISE À JOUR O(1)
+    # ======================================================
+    def update(self, timestamp, candle):
+        """
+        :param candle: mapping avec au moins 'high' et 'low'
+        :return: dict {colonne: valeur} pour cette bougie
+        """
+        ts = pd.Timestamp(timestamp).tz_localize(None)
+        price = candle["high"] if self.kind == "max" else candle["low"]
+
+        day = ts.normalize()
+        if day != self.day:
+            self.day = day
+            self.day_extreme = price
+        elif self.kind == "max":
+            self.day_extreme = max(self.day_extreme, price)
+        else:
+            self.day_extreme = min(self.day_extreme, price)
+
+        dt_minutes = (ts - self.t_ref).total_seconds() / 60.0
+        val = self.p_ref_value + self.p * dt_minutes
+        slope_change = np.nan
+
+        breached = price > val if self.kind == "max" else price < val
+        if breached and dt_minutes >= self.CstValideMinutes:
+            if self.mode_day:
+                dt_day = (day - self.t_ref).total_seconds() / 60.0
+                if dt_day > 0:
+                    p_new = (self.day_extreme - self.p_ref_value) / dt_day
+                    if (p_new <= 0) if self.kind == "max" else (p_new >= 0):
+                        self.p = p_new
+                        slope_change = self.day_extreme
+            else:
+                p_new = (price - self.p_ref_value) / dt_minutes
+                if (p_new <= 0) if self.kind == "max" else (p_new >= 0):
+                    self.p = p_new
+                    slope_change = price
+
+        return {
+            self.name: self.p_ref_value + self.p * dt_minutes,
+            self.name_init: self.p_ref_value + self.p_init * dt_minutes,
+            self.name_slope_change: slope_change,
+            self.col_slope: self.p,
+            self.col_ref_value: self.p_ref_value,
+            self.col_ref_time: self.t_ref
+        }
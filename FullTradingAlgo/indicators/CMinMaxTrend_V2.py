@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+import CMinMaxTrendCore
+
 class CMinMaxTrend:
     def __init__(
         self, df, kind="max", name="trend", name_init="init_slope",
@@ -63,70 +65,25 @@ class CMinMaxTrend:
         n = len(prices)
         trend = np.full(n, np.nan)
         init_slope = np.full(n, np.nan)
-        slope_change_point = np.full(n, np.nan)
-        cur_slope = np.full(n, np.nan)
         ref_values = np.full(n, p_ref_value)
         ref_times = np.full(n, t_ref, dtype='datetime64[ns]')
 
+        # === Calcul dynamique : minutes depuis l'ancrage en int64, extrêmes du jour
+        # calculés une fois, changements de pente trouvés par blocs NumPy
+        core = CMinMaxTrendCore.CMinMaxTrendCore
+        dt = core.minutes_since(df.index, t_ref)
+        day = core.day_extremes(df.index, prices, self.kind, t_ref) if self.mode_day else None
+        start = i_ref + 1
+        cur_slope, slope_change_point, _ = core.scan(
+            prices, dt, start, p, p_ref_value, self.kind, self.CstValideMinutes, day=day
+        )
+
         trend[i_ref] = p_ref_value
         init_slope[i_ref] = p_ref_value
         cur_slope[i_ref] = p
 
-        # === Calcul dynamique
-        for i in range(i_ref + 1, n):
-            t_cur = df.index[i]
-            dt_minutes = (t_cur - t_ref).total_seconds() / 60.0
-            val = p_ref_value + p * dt_minutes
-
-            # Ligne "init"
-            init_slope[i] = p_ref_value + self.p_init * dt_minutes
-
-            # --- Tendance descendante (max)
-            if self.kind == "max":
-                if prices[i] > val and dt_minutes >= self.CstValideMinutes:
-                    if self.mode_day:
-                        # On utilise le jour du dépassement
-                        day = pd.Timestamp(t_cur).normalize()
-                        day_data = df.loc[day: day + pd.Timedelta(days=1)]
-                        p_day_max = day_data["high"].max()
-                        t_day = day
-                        dt_day = (t_day - t_ref).total_seconds() / 60.0
-                        if dt_day > 0:
-                            p_new = (p_day_max - p_ref_value) / dt_day
-                            if p_new <= 0:
-                                p = p_new
-                                slope_change_point[i] = p_day_max
-                    else:
-                        p_new = (prices[i] - p_ref_value) / dt_minutes
-                        if p_new <= 0:
-                            p = p_new
-                            slope_change_point[i] = prices[i]
-
-                trend[i] = p_ref_value + p * dt_minutes
-
-            # --- Tendance montante (min)
-            else:
-                if prices[i] < val and dt_minutes >= self.CstValideMinutes:
-                    if self.mode_day:
-                        day = pd.Timestamp(t_cur).normalize()
-                        day_data = df.loc[day: day + pd.Timedelta(days=1)]
-                        p_day_min = day_data["low"].min()
-                        t_day = day
-                        dt_day = (t_day - t_ref).total_seconds() / 60.0
-                        if dt_day > 0:
-                            p_new = (p_day_min - p_ref_value) / dt_day
-                            if p_new >= 0:
-                                p = p_new
-                                slope_change_point[i] = p_day_min
-                    else:
-                        p_new = (prices[i] - p_ref_value) / dt_minutes
-                        if p_new >= 0:
-                            p = p_new
-                            slope_change_point[i] = prices[i]
-
-                trend[i] = p_ref_value + p * dt_minutes
-
-            cur_slope[i] = p
+        trend[start:] = p_ref_value + cur_slope[start:] * dt[start:]
+        init_slope[start:] = p_ref_value + self.p_init * dt[start:]
 
         # === Stockage
         df[self.name] = trend
@@ -41,15 +41,9 @@ class CPeaksDetector:
         highs = df['high'].values
         lows = df['low'].values
 
-        # Détection brute sans filtrage de prominence
-        peaks_max, props_max = find_peaks(highs, distance=self.distance, prominence=0)
-        peaks_min, props_min = find_peaks(-lows, distance=self.distance, prominence=0)
-
-        # Post-filtrage dynamique selon ATR locale
-        filtered_max = [i for i in peaks_max
-                        if props_max["prominences"][list(peaks_max).index(i)] >= self.factor * df['atr'].iloc[i]]
-        filtered_min = [i for i in peaks_min
-                        if props_min["prominences"][list(peaks_min).index(i)] >= self.factor * df['atr'].iloc[i]]
+        filtered_max, filtered_min = self.detect(
+            highs, lows, df['atr'].to_numpy(dtype=float), self.distance, self.factor
+        )
 
         # Colonnes pour stocker les valeurs des pics
         df[self.max_col] = np.nan
@@ -63,6 +57,24 @@ class CPeaksDetector:
 
         self.df = df
 
+    @staticmethod
+    def detect(highs, lows, atr, distance, factor):
+        """
+        Positions des pics max / min dont la prominence dépasse factor * ATR au pic.
+
+        :return: (positions des maxima, positions des minima) en tableaux int
+        """
+        # Détection brute sans filtrage de prominence
+        peaks_max, props_max = find_peaks(highs, distance=distance, prominence=0)
+        peaks_min, props_min = find_peaks(-lows, distance=distance, prominence=0)
+
+        # Post-filtrage dynamique selon ATR locale : masque sur les prominences,
+        # alignées sur les pics (ATR NaN → pic rejeté)
+        keep_max = props_max["prominences"] >= factor * atr[peaks_max]
+        keep_min = props_min["prominences"] >= factor * atr[peaks_min]
+
+        return peaks_max[keep_max], peaks_min[keep_min]
+
     def get_df(self):
         """Retourne le DataFrame enrichi avec colonnes des valeurs des pics"""
         return self.df
@@ -0,0 +1,268 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import find_peaks
+
+import CPeaksDetector
+
+
+class CPeakSide:
+    """
+    État d'un côté (max sur high, min sur -low) de CPeaksStream.
+
+    Prominence (comme scipy) : x[p] - max(min à gauche jusqu'au premier point plus haut,
+    min à droite jusqu'au premier point plus haut). Le min gauche ne change plus une fois
+    le pic apparu (gardé en cache) ; le min droit ne change plus dès qu'un point plus haut
+    existe à droite, sinon (pic "visible") il suit le min des nouvelles bougies.
+    """
+
+    def __init__(self, x, start, distance):
+        """
+        :param x: signal complet (high, ou -low)
+        :param start: début de la fenêtre réévaluée
+        """
+        raw, _ = find_peaks(x, distance=distance)
+        frozen = raw[raw < start]                               # pics bruts (filtre distance) figés
+        self.window = raw[raw >= start]                         # pics bruts de la fenêtre
+        self.tail = frozen[frozen >= start - distance]          # pics figés pouvant masquer la fenêtre
+
+        self.visible = []
+        self.right_min = {}
+        self.left_min = {}
+        if len(frozen):
+            suffix_max = np.maximum.accumulate(x[::-1])[::-1]
+            suffix_min = np.minimum.accumulate(x[::-1])[::-1]
+            after = np.r_[suffix_max[1:], -np.inf]
+            self.visible = [int(p) for p in frozen if x[p] >= after[p]]
+            self.right_min = {p: suffix_min[p] for p in self.visible}
+
+    def left(self, x, p):
+        """Min à gauche du pic p jusqu'au premier point plus haut (calculé une fois)."""
+        value = self.left_min.get(p)
+        if value is None:
+            # Recherche du premier point plus haut par blocs croissants vers la gauche
+            lo, block = p, 64
+            while lo > 0:
+                a = max(0, lo - block)
+                higher = np.flatnonzero(x[a:lo] > x[p])
+                if len(higher):
+                    lo = a + higher[-1] + 1
+                    break
+                lo, block = a, block * 2
+            value = self.left_min[p] = x[lo:p + 1].min()
+        return value
+
+    @staticmethod
+    def right(x, p):
+        """Min à droite du pic p jusqu'au premier point plus haut (ou la fin du signal)."""
+        seg = x[p + 1:]
+        higher = np.flatnonzero(seg > x[p])
+        seg = seg[:higher[0]] if len(higher) else seg
+        return min(x[p], seg.min()) if len(seg) else x[p]
+
+    def prominence(self, x, p, right_min):
+        return x[p] - max(self.left(x, p), right_min)
+
+
+class CPeaksStream:
+    def __init__(self, atr_period=14, factor=0.5, distance=5, lookback=None,
+                 max_col="peak_max", min_col="peak_min"):
+        """
+        Version à état de CPeaksDetector pour le live : calcul complet à l'initialisation
+        (apply), puis à chaque nouvelle bougie seule la fin du signal est réévaluée
+        (update), là où un pic peut encore apparaître ou disparaître :
+        - la fenêtre des `lookback` dernières bougies (nouveaux pics, filtre de distance)
+        - les pics plus anciens sans point plus haut à leur droite, dont la prominence
+          dépend encore des nouvelles bougies
+
+        :param lookback: taille de la fenêtre réévaluée (défaut : 20 * distance)
+
+        Les prominences sont celles du signal complet ; seule une cascade du filtre de
+        distance remontant au-delà de la fenêtre n'est pas reproduite.
+        """
+        self.atr_period = atr_period
+        self.factor = factor
+        self.distance = distance
+        self.lookback = lookback if lookback is not None else 20 * distance
+        self.max_col = max_col
+        self.min_col = min_col
+
+        self.n = 0
+        self._buffers = {}
+        self.sides = {}
+
+    # ======================================================
+    # BUFFERS (croissance par doublement, sans recopie à chaque bougie)
+    # ======================================================
+    def _append(self, name, values):
+        buf = self._buffers.get(name)
+        m = len(values)
+        if buf is None or self.n + m > len(buf):
+            new = np.full(max(16, 2 * (self.n + m)), np.nan)
+            if buf is not None:
+                new[:self.n] = buf[:self.n]
+            self._buffers[name] = buf = new
+        buf[self.n:self.n + m] = values
+
+    def _view(self, name):
+        return self._buffers[name][:self.n]
+
+    @property
+    def high(self):
+        return self._view("high")
+
+    @property
+    def low(self):
+        return self._view("low")
+
+    @property
+    def atr(self):
+        return self._view("atr")
+
+    @property
+    def peak_max(self):
+        return self._view("peak_max")
+
+    @property
+    def peak_min(self):
+        return self._view("peak_min")
+
+    # ======================================================
+    # CALCUL COMPLET + INITIALISATION DE L'ÉTAT
+    # ======================================================
+    def apply(self, df):
+        df = df.copy()
+        self.n = 0
+        self._buffers = {}
+
+        high = df["high"].to_numpy(dtype=float)
+        low = df["low"].to_numpy(dtype=float)
+        atr = (df["high"] - df["low"]).rolling(self.atr_period).mean().to_numpy(dtype=float)
+
+        filtered_max, filtered_min = CPeaksDetector.CPeaksDetector.detect(
+            high, low, atr, self.distance, self.factor
+        )
+        peak_max = np.full(len(df), np.nan)
+        peak_min = np.full(len(df), np.nan)
+        peak_max[filtered_max] = high[filtered_max]
+        peak_min[filtered_min] = low[filtered_min]
+
+        for name, values in (("high", high), ("low", low), ("neg_low", -low), ("atr", atr),
+                             ("peak_max", peak_max), ("peak_min", peak_min)):
+            self._append(name, values)
+        self.n = len(df)
+
+        start = max(0, self.n - self.lookback)
+        self.sides = {
+            "max": CPeakSide(high, start, self.distance),
+            "min": CPeakSide(-low, start, self.distance),
+        }
+
+        df[self.max_col] = peak_max
+        df[self.min_col] = peak_min
+        return df
+
+    # ======================================================
+    # MISE À JOUR
+    # ======================================================
+    def update(self, high, low):
+        """
+        Ajoute des bougies (tableaux ou scalaires high / low) et réévalue la fin du signal.
+
+        :return: positions dont la valeur de pic a pu changer (peak_max / peak_min à relire)
+        """
+        high = np.atleast_1d(np.asarray(high, dtype=float))
+        low = np.atleast_1d(np.asarray(low, dtype=float))
+        n_old = self.n
+        m = len(high)
+
+        self._append("high", high)
+        self._append("low", low)
+        self._append("neg_low", -low)
+        self._append("peak_max", np.full(m, np.nan))
+        self._append("peak_min", np.full(m, np.nan))
+
+        # ATR des nouvelles bougies (moyenne glissante : seul le passé proche compte)
+        a = max(0, n_old - self.atr_period + 1)
+        spread = np.r_[self._buffers["high"][a:n_old] - self._buffers["low"][a:n_old], high - low]
+        atr_tail = pd.Series(spread).rolling(self.atr_period).mean().to_numpy()
+        self._append("atr", atr_tail[n_old - a:])
+        self.n = n_old + m
+
+        start = max(0, self.n - self.lookback)
+        changed = [np.arange(start, self.n)]
+        for kind, x, values, out in (("max", self.high, self.high, self.peak_max),
+                                     ("min", self._view("neg_low"), self.low, self.peak_min)):
+            changed.append(self._update_side(self.sides[kind], x, values, out, start, n_old))
+        return np.unique(np.concatenate(changed))
+
+    @staticmethod
+    def _select_by_distance(peaks, priority, distance):
+        """Filtre de distance de find_peaks : du plus prioritaire au moins prioritaire."""
+        keep = np.ones(len(peaks), dtype=bool)
+        for j in np.argsort(priority)[::-1]:
+            if not keep[j]:
+                continue
+            lo = np.searchsorted(peaks, peaks[j] - distance, side="right")
+            hi = np.searchsorted(peaks, peaks[j] + distance, side="left")
+            keep[lo:hi] = False
+            keep[j] = True
+        return keep
+
+    def _mark(self, side, x, values, out, p, right_min):
+        keep = side.prominence(x, p, right_min) >= self.factor * self.atr[p]
+        out[p] = values[p] if keep else np.nan
+
+    def _update_side(self, side, x, values, out, start, n_old):
+        """
+        :param x: signal du côté (high, ou -low)
+        :param values: valeurs écrites aux pics (high, ou low)
+        :param out: colonne de pics à mettre à jour en place
+        """
+        new = x[n_old:]
+        new_max = new.max()
+        new_min = new.min()
+
+        # Pics figés visibles : min droit prolongé par les nouvelles bougies, jusqu'au
+        # premier point plus haut (le pic cesse alors d'être visible et devient définitif)
+        candidates = list(side.visible)
+        visible = []
+        for p in side.visible:
+            if x[p] >= new_max:
+                side.right_min[p] = min(side.right_min[p], new_min)
+                visible.append(p)
+            else:
+                k = np.flatnonzero(new > x[p])[0]
+                if k:
+                    side.right_min[p] = min(side.right_min[p], new[:k].min())
+            self._mark(side, x, values, out, p, side.right_min[p])
+
+        # Pics bruts sortis de la fenêtre → figés (visibles s'ils dominent la fin du signal)
+        leaving = side.window[side.window < start]
+        for p in leaving.tolist():
+            candidates.append(p)
+            right_min = side.right(x, p)
+            if x[p] >= x[p + 1:].max():
+                side.right_min[p] = right_min
+                visible.append(p)
+            self._mark(side, x, values, out, p, right_min)
+
+        side.visible = visible
+        side.tail = np.r_[side.tail, leaving]
+        side.tail = side.tail[side.tail >= start - self.distance]
+        keep = set(visible)
+        side.right_min = {p: v for p, v in side.right_min.items() if p in keep}
+        side.left_min = {p: v for p, v in side.left_min.items() if p >= start or p in keep}
+
+        # Fenêtre : maxima locaux, filtre de distance (les pics figés juste avant start
+        # restent prioritaires) puis prominence
+        margin = max(0, start - self.distance)
+        local, _ = find_peaks(x[margin:])
+        local = local[local + margin >= start] + margin
+        peaks = np.r_[side.tail, local].astype(np.int64)
+        priority = np.r_[np.full(len(side.tail), np.inf), x[local]]
+        side.window = local[self._select_by_distance(peaks, priority, self.distance)[len(side.tail):]]
+
+        out[start:] = np.nan
+        for p in side.window.tolist():
+            self._mark(side, x, values, out, p, side.right(x, p))
+        return np.asarray(candidates, dtype=np.int64)
@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
 
+import CRSIStream
+import CTimeBuckets
+
 class CRSICalculator:
     def __init__(self, df, period=14,
                  close_times=[(3,59),(7,59),(11,59),(15,59),(19,59),(23,59)],
@@ -8,6 +12,7 @@ class CRSICalculator:
         self.period = period
         self.close_times = close_times
         self.name = name
+        self.buckets = CTimeBuckets.CTimeBuckets(close_times)
 
         self._check_and_compute()
 
@@ -31,83 +36,20 @@ class CRSICalculator:
         self.df = df
 
     def _compute_full(self):
-        """Recalcul complet du RSI aux close_times + interpolation minute par minute"""
+        """Recalcul complet du RSI aux close_times + interpolation minute par minute (vectorisé)"""
         df = self.df
-        period = self.period
-        alpha = 1 / period
-
-        # Marquage des close_times
-        df['is_custom_close'] = df.index.map(lambda x: (x.hour, x.minute) in self.close_times)
-        df_close = df[df['is_custom_close']].copy()
-
-        # Différences entre closes
-        df_close['delta'] = df_close['close'].diff()
-        df_close['gain'] = df_close['delta'].clip(lower=0)
-        df_close['loss'] = -df_close['delta'].clip(upper=0)
 
         gain_col = f'avg_gain_{self.name}'
         loss_col = f'avg_loss_{self.name}'
 
-        # EMA de Wilder
-        df_close[gain_col] = df_close['gain'].ewm(alpha=alpha, min_periods=period).mean()
-        df_close[loss_col] = df_close['loss'].ewm(alpha=alpha, min_periods=period).mean()
-
-        # RSI aux close_times
-        def compute_rsi(gain, loss):
-            if pd.isna(gain) or pd.isna(loss):
-                return None
-            if loss == 0:
-                return 100
-            rs = gain / loss
-            return 100 - (100 / (1 + rs))
-
-        df_close[self.name] = df_close.apply(
-            lambda row: compute_rsi(row[gain_col], row[loss_col]), axis=1
-        )
-
-        # Fusion avec le df original
-        df = df.merge(df_close[[gain_col, loss_col, self.name]],
-                      how="left", left_index=True, right_index=True)
-
-        # --- Interpolation minute par minute ---
-        last_idx = None
-        next_idx = None
-        last_gain = None
-        last_loss = None
-        last_price = None
-
-        for idx in df.index:
-            gain = df.at[idx, gain_col]
-            loss = df.at[idx, loss_col]
-
-            if pd.notna(gain) and pd.notna(loss):
-                # Point de référence (close_time)
-                last_gain = gain
-                last_loss = loss
-                last_idx = idx
-                last_price = df.at[idx, 'close']
-                rsi = df.at[idx, self.name]
-            elif last_idx is not None:
-                # Points intermédiaires
-                if next_idx is None or idx >= next_idx:
-                    future = df.loc[idx:].dropna(subset=[gain_col])
-                    next_idx = future.index[0] if not future.empty else None
-
-                close_cur = df.at[idx, 'close']
-                delta = close_cur - last_price
-                gain_cur = max(delta, 0)
-                loss_cur = max(-delta, 0)
-
-                gain_avg = (1 - alpha) * last_gain + alpha * gain_cur
-                loss_avg = (1 - alpha) * last_loss + alpha * loss_cur
-
-                rsi = 100 - (100 / (1 + gain_avg / loss_avg)) if loss_avg != 0 else 100
-
-                df.at[idx, gain_col] = gain_avg
-                df.at[idx, loss_col] = loss_avg
-                df.at[idx, self.name] = rsi
-
-        self.df = df.drop(columns=['is_custom_close','delta','gain','loss'], errors='ignore')
+        self.stream = CRSIStream.CRSIStream(period=self.period, close_times=self.close_times)
+        avg_gain, avg_loss, rsi = self.stream.compute_full(df.index, df['close'].to_numpy(dtype=float))
+
+        df[gain_col] = avg_gain
+        df[loss_col] = avg_loss
+        df[self.name] = rsi
+
+        self.df = df
 
     def _update_last(self):
         """Recalcule les valeurs depuis le dernier close_time (valeurs figées) jusqu'à la dernière bougie"""
@@ -118,41 +60,36 @@ class CRSICalculator:
         gain_col = f'avg_gain_{self.name}'
         loss_col = f'avg_loss_{self.name}'
 
-        # Dernier close_time valide
-        mask_close = df.index.map(lambda x: (x.hour, x.minute) in self.close_times)
-        last_close_idx = df[mask_close].dropna(subset=[gain_col, loss_col, self.name]).index[-1]
+        # Dernier close_time valide (positions des close_times en cache pour cet index)
+        gain = df[gain_col].to_numpy(dtype=float)
+        loss = df[loss_col].to_numpy(dtype=float)
+        value = df[self.name].to_numpy(dtype=float)
+        anchors = self.buckets.anchors(df.index)
+        valid = anchors[~(np.isnan(gain[anchors]) | np.isnan(loss[anchors]) | np.isnan(value[anchors]))]
+
+        if len(valid) == 0:
+            self._compute_full()
+            return
 
         # Référence : valeurs de ce close_time (à garder fixes comme base)
-        ref_row = df.loc[last_close_idx]
-        base_gain = ref_row[gain_col]
-        base_loss = ref_row[loss_col]
-        base_price = ref_row['close']
-
-        gain_avg = base_gain
-        loss_avg = base_loss
-        last_price = base_price
-
-        # Mise à jour à partir de la bougie suivante
-        for idx in df.loc[last_close_idx:].index[1:]:
-            close_cur = df.at[idx, 'close']
-            delta = close_cur - last_price
-            gain_cur = max(delta, 0)
-            loss_cur = max(-delta, 0)
-
-            gain_avg = (1 - alpha) * base_gain + alpha * gain_cur
-            loss_avg = (1 - alpha) * base_loss + alpha * loss_cur
-
-            if loss_avg == 0:
-                rsi = 100
-            else:
-                rs = gain_avg / loss_avg
-                rsi = 100 - (100 / (1 + rs))
-
-            df.at[idx, gain_col] = gain_avg
-            df.at[idx, loss_col] = loss_avg
-            df.at[idx, self.name] = rsi
-
-            #last_price = close_cur
+        last_close_pos = valid[-1]
+        base_gain = gain[last_close_pos]
+        base_loss = loss[last_close_pos]
+        base_price = df['close'].iloc[last_close_pos]
+
+        # Mise à jour à partir de la bougie suivante (prix de référence figé au close_time)
+        pos = last_close_pos + 1
+        if pos < len(df):
+            delta = df['close'].to_numpy(dtype=float)[pos:] - base_price
+            gain_avg = (1 - alpha) * base_gain + alpha * np.maximum(delta, 0)
+            loss_avg = (1 - alpha) * base_loss + alpha * np.maximum(-delta, 0)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rsi = np.where(loss_avg == 0, 100.0, 100 - (100 / (1 + gain_avg / loss_avg)))
+
+            df.iloc[pos:, df.columns.get_loc(gain_col)] = gain_avg
+            df.iloc[pos:, df.columns.get_loc(loss_col)] = loss_avg
+            df.iloc[pos:, df.columns.get_loc(self.name)] = rsi
 
         self.df = df
 
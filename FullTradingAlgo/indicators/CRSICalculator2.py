@@ -1,5 +1,7 @@
 import pandas as pd
 
+import CTimeBuckets
+
 class RSICalculator:
     def __init__(self, df, period=14, close_times=[(3, 59), (7, 59), (11, 59), (15, 59), (19, 59), (23, 59)], name="rsi"):
         self.df = df.copy()
@@ -14,9 +16,7 @@ class RSICalculator:
         alpha = 1 / period
 
         # 1. Marquer les timestamps correspondant aux clôtures voulues
-        df['is_custom_close'] = df.index.map(
-            lambda x: (x.hour, x.minute) in self.close_times
-        )
+        df['is_custom_close'] = CTimeBuckets.CTimeBuckets(self.close_times).mask(df.index)
 
         # 2. Extraire les closes aux bons moments
         df_close = df[df['is_custom_close']].copy()
@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+
+import CTimeBuckets
+
+
+class CRSIStream:
+    def __init__(self, period=14,
+                 close_times=[(3,59),(7,59),(11,59),(15,59),(19,59),(23,59)]):
+        """
+        RSI de Wilder aux close_times + interpolation minute par minute (même définition
+        que CRSICalculator), en deux modes :
+        - compute_full(index, close) : calcul vectorisé NumPy sur tout l'historique
+        - update(timestamp, close)   : mise à jour O(1) par nouvelle bougie (live)
+
+        L'état scalaire reprend exactement la récurrence de pandas ewm(alpha, adjust=True)
+        utilisée par le calcul complet, pour que les deux modes donnent les mêmes valeurs.
+        """
+        self.period = period
+        self.alpha = 1 / period
+        self.close_times = close_times
+        self.buckets = CTimeBuckets.CTimeBuckets(close_times)
+        self.close_minutes = self.buckets.close_minutes
+        self._close_set = {(h, m) for h, m in close_times}
+
+        # État EWM (récurrence pandas adjust=True)
+        self.weighted_gain = np.nan
+        self.weighted_loss = np.nan
+        self.old_wt = 1.0
+        self.nobs = 0
+        self.prev_close = np.nan        # close du dernier close_time (pour le delta)
+
+        # Dernier point d'ancrage valide (base de l'interpolation)
+        self.anchor_gain = None
+        self.anchor_loss = None
+        self.anchor_close = None
+
+        self._pending_closes = None     # closes d'ancrage en attente (état construit à la demande)
+
+    # ======================================================
+    # OUTILS
+    # ======================================================
+    def close_mask(self, index):
+        """Masque booléen des lignes dont (heure, minute) est un close_time (partagé, en cache)."""
+        return self.buckets.mask(index)
+
+    @staticmethod
+    def _rsi(gain, loss):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + gain / loss))
+        return np.where(loss == 0, 100.0, rsi)
+
+    # ======================================================
+    # CALCUL COMPLET VECTORISÉ
+    # ======================================================
+    def compute_full(self, index, close, mask=None):
+        """
+        :param index: DatetimeIndex des bougies (1 min)
+        :param close: tableau des close
+        :param mask: masque des close_times (calculé si None)
+        :return: (avg_gain, avg_loss, rsi) en tableaux float64 de même longueur
+        """
+        close = np.asarray(close, dtype=np.float64)
+        n = len(close)
+        alpha = self.alpha
+        if mask is None:
+            mask = self.close_mask(index)
+
+        anchor_pos = np.flatnonzero(mask)
+        anchor_close = pd.Series(close[anchor_pos])
+
+        # EMA de Wilder aux close_times (identique à CRSICalculator)
+        delta = anchor_close.diff()
+        gain_a = delta.clip(lower=0).ewm(alpha=alpha, min_periods=self.period).mean().to_numpy()
+        loss_a = (-delta.clip(upper=0)).ewm(alpha=alpha, min_periods=self.period).mean().to_numpy()
+
+        valid = ~np.isnan(gain_a) & ~np.isnan(loss_a)
+        rsi_a = np.where(valid, self._rsi(gain_a, loss_a), np.nan)
+
+        avg_gain = np.full(n, np.nan)
+        avg_loss = np.full(n, np.nan)
+        rsi = np.full(n, np.nan)
+
+        valid_pos = anchor_pos[valid]
+        if len(valid_pos):
+            # Dernier ancrage valide pour chaque ligne à partir du premier
+            first = valid_pos[0]
+            rows = np.arange(first, n)
+            k = np.searchsorted(valid_pos, rows, side="right") - 1
+            ref = valid_pos[k]
+
+            ref_gain = np.full(n, np.nan)
+            ref_loss = np.full(n, np.nan)
+            ref_gain[valid_pos] = gain_a[valid]
+            ref_loss[valid_pos] = loss_a[valid]
+
+            # Interpolation depuis le close d'ancrage (prix de référence figé)
+            d = close[rows] - close[ref]
+            gain_cur = np.maximum(d, 0)
+            loss_cur = np.maximum(-d, 0)
+            g = (1 - alpha) * ref_gain[ref] + alpha * gain_cur
+            l = (1 - alpha) * ref_loss[ref] + alpha * loss_cur
+
+            avg_gain[first:] = g
+            avg_loss[first:] = l
+            rsi[first:] = self._rsi(g, l)
+
+            # Les ancrages gardent leurs valeurs exactes
+            avg_gain[valid_pos] = gain_a[valid]
+            avg_loss[valid_pos] = loss_a[valid]
+            rsi[valid_pos] = rsi_a[valid]
+
+        self._pending_closes = close[anchor_pos]
+        return avg_gain, avg_loss, rsi
+
+    def _build_state(self):
+        """Rejoue la récurrence EWM sur les closes d'ancrage pour initialiser l'état O(1)."""
+        closes = self._pending_closes
+        self._pending_closes = None
+        self.weighted_gain = np.nan
+        self.weighted_loss = np.nan
+        self.old_wt = 1.0
+        self.nobs = 0
+        self.prev_close = np.nan
+        self.anchor_gain = self.anchor_loss = self.anchor_close = None
+        for c in closes:
+            self._anchor_step(float(c))
+
+    # ======================================================
+    # MISE À JOUR O(1)
+    # ======================================================
+    def _anchor_step(self, close):
+        delta = close - self.prev_close
+        self.prev_close = close
+        gain = max(delta, 0.0) if delta == delta else np.nan
+        loss = max(-delta, 0.0) if delta == delta else np.nan
+
+        is_obs = delta == delta
+        self.nobs += is_obs
+        if self.weighted_gain == self.weighted_gain:
+            self.old_wt *= (1 - self.alpha)
+            if is_obs:
+                if self.weighted_gain != gain:
+                    self.weighted_gain = self.old_wt * self.weighted_gain + 1.0 * gain
+                    self.weighted_gain /= (self.old_wt + 1.0)
+                if self.weighted_loss != loss:
+                    self.weighted_loss = self.old_wt * self.weighted_loss + 1.0 * loss
+                    self.weighted_loss /= (self.old_wt + 1.0)
+                self.old_wt += 1.0
+        elif is_obs:
+            self.weighted_gain = gain
+            self.weighted_loss = loss
+
+        if self.nobs >= self.period:
+            self.anchor_gain = self.weighted_gain
+            self.anchor_loss = self.weighted_loss
+            self.anchor_close = close
+            return True
+        return False
+
+    def update(self, timestamp, close):
+        """
+        Intègre une nouvelle bougie et retourne (avg_gain, avg_loss, rsi) pour celle-ci.
+        """
+        if self._pending_closes is not None:
+            self._build_state()
+
+        close = float(close)
+        if (timestamp.hour, timestamp.minute) in self._close_set and self._anchor_step(close):
+            gain, loss = self.anchor_gain, self.anchor_loss
+        elif self.anchor_gain is None:
+            return np.nan, np.nan, np.nan
+        else:
+            alpha = self.alpha
+            d = close - self.anchor_close
+            gain = (1 - alpha) * self.anchor_gain + alpha * max(d, 0)
+            loss = (1 - alpha) * self.anchor_loss + alpha * max(-d, 0)
+
+        rsi = 100 - (100 / (1 + gain / loss)) if loss != 0 else 100
+        return gain, loss, rsi
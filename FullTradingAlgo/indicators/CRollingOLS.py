@@ -0,0 +1,138 @@
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class CRollingOLS:
+    """
+    Régression linéaire glissante y = a + b·x sur les `window` dernières valeurs, x étant
+    la position (0, 1, 2...). Les x d'une fenêtre sont toujours des entiers consécutifs :
+    centrés, ils valent u_j = j - (window - 1) / 2 et Sxx = window·(window² - 1) / 12 est
+    constant.
+
+    - fit(y, window) : toutes les fenêtres d'un coup (tableaux alignés sur la bougie qui
+      suit chaque fenêtre)
+    - push(y) : live, sommes courantes (Σy, Σj·y, Σy²) mises à jour en O(1)
+    """
+
+    CHUNK = 1 << 15         # fenêtres traitées par bloc dans fit (mémoire bornée)
+
+    def __init__(self, window):
+        if window < 3:
+            raise ValueError("window doit être ≥ 3 (écart-type résiduel à window - 2 ddl)")
+        self.window = window
+        self.u = self.centered_x(window)
+        self.Sxx = window * (window * window - 1) / 12
+
+        self.count = 0                  # valeurs poussées depuis le début (x absolu)
+        self.values = deque(maxlen=window)
+        self.ref = None                 # décalage des y (limite les erreurs d'arrondi de Σy²)
+        self.Sy = 0.0
+        self.Sjy = 0.0
+        self.Syy = 0.0
+
+    @staticmethod
+    def centered_x(window):
+        return np.arange(window) - (window - 1) / 2
+
+    # ======================================================
+    # LIVE : SOMMES COURANTES
+    # ======================================================
+    def push(self, y):
+        """Ajoute une valeur ; la plus ancienne sort de la fenêtre une fois celle-ci pleine."""
+        y = float(y)
+        if self.ref is None:
+            self.ref = y
+        v = y - self.ref
+
+        j = len(self.values)            # position de la nouvelle valeur
+        if j == self.window:
+            out = self.values[0] - self.ref
+            # Les valeurs restantes reculent d'une position : Σj·y perd Σy (hors sortante)
+            self.Sy -= out
+            self.Sjy -= self.Sy
+            self.Syy -= out * out
+            j -= 1
+        self.Sjy += j * v
+        self.Sy += v
+        self.Syy += v * v
+
+        self.values.append(y)
+        self.count += 1
+        if self.count % self.window == 0:
+            self._resync()
+
+    def _resync(self):
+        """
+        Recalcule les sommes depuis la fenêtre, décalées sur sa dernière valeur : une fois
+        par fenêtre (O(1) amorti), borne la dérive des arrondis et de la référence.
+        """
+        self.ref = self.values[-1]
+        v = np.fromiter(self.values, dtype=float, count=len(self.values)) - self.ref
+        self.Sy = float(v.sum())
+        self.Sjy = float(np.arange(len(v)) @ v)
+        self.Syy = float(v @ v)
+
+    @property
+    def ready(self):
+        return len(self.values) == self.window
+
+    @property
+    def slope(self):
+        c = (self.window - 1) / 2
+        return (self.Sjy - c * self.Sy) / self.Sxx
+
+    @property
+    def mean(self):
+        """Moyenne des y de la fenêtre (valeur ajustée au centre de la fenêtre)."""
+        return self.ref + self.Sy / self.window
+
+    @property
+    def intercept(self):
+        """Ordonnée à l'origine en x absolu (x = nombre de valeurs poussées avant)."""
+        center = self.count - self.window + (self.window - 1) / 2
+        return self.mean - self.slope * center
+
+    @property
+    def se(self):
+        """Écart-type des résidus (ddof = 2)."""
+        sse = self.Syy - self.Sy * self.Sy / self.window - self.slope ** 2 * self.Sxx
+        return np.sqrt(max(sse, 0.0) / (self.window - 2))
+
+    def predict(self, u):
+        """Valeur ajustée à la position centrée u (u = (window + 1) / 2 : valeur suivante)."""
+        return self.mean + self.slope * u
+
+    # ======================================================
+    # BATCH : TOUTES LES FENÊTRES
+    # ======================================================
+    @classmethod
+    def fit(cls, y, window):
+        """
+        Régression de chaque fenêtre y[i - window:i], pour i = window .. len(y) - 1.
+
+        :return: (slope, mean, se) de longueur len(y), NaN avant la première fenêtre
+        """
+        y = np.asarray(y, dtype=float)
+        n = len(y)
+        slope = np.full(n, np.nan)
+        mean = np.full(n, np.nan)
+        se = np.full(n, np.nan)
+        if n <= window:
+            return slope, mean, se
+
+        u = cls.centered_x(window)
+        Sxx = window * (window * window - 1) / 12
+        views = sliding_window_view(y, window)[:n - window]     # ligne r → bougie r + window
+
+        for a in range(0, len(views), cls.CHUNK):
+            V = views[a:a + cls.CHUNK]
+            rows = slice(a + window, a + window + len(V))
+            m = V.mean(axis=1)
+            b = (V @ u) / Sxx
+            resid = V - (m[:, None] + b[:, None] * u)
+            slope[rows] = b
+            mean[rows] = m
+            se[rows] = np.std(resid, axis=1, ddof=2)
+        return slope, mean, se
@@ -0,0 +1,138 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# Unité de l'index (pandas ≥ 2) → nombre de ticks par minute
+_TICKS_PER_MINUTE = {"s": 60, "ms": 60_000, "us": 60_000_000, "ns": 60_000_000_000}
+
+
+class CBucketLayout:
+    """
+    Découpage d'un index 1 min selon un planning de close_times (résultat de CTimeBuckets) :
+    - mask        : lignes dont (heure, minute) est un close_time
+    - anchors     : positions de ces lignes
+    - bucket      : id de la bougie haute résolution de chaque ligne (les lignes d'un même
+                    bucket se terminent au même close_time)
+    - last_anchor : position du dernier close_time ≤ ligne (-1 avant le premier)
+    """
+
+    def __init__(self, minutes, close_minutes, is_close):
+        self.minutes = minutes                       # minutes depuis l'epoch (heure murale)
+        self.close_minutes = close_minutes
+        self.mask = is_close[minutes % 1440]
+        self.anchors = np.flatnonzero(self.mask)
+        self._bucket = None
+        self._last_anchor = None
+
+    @property
+    def bucket(self):
+        if self._bucket is None:
+            # Bucket = (jour, premier close_time ≥ minute du jour) ; après le dernier
+            # close_time du jour, k = len(close_minutes) tombe sur le premier du lendemain
+            day, minute_of_day = np.divmod(self.minutes, 1440)
+            k = np.searchsorted(self.close_minutes, minute_of_day, side="left")
+            self._bucket = day * len(self.close_minutes) + k
+        return self._bucket
+
+    @property
+    def last_anchor(self):
+        if self._last_anchor is None:
+            pos = np.where(self.mask, np.arange(len(self.mask)), -1)
+            self._last_anchor = np.maximum.accumulate(pos) if len(pos) else pos
+        return self._last_anchor
+
+
+class CTimeBuckets:
+    """
+    Planning de close_times [(heure, minute), ...] (4h, 1h, 15m, 5m...) appliqué à un
+    DatetimeIndex par arithmétique entière sur les minutes depuis l'epoch, sans appel
+    Python par ligne. Les découpages sont gardés en cache par (données de l'index,
+    planning) : le RSI, la MA... d'un même DataFrame (ou de ses copies, qui partagent les
+    données de l'index) ne recalculent pas le masque.
+
+        buckets = CTimeBuckets(close_times)
+        mask = buckets.mask(df.index)
+        layout = buckets.layout(df.index)    # mask, anchors, bucket, last_anchor
+    """
+
+    MAX_CACHE = 32
+
+    _cache = OrderedDict()          # clé → (asi8 gardé en vie, CBucketLayout)
+    _lock = threading.Lock()
+
+    def __init__(self, close_times):
+        self.close_times = close_times
+        self.close_minutes = np.array(sorted({h * 60 + m for h, m in close_times}), dtype=np.int64)
+        self.is_close = np.zeros(1440, dtype=bool)
+        self.is_close[self.close_minutes] = True
+        self.key = tuple(self.close_minutes.tolist())
+
+    # ======================================================
+    # MINUTES DEPUIS L'EPOCH
+    # ======================================================
+    @staticmethod
+    def epoch_minutes(index):
+        """
+        Minutes entières depuis l'epoch de chaque ligne, en heure murale : les close_times
+        s'entendent dans le fuseau de l'index.
+        """
+        if not isinstance(index, pd.DatetimeIndex):
+            index = pd.DatetimeIndex(index)
+        if index.tz is not None and str(index.tz) != "UTC":
+            index = index.tz_localize(None)
+        return index.asi8 // _TICKS_PER_MINUTE[index.unit]
+
+    # ======================================================
+    # CACHE
+    # ======================================================
+    def layout(self, index):
+        """
+        CBucketLayout de l'index pour ce planning (calculé une fois par index et planning).
+        Les tableaux retournés sont partagés : ne pas les modifier.
+        """
+        if not isinstance(index, pd.DatetimeIndex):
+            index = pd.DatetimeIndex(index)
+        asi8 = index.asi8
+        # Adresse des données + bornes : les copies d'un DataFrame partagent l'index, et une
+        # vue sur un buffer réécrit en place (CCandleRing) change de bornes
+        bounds = (int(asi8[0]), int(asi8[-1])) if len(asi8) else (0, 0)
+        key = (asi8.__array_interface__["data"][0], len(asi8), bounds, index.unit, str(index.tz), self.key)
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        layout = CBucketLayout(self.epoch_minutes(index), self.close_minutes, self.is_close)
+
+        with self._lock:
+            # asi8 est gardé dans l'entrée : son adresse ne peut pas être réutilisée tant
+            # que la clé existe
+            self._cache[key] = (asi8, layout)
+            while len(self._cache) > self.MAX_CACHE:
+                self._cache.popitem(last=False)
+        return layout
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
+
+    # ======================================================
+    # RACCOURCIS
+    # ======================================================
+    def mask(self, index):
+        return self.layout(index).mask
+
+    def anchors(self, index):
+        return self.layout(index).anchors
+
+    def bucket_ids(self, index):
+        return self.layout(index).bucket
+
+    def last_anchor(self, index):
+        return self.layout(index).last_anchor
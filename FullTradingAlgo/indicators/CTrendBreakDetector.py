@@ -2,9 +2,18 @@ import numpy as np
 import pandas as pd
 from scipy import stats
 
+import CRollingOLS
+
 class CTrendBreakDetector:
+    # Écart relatif sous lequel une comparaison à la bande est refaite par la méthode
+    # d'origine (linregress) : les arrondis des deux calculs peuvent différer à la marge
+    TOLERANCE = 1e-9
+
     def __init__(self):
-        pass
+        self.ols = None
+        self.alpha = None
+        self.t_val = None
+        self._factors = None
 
     def _compute_prediction_interval(self, x, x_point, se, t_val, Sxx, mean_x, window_size):
         margin = t_val * se * np.sqrt(
@@ -12,6 +21,62 @@ class CTrendBreakDetector:
         )
         return margin
 
+    @staticmethod
+    def _interval_factors(window):
+        """sqrt(1 + 1/n + (x - mean_x)² / Sxx) pour chaque point de la fenêtre et la bougie suivante."""
+        u = CRollingOLS.CRollingOLS.centered_x(window)
+        Sxx = window * (window * window - 1) / 12
+        k_window = np.sqrt(1 + 1 / window + u ** 2 / Sxx)
+        k_next = np.sqrt(1 + 1 / window + ((window + 1) / 2) ** 2 / Sxx)
+        return u, k_window, k_next
+
+    # ======================================================
+    # RÉFÉRENCE : UNE BOUGIE (linregress)
+    # ======================================================
+    def _signal_at(self, i, y_window, high, low, t_val):
+        """Signal de la bougie i à partir des `window` prix moyens qui la précèdent."""
+        window = len(y_window)
+        x_window = np.arange(i - window, i)
+
+        # Régression linéaire
+        slope, intercept, _, _, _ = stats.linregress(x_window, y_window)
+        y_fit = intercept + slope * x_window
+        residuals = y_window - y_fit
+        se = np.std(residuals, ddof=2)
+
+        mean_x = np.mean(x_window)
+        Sxx = np.sum((x_window - mean_x) ** 2)
+
+        # Vérifier que tous les points de la fenêtre sont dans leur IC prédictif
+        for j in range(window):
+            xj = x_window[j]
+            y_pred_j = intercept + slope * xj
+            margin_j = self._compute_prediction_interval(
+                x_window, xj, se, t_val, Sxx, mean_x, window
+            )
+            lower_j = y_pred_j - margin_j
+            upper_j = y_pred_j + margin_j
+            if y_window[j] < lower_j or y_window[j] > upper_j:
+                return np.nan
+
+        # Tester la dernière bougie
+        x_i = i
+        y_pred_i = intercept + slope * x_i
+        margin_i = self._compute_prediction_interval(
+            x_window, x_i, se, t_val, Sxx, mean_x, window
+        )
+        lower_i = y_pred_i - margin_i
+        upper_i = y_pred_i + margin_i
+
+        if high > upper_i:
+            return 1
+        elif low < lower_i:
+            return -1
+        return 0
+
+    # ======================================================
+    # CALCUL COMPLET (vectorisé)
+    # ======================================================
     def detect_breaks(
         self,
         df: pd.DataFrame,
@@ -26,6 +91,11 @@ class CTrendBreakDetector:
         - 0  : aucun signal
         - np.nan : fenêtre non clean
 
+        Les régressions de toutes les fenêtres sont calculées d'un bloc (CRollingOLS) ;
+        les bougies dont une comparaison tombe à la limite de la bande sont refaites
+        avec linregress. Le détecteur garde ensuite l'état des `window` dernières
+        bougies : update() donne le signal des bougies suivantes en live.
+
         Args:
             df (pd.DataFrame): DataFrame avec colonnes 'high' et 'low'.
             window (int): taille de la fenêtre pour la régression.
@@ -35,61 +105,93 @@ class CTrendBreakDetector:
         Returns:
             pd.DataFrame: copie du DataFrame avec la colonne ajoutée.
         """
-        highs = df["high"].values
-        lows = df["low"].values
+        highs = df["high"].to_numpy(dtype=float)
+        lows = df["low"].to_numpy(dtype=float)
         avg_price = (highs + lows) / 2
         n = len(df)
 
-        results = [np.nan] * n  # Initialisé à nan par défaut
-
-        for i in range(window, n):
-            x_window = np.arange(i - window, i)
-            y_window = avg_price[i - window:i]
-
-            # Régression linéaire
-            slope, intercept, _, _, _ = stats.linregress(x_window, y_window)
-            y_fit = intercept + slope * x_window
-            residuals = y_window - y_fit
-            se = np.std(residuals, ddof=2)
-
-            t_val = stats.t.ppf(1 - alpha / 2, df=window - 2)
-            mean_x = np.mean(x_window)
-            Sxx = np.sum((x_window - mean_x) ** 2)
-
-            # Vérifier que tous les points de la fenêtre sont dans leur IC prédictif
-            clean_window = True
-            for j in range(window):
-                xj = x_window[j]
-                y_pred_j = intercept + slope * xj
-                margin_j = self._compute_prediction_interval(
-                    x_window, xj, se, t_val, Sxx, mean_x, window
-                )
-                lower_j = y_pred_j - margin_j
-                upper_j = y_pred_j + margin_j
-                if y_window[j] < lower_j or y_window[j] > upper_j:
-                    clean_window = False
-                    break
-
-            if not clean_window:
-                results[i] = np.nan
-                continue
+        t_val = stats.t.ppf(1 - alpha / 2, df=window - 2)
+        results = np.full(n, np.nan)  # Initialisé à nan par défaut
+
+        if n > window:
+            slope, mean, se = CRollingOLS.CRollingOLS.fit(avg_price, window)
+            u, k_window, k_next = self._interval_factors(window)
+            rows = np.arange(window, n)
+            ambiguous = np.zeros(n, dtype=bool)
+
+            # Fenêtre clean : chaque point dans son intervalle de prédiction
+            views = np.lib.stride_tricks.sliding_window_view(avg_price, window)[:n - window]
+            clean = np.zeros(n, dtype=bool)
+            chunk = CRollingOLS.CRollingOLS.CHUNK
+            for a in range(0, len(views), chunk):
+                r = rows[a:a + chunk]
+                V = views[a:a + chunk]
+                resid = V - (mean[r, None] + slope[r, None] * u)
+                excess = np.abs(resid) - t_val * se[r, None] * k_window
+                scale = self.TOLERANCE * (np.abs(mean[r, None]) + 1)
+                clean[r] = ~(excess > 0).any(axis=1)
+                ambiguous[r] = (np.abs(excess) <= scale).any(axis=1)
 
             # Tester la dernière bougie
-            x_i = i
-            y_pred_i = intercept + slope * x_i
-            margin_i = self._compute_prediction_interval(
-                x_window, x_i, se, t_val, Sxx, mean_x, window
+            y_pred = mean[rows] + slope[rows] * (window + 1) / 2
+            margin = t_val * se[rows] * k_next
+            upper = y_pred + margin
+            lower = y_pred - margin
+            signal = np.where(highs[rows] > upper, 1.0, np.where(lows[rows] < lower, -1.0, 0.0))
+            results[rows] = np.where(clean[rows], signal, np.nan)
+
+            scale = self.TOLERANCE * (np.abs(mean[rows]) + 1)
+            ambiguous[rows] |= clean[rows] & (
+                (np.abs(highs[rows] - upper) <= scale) | (np.abs(lows[rows] - lower) <= scale)
             )
-            lower_i = y_pred_i - margin_i
-            upper_i = y_pred_i + margin_i
+            for i in np.flatnonzero(ambiguous):
+                results[i] = self._signal_at(i, avg_price[i - window:i], highs[i], lows[i], t_val)
 
-            if highs[i] > upper_i:
-                results[i] = 1
-            elif lows[i] < lower_i:
-                results[i] = -1
-            else:
-                results[i] = 0
+        # État live : régression glissante sur les `window` derniers prix moyens
+        self.alpha = alpha
+        self.t_val = t_val
+        self._factors = self._interval_factors(window)
+        self.ols = None
+        if window >= 3:
+            self.ols = CRollingOLS.CRollingOLS(window)
+            self.ols.count = max(0, n - window)
+            for y in avg_price[-window:]:
+                self.ols.push(y)
 
         df_result = df.copy()
         df_result[signal_col_name] = results
         return df_result
+
+    # ======================================================
+    # LIVE
+    # ======================================================
+    def update(self, high, low):
+        """
+        Signal de la nouvelle bougie (même définition que detect_breaks) puis ajout de la
+        bougie à la fenêtre. Nécessite un detect_breaks préalable sur l'historique.
+
+        :return: +1, -1, 0 ou np.nan
+        """
+        if self.ols is None:
+            raise RuntimeError("detect_breaks (window ≥ 3) doit être appelé avant update")
+
+        ols = self.ols
+        signal = np.nan
+        if ols.ready:
+            u, k_window, k_next = self._factors
+            values = np.fromiter(ols.values, dtype=float, count=ols.window)
+            slope, mean, se = ols.slope, ols.mean, ols.se
+
+            excess = np.abs(values - (mean + slope * u)) - self.t_val * se * k_window
+            y_pred = mean + slope * (ols.window + 1) / 2
+            margin = self.t_val * se * k_next
+            scale = self.TOLERANCE * (abs(mean) + 1)
+
+            if (np.abs(excess) <= scale).any() or abs(high - (y_pred + margin)) <= scale \
+                    or abs(low - (y_pred - margin)) <= scale:
+                signal = self._signal_at(ols.count, values, high, low, self.t_val)
+            elif not (excess > 0).any():
+                signal = 1 if high > y_pred + margin else (-1 if low < y_pred - margin else 0)
+
+        ols.push((high + low) / 2)
+        return signal
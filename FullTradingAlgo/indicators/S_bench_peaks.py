@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.signal import find_peaks
+
+import CPeaksDetector
+import CPeaksStream
+
+
+# ==========================================================
+# DONNÉES SYNTHÉTIQUES (≈ un an de bougies 1 min)
+# ==========================================================
+def make_candles(n=500_000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))
+    spread = np.abs(rng.normal(0, 5e-4, (n, 2)))
+    index = pd.date_range("2024-01-01", periods=n, freq="1min", tz="UTC")
+    return pd.DataFrame({"high": close * (1 + spread[:, 0]), "low": close * (1 - spread[:, 1]), "close": close}, index=index)
+
+
+# ==========================================================
+# RÉFÉRENCE : FILTRE PAR PIC (ancienne implémentation)
+# ==========================================================
+def peaks_loop(df, atr_period, factor, distance):
+    atr = (df["high"] - df["low"]).rolling(atr_period).mean()
+    peaks_max, props_max = find_peaks(df["high"].values, distance=distance, prominence=0)
+    peaks_min, props_min = find_peaks(-df["low"].values, distance=distance, prominence=0)
+    filtered_max = [i for i in peaks_max
+                    if props_max["prominences"][list(peaks_max).index(i)] >= factor * atr.iloc[i]]
+    filtered_min = [i for i in peaks_min
+                    if props_min["prominences"][list(peaks_min).index(i)] >= factor * atr.iloc[i]]
+    return np.array(filtered_max, dtype=np.int64), np.array(filtered_min, dtype=np.int64)
+
+
+def peaks_vectorized(df, atr_period, factor, distance):
+    atr = (df["high"] - df["low"]).rolling(atr_period).mean().to_numpy()
+    return CPeaksDetector.CPeaksDetector.detect(df["high"].values, df["low"].values, atr, distance, factor)
+
+
+# ==========================================================
+# MAIN
+# ==========================================================
+def main():
+    atr_period, factor, distance = 14, 0.5, 30
+    df = make_candles()
+
+    # 1️⃣ Filtre ATR : boucle (sur 100k lignes, quadratique) vs masque (sur 100k et 500k)
+    small = df.iloc[:100_000]
+    t0 = time.perf_counter()
+    ref = peaks_loop(small, atr_period, factor, distance)
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = peaks_vectorized(small, atr_period, factor, distance)
+    t_vec = time.perf_counter() - t0
+    assert np.array_equal(ref[0], new[0]) and np.array_equal(ref[1], new[1])
+    print(f"100k bougies : boucle {t_loop:.2f} s | vectorisé {t_vec * 1000:.1f} ms | x{t_loop / t_vec:.0f}")
+
+    t0 = time.perf_counter()
+    detector = CPeaksDetector.CPeaksDetector(df, atr_period=atr_period, factor=factor, distance=distance)
+    t_full = time.perf_counter() - t0
+    full = detector.get_df()
+    print(f"500k bougies : CPeaksDetector complet {t_full * 1000:.1f} ms "
+          f"({full['peak_max'].notna().sum()} max, {full['peak_min'].notna().sum()} min)")
+
+    # 2️⃣ Live : fenêtre de fin réévaluée à chaque bougie vs recalcul complet
+    n_live = 500
+    stream = CPeaksStream.CPeaksStream(atr_period=atr_period, factor=factor, distance=distance)
+    stream.apply(df.iloc[:-n_live])
+
+    t0 = time.perf_counter()
+    for i in range(len(df) - n_live, len(df)):
+        stream.update(df["high"].iat[i], df["low"].iat[i])
+    t_update = (time.perf_counter() - t0) / n_live
+
+    same_max = np.array_equal(stream.peak_max, full["peak_max"].to_numpy(), equal_nan=True)
+    same_min = np.array_equal(stream.peak_min, full["peak_min"].to_numpy(), equal_nan=True)
+    print(f"Live : update {t_update * 1000:.2f} ms / bougie vs complet {t_full * 1000:.1f} ms | "
+          f"mêmes pics que le calcul complet : max={same_max} min={same_min}")
+
+
+if __name__ == "__main__":
+    main()
@@ -59,7 +59,7 @@ trader = COrders_BinanceSpot.COrders_BinanceSpot(
     identifiants["api_secret"]
 )
 
-fetcher = CBitgetDataFetcher.BitgetDataFetcher()
+fetcher = CBitgetDataFetcher.BitgetDataFetcher(cache_dir="candle_cache")  # cache disque : seule la fin manquante est téléchargée
 
 # === Lancement du runner ===
 runner = CProd2.CProd2(
@@ -9,6 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../indi
 import CRSICalculator
 import CTransformToPanda
 import CMinMaxTrend_V2 as CMinMaxTrend
+import CIndicatorPipeline
 
 
 class StratState(Enum):
@@ -16,6 +17,9 @@ class StratState(Enum):
     TRADE_OPEN = auto()
 
 class CStrat_MinMaxTrend:
+    # Pas de symbol_independent : la stratégie appelle interface_trade.cancel_all_open_orders,
+    # que ni COrderRecorder (backtest parallèle) ni CEvaluateROI n'implémentent
+
     def __init__(self, interface_trade=None, risk_per_trade_pct: float = 0.1,
                  stop_loss_ratio: float = 0.98, max_bars_in_trade: int = 288,
                  break_max_timeout_bars: int = 24):
@@ -182,6 +186,22 @@ class CStrat_MinMaxTrend:
 
         return df
 
+    def get_indicator_pipeline(self, is_btc_file):
+        """Même indicateurs que apply_indicators, en version à état pour le live (CProd).
+        La pente initiale est figée à l'initialisation (variabilité de l'historique)."""
+        return CIndicatorPipeline.CIndicatorPipeline([
+            CIndicatorPipeline.CMinMaxTrendStep(
+                kind="max", name="Max__c_P1",
+                name_init="Init__y_P1",
+                p_init=lambda df: -(df["open"] - df["close"]).abs().mean() / 1.5,
+                CstValideMinutes=10,
+                name_slope_change="SlopeChange_+_y_P1",
+                mode_day=True
+            ),
+            CIndicatorPipeline.CCopyStep("close", "close__b_P1"),
+            CIndicatorPipeline.CCopyStep("high", "high__m_P1")
+        ])
+
     def run(self):
         self.transformer.process_all(self.apply_indicators)
 
@@ -9,6 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../indi
 import CRSICalculator
 import CTransformToPanda
 import CIndicatorsBTCAdder
+import CIndicatorPipeline
 
 
 class StratState(Enum):
@@ -21,6 +22,9 @@ class StratState(Enum):
 
 
 class CStrat_RSI5min30:
+    # État uniquement dans self.state[symbol] → backtest parallélisable par symbole
+    symbol_independent = True
+
     def __init__(self, interface_trade=None, risk_per_trade_pct: float = 0.1,
                  stop_loss_ratio: float = 0.98, max_bars_in_trade: int = 288,
                  break_max_timeout_bars: int = 24):
@@ -270,6 +274,16 @@ class CStrat_RSI5min30:
 
         return df
 
+    def get_indicator_pipeline(self, is_btc_file):
+        """Même indicateurs que apply_indicators, en version à état pour le live (CProd)."""
+        return CIndicatorPipeline.CIndicatorPipeline([
+            CIndicatorPipeline.CRSIStep("rsi_4h_14_P2", period=14,
+                                        close_times=[(h, m) for h in range(3, 23, 4) for m in [59]]),
+            CIndicatorPipeline.CRSIStep("rsi_5m_14_P2", period=14,
+                                        close_times=[(h, m) for h in range(24) for m in range(4, 59, 5)]),
+            CIndicatorPipeline.CCopyStep("close", "close__b_P1")
+        ])
+
     def run(self):
         self.transformer.process_all(self.apply_indicators)
 
@@ -7,6 +7,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../indi
 
 import CRSICalculator
 import CTransformToPanda
+import CIndicatorPipeline
 
 
 class StratState(Enum):
@@ -17,6 +18,9 @@ class StratState(Enum):
 
 
 class CStrat_TrackerShort:
+    # Pas de symbol_independent : la stratégie appelle trader.get_position_info, que ni
+    # COrderRecorder (backtest parallèle) ni CEvaluateROI n'implémentent
+
     def __init__(self, trader=None, risk_per_trade_pct: float = 10.0, perf_cible: float = -1.5):
         """
         trader : interface avec méthode get_position_info(symbol)
@@ -149,5 +153,14 @@ class CStrat_TrackerShort:
 
         return df
 
+    def get_indicator_pipeline(self, is_btc_file):
+        """Même indicateurs que apply_indicators, en version à état pour le live (CProd)."""
+        return CIndicatorPipeline.CIndicatorPipeline([
+            CIndicatorPipeline.CRSIStep("rsi_15m_9_P2", period=9,
+                                        close_times=[(h, m) for h in range(24) for m in range(14, 60, 15)]),
+            CIndicatorPipeline.CRSIStep("rsi_3m_9_P2", period=9,
+                                        close_times=[(h, m) for h in range(24) for m in range(2, 60, 3)])
+        ])
+
     def get_main_indicator(self):
         return ["rsi_3m_9_P2", "rsi_15m_9_P2"]
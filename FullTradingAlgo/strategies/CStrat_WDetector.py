@@ -89,47 +89,10 @@ class CStrat_WDetector:
         if any(col not in df.columns for col in ["open", "close", "high", "low"]):
             raise ValueError("Le DataFrame doit contenir les colonnes 'open', 'close', 'high', 'low'.")
 
-        price_mean = df["moy_l_h_e_c"]
-
-        raw_signals = [0] * len(df)
-
-        for i in range(interval1 + interval2, len(df)):
-            start_price = price_mean.iloc[i - interval1 - interval2]
-            mid_price = price_mean.iloc[i - interval2]
-            drop = (mid_price - start_price) * 100 / start_price
-
-            if drop > drop_pct:
-                continue
-
-            end_price = price_mean.iloc[i]
-            rise = (end_price - mid_price) * 100 / mid_price
-
-            if rise >= rise_pct:
-                raw_signals[i - interval2] = 1
-
-        # Nettoyage avancé des signaux dans une fenêtre de 5 minutes
-        filtered_signals = [0] * len(df)
-
-        signal_df = df.copy()
-        signal_df["raw"] = raw_signals
-
-        signal_points = signal_df[signal_df["raw"] == 1]
-        used_indices = set()
-
-        for current_time, _ in signal_points.iterrows():
-            if current_time in used_indices:
-                continue
-
-            window_end = current_time + pd.Timedelta(minutes=interval2)
-            window_points = signal_points.loc[
-            (signal_points.index >= current_time) & (signal_points.index < window_end)]
-
-            if not window_points.empty:
-                min_low_idx = window_points["low"].idxmin()
-                filtered_signals[df.index.get_loc(min_low_idx)] = 1
-                used_indices.update(window_points.index)
-
-        df[column_name] = filtered_signals
+        df[column_name] = self.w_pattern_signals(
+            df.index, df["moy_l_h_e_c"].to_numpy(dtype=float), df["low"].to_numpy(dtype=float),
+            interval1, drop_pct, rise_pct, interval2
+        )
         # # Nettoyage des détections consécutives
         # filtered_signals = [0] * len(df)
         # i = 0
@@ -150,6 +113,68 @@ class CStrat_WDetector:
         return df
 
 
+    @staticmethod
+    def w_pattern_signals(index, price_mean, low, interval1, drop_pct, rise_pct, interval2):
+        """
+        Cœur vectorisé de detect_w_pattern, sur un symbole ou sur une matrice large
+        (une colonne par symbole, même index) pour balayer tout l'univers d'un coup.
+
+        :param index: DatetimeIndex trié commun aux lignes
+        :param price_mean: prix moyens, tableau (n,) ou (n, n_symboles)
+        :param low: lows, même forme que price_mean
+        :return: signaux 0 / 1 (int64), même forme que price_mean
+        """
+        price_mean = np.asarray(price_mean, dtype=float)
+        low = np.asarray(low, dtype=float)
+        one_symbol = price_mean.ndim == 1
+        if one_symbol:
+            price_mean = price_mean[:, None]
+            low = low[:, None]
+
+        n = len(price_mean)
+        lag = interval1 + interval2
+        signals = np.zeros(price_mean.shape, dtype=np.int64)
+        if n <= lag or interval2 <= 0:
+            return signals[:, 0] if one_symbol else signals
+
+        # Chute puis remontée en une passe sur des tableaux décalés : la ligne r compare
+        # r (départ), r + interval1 (creux, position du signal brut) et r + lag (fin)
+        start_price = price_mean[:n - lag]
+        mid_price = price_mean[interval1:n - interval2]
+        end_price = price_mean[lag:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drop = (mid_price - start_price) * 100 / start_price
+            rise = (end_price - mid_price) * 100 / mid_price
+        raw = ~(drop > drop_pct) & (rise >= rise_pct)
+
+        # Nettoyage : fenêtres successives [t, t + interval2 minutes) ouvertes par le premier
+        # signal brut non encore couvert, on garde le signal au low le plus bas de chacune
+        index = pd.DatetimeIndex(index)
+        times = index.asi8
+        window_end = (index + pd.Timedelta(minutes=interval2)).asi8
+
+        for col in range(price_mean.shape[1]):
+            points = interval1 + np.flatnonzero(raw[:, col])
+            if len(points) == 0:
+                continue
+            nxt = np.searchsorted(times[points], window_end[points], side="left").tolist()
+
+            starts = []
+            k = 0
+            while k < len(points):
+                starts.append(k)
+                k = nxt[k]
+
+            sizes = np.diff(np.r_[starts, len(points)])
+            window_id = np.repeat(np.arange(len(starts)), sizes)
+            lows = low[points, col]
+            # Tri (fenêtre, NaN en dernier, low, position) : le premier de chaque fenêtre est
+            # son idxmin
+            order = np.lexsort((points, lows, np.isnan(lows), window_id))
+            signals[points[order[starts]], col] = 1
+
+        return signals[:, 0] if one_symbol else signals
+
     def apply_indicators(self, df, is_btc_file):
         df = df.copy()
 